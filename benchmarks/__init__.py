@@ -0,0 +1 @@
+"""Throughput benchmarks of tap-shopify."""
@@ -0,0 +1,461 @@
+"""A local fake of the Shopify Admin REST API, serving a synthetic store.
+
+The store is generated from a seed, so every run serves the same records. Like
+the real API, list endpoints are paginated with `page_info` cursors returned in
+`Link` headers, each response reports the shop's call bucket in the
+`X-Shopify-Shop-Api-Call-Limit` header, and requests that overflow the bucket
+are answered with a 429.
+
+    store = Store.generate(orders=1000)
+    with FakeShopify(store) as server:
+        config = {"access_token": "x", "store": "bench", "admin_url": server.url}
+"""
+
+import base64
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 250
+
+# the REST bucket leaks at 1/20th of its size per second, as on Shopify
+BUCKET_LEAK_SECONDS = 20
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_PATH = re.compile(r"/admin/api/[^/]+(/.*)\.json")
+_TRANSACTIONS_PATH = re.compile(r"/orders/(\d+)/transactions")
+
+
+def _timestamp(seconds):
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _money(rng, low=1, high=200):
+    return f"{rng.uniform(low, high):.2f}"
+
+
+def _price_set(amount):
+    money = {"amount": amount, "currency_code": "GBP"}
+    return {"shop_money": money, "presentment_money": money}
+
+
+@dataclass
+class Store:
+    """The resources of a synthetic shop, by endpoint path."""
+
+    resources: dict = field(default_factory=dict)
+    transactions: dict = field(default_factory=dict)
+
+    @classmethod
+    def generate(
+        cls,
+        orders=1000,
+        line_items_per_order=5,
+        refund_rate=0.1,
+        customers=1000,
+        products=200,
+        variants_per_product=3,
+        locations=5,
+        seed=0,
+    ):
+        """Generate a store of the given volumes, the same for the same seed.
+
+        Every product variant has an inventory item stocked at every location,
+        and `refund_rate` is the share of orders with a refund.
+        """
+        rng = random.Random(seed)
+        store = cls()
+
+        variants = [
+            (product_id, product_id * 100 + n)
+            for product_id in range(1, products + 1)
+            for n in range(variants_per_product)
+        ]
+
+        store.resources["/products"] = [
+            {
+                "id": product_id,
+                "title": f"Product {product_id}",
+                "vendor": "Bench",
+                "product_type": "Widget",
+                "status": "active",
+                "tags": "bench, synthetic",
+                "created_at": _timestamp(product_id),
+                "updated_at": _timestamp(product_id * 60),
+                "variants": [
+                    {
+                        "id": variant_id,
+                        "product_id": product_id,
+                        "title": f"Variant {variant_id}",
+                        "price": _money(rng),
+                        "sku": f"SKU-{variant_id}",
+                        "inventory_item_id": variant_id,
+                        "inventory_quantity": rng.randint(0, 100),
+                    }
+                    for variant_id in range(
+                        product_id * 100, product_id * 100 + variants_per_product
+                    )
+                ],
+            }
+            for product_id in range(1, products + 1)
+        ]
+        store.resources["/customers"] = [
+            {
+                "id": customer_id,
+                "email": f"customer{customer_id}@example.com",
+                "first_name": "Bench",
+                "last_name": f"Customer {customer_id}",
+                "orders_count": rng.randint(0, 20),
+                "total_spent": _money(rng, 0, 2000),
+                "state": "enabled",
+                "verified_email": True,
+                "tags": "",
+                "created_at": _timestamp(customer_id),
+                "updated_at": _timestamp(customer_id * 60),
+            }
+            for customer_id in range(1, customers + 1)
+        ]
+        store.resources["/locations"] = [
+            {"id": location_id, "name": f"Location {location_id}", "active": True}
+            for location_id in range(1, locations + 1)
+        ]
+        store.resources["/inventory_items"] = [
+            {
+                "id": variant_id,
+                "sku": f"SKU-{variant_id}",
+                "cost": _money(rng, 1, 50),
+                "tracked": True,
+                "requires_shipping": True,
+                "created_at": _timestamp(variant_id),
+                "updated_at": _timestamp(variant_id * 60),
+            }
+            for _, variant_id in variants
+        ]
+        store.resources["/inventory_levels"] = [
+            {
+                "inventory_item_id": variant_id,
+                "location_id": location_id,
+                "available": rng.randint(0, 100),
+                "updated_at": _timestamp((variant_id + location_id) * 60),
+            }
+            for _, variant_id in variants
+            for location_id in range(1, locations + 1)
+        ]
+        store.resources["/inventory_levels"].sort(key=lambda level: level["updated_at"])
+        store.resources["/orders"] = [
+            store._order(rng, order_id, variants, line_items_per_order, refund_rate)
+            for order_id in range(1, orders + 1)
+        ]
+
+        return store
+
+    def _order(self, rng, order_id, variants, line_items, refund_rate):
+        created_at = order_id * 600
+        line_items = [
+            {
+                "id": order_id * 1000 + n,
+                "admin_graphql_api_id": f"gid://shopify/LineItem/{order_id * 1000 + n}",
+                "product_id": product_id,
+                "variant_id": variant_id,
+                "title": f"Product {product_id}",
+                "sku": f"SKU-{variant_id}",
+                "quantity": rng.randint(1, 5),
+                "price": (price := _money(rng)),
+                "price_set": _price_set(price),
+                "total_discount": "0.00",
+                "taxable": True,
+                "requires_shipping": True,
+                "tax_lines": [
+                    {"title": "VAT", "rate": 0.2, "price": _money(rng, 0, 40)}
+                ],
+            }
+            for n, (product_id, variant_id) in enumerate(
+                rng.choices(variants, k=line_items)
+            )
+        ]
+        total = (
+            f"{sum(float(item['price']) * item['quantity'] for item in line_items):.2f}"
+        )
+        refunds = []
+
+        if line_items and rng.random() < refund_rate:
+            item = line_items[0]
+            refunds.append(
+                {
+                    "id": order_id * 10,
+                    "order_id": order_id,
+                    "created_at": _timestamp(created_at + 86400),
+                    "note": "Damaged",
+                    "refund_line_items": [
+                        {
+                            "id": order_id * 10,
+                            "line_item_id": item["id"],
+                            "quantity": 1,
+                            "subtotal": item["price"],
+                            "total_tax": "0.00",
+                        }
+                    ],
+                    "order_adjustments": [],
+                    "transactions": [],
+                }
+            )
+
+        self.transactions[order_id] = [
+            {
+                "id": order_id * 10 + n,
+                "order_id": order_id,
+                "kind": kind,
+                "status": "success",
+                "amount": total,
+                "currency": "GBP",
+                "gateway": "bogus",
+                "created_at": _timestamp(created_at + n),
+            }
+            for n, kind in enumerate(["authorization", "capture"])
+        ]
+
+        return {
+            "id": order_id,
+            "admin_graphql_api_id": f"gid://shopify/Order/{order_id}",
+            "name": f"#{1000 + order_id}",
+            "order_number": 1000 + order_id,
+            "email": f"customer{order_id}@example.com",
+            "currency": "GBP",
+            "financial_status": "partially_refunded" if refunds else "paid",
+            "fulfillment_status": None,
+            "created_at": _timestamp(created_at),
+            "processed_at": _timestamp(created_at),
+            "updated_at": _timestamp(created_at + 60),
+            "subtotal_price": total,
+            "subtotal_price_set": _price_set(total),
+            "total_price": total,
+            "total_price_set": _price_set(total),
+            "total_tax": "0.00",
+            "total_discounts": "0.00",
+            "taxes_included": True,
+            "test": False,
+            "tags": "",
+            "note_attributes": [],
+            "discount_codes": [],
+            "tax_lines": [{"title": "VAT", "rate": 0.2, "price": "0.00"}],
+            "line_items": line_items,
+            "shipping_lines": [
+                {"id": order_id, "title": "Standard", "price": "4.99", "code": "STD"}
+            ],
+            "refunds": refunds,
+            "customer": {"id": order_id, "email": f"customer{order_id}@example.com"},
+        }
+
+
+class CallBucket:
+    """The shop's REST call bucket, leaking at `capacity / 20` calls a second."""
+
+    def __init__(self, capacity):
+        """Initialise an empty bucket of `capacity` calls."""
+        self.capacity = capacity
+        self.level = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Add a call to the bucket, returning the new level or None if full."""
+        with self._lock:
+            now = time.monotonic()
+            leaked = (now - self._updated) * self.capacity / BUCKET_LEAK_SECONDS
+            self.level = max(0.0, self.level - leaked)
+            self._updated = now
+
+            if self.level + 1 > self.capacity:
+                return None
+
+            self.level += 1
+            return math.ceil(self.level)
+
+
+def _encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(page_info):
+    return json.loads(base64.urlsafe_b64decode(page_info))
+
+
+def _filter(records, params):
+    for key in ("updated_at_min", "created_at_min"):
+        if value := params.get(key):
+            value = value.replace("+00:00", "Z")
+            records = [r for r in records if r.get(key[:-4], "") >= value]
+
+    if ids := params.get("ids"):
+        wanted = {int(i) for i in ids.split(",")}
+        records = [r for r in records if r["id"] in wanted]
+
+    if location_ids := params.get("location_ids"):
+        wanted = {int(i) for i in location_ids.split(",")}
+        records = [r for r in records if r["location_id"] in wanted]
+
+    if since_id := params.get("since_id"):
+        records = [r for r in records if r["id"] > int(since_id)]
+
+    return records
+
+
+class FakeShopify:
+    """Serves a `Store` over HTTP on a local port, in a background thread.
+
+    `throttle_every` answers every so many requests with a 429 whatever the
+    bucket level, to exercise retries. `requests` counts the requests served
+    by endpoint path, and `throttled` the 429s.
+    """
+
+    def __init__(self, store, bucket_size=40, throttle_every=0, retry_after=1.0):
+        """Initialise the server for `store`, with a bucket of `bucket_size`."""
+        self.store = store
+        self.bucket = CallBucket(bucket_size)
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = Counter()
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """Return the admin URL of the fake shop."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/admin"
+
+    def reset_counts(self):
+        """Reset the request counts."""
+        with self._lock:
+            self.requests.clear()
+            self.throttled = 0
+
+    def __enter__(self):
+        """Start serving."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, path, bucket_full):
+        with self._lock:
+            self.requests[path] += 1
+            total = sum(self.requests.values())
+
+            throttled = bucket_full or (
+                bool(self.throttle_every) and total % self.throttle_every == 0
+            )
+            self.throttled += throttled
+
+        return throttled
+
+    def page(self, path, params):
+        """Return the records of a page of `path`, and the next page's query."""
+        if match := _TRANSACTIONS_PATH.fullmatch(path):
+            return "transactions", self.store.transactions.get(int(match[1]), []), None
+
+        key = path.strip("/").split("/")[-1]
+        limit = min(int(params.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+
+        if page_info := params.get("page_info"):
+            position = _decode_cursor(page_info)
+        else:
+            filters = {k: v for k, v in params.items() if k not in ("limit", "fields")}
+            position = {"filters": filters, "offset": 0}
+
+        records = _filter(self.store.resources.get(path, []), position["filters"])
+        offset = position["offset"]
+        end = offset + limit
+        page = records[offset:end]
+
+        if fields := params.get("fields"):
+            names = fields.split(",")
+            page = [{k: r[k] for k in names if k in r} for r in page]
+
+        next_query = None
+
+        if end < len(records):
+            next_position = {**position, "offset": end}
+            next_query = urlencode(
+                {"limit": limit, "page_info": _encode_cursor(next_position)}
+            )
+
+        return key, page, next_query
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # headers and body are written separately, so don't delay either
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, headers=()):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+
+                for name, value in headers:
+                    self.send_header(name, value)
+
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                link = f"http://{self.headers.get('Host')}{url.path}"
+                self._send(*fake.respond(url.path, dict(parse_qsl(url.query)), link))
+
+        return Handler
+
+    def respond(self, url_path, params, url):
+        """Return the status, body and headers of the response to a request."""
+        match = _PATH.fullmatch(url_path)
+
+        if not match:
+            return 404, {"errors": "Not Found"}, []
+
+        path = match[1]
+        level = self.bucket.take()
+
+        if self._count(path, bucket_full=level is None):
+            return (
+                429,
+                {"errors": "Exceeded 2 calls per second for api client."},
+                [("Retry-After", str(self.retry_after))],
+            )
+
+        try:
+            key, records, next_query = self.page(path, params)
+        except (ValueError, KeyError):
+            return 400, {"errors": {"page_info": "Invalid value."}}, []
+
+        headers = [("X-Shopify-Shop-Api-Call-Limit", f"{level}/{self.bucket.capacity}")]
+
+        if next_query:
+            headers.append(("Link", f'<{url}?{next_query}>; rel="next"'))
+
+        return 200, {key: records}, headers
@@ -0,0 +1,266 @@
+"""Throughput benchmarks of tap-shopify against a fake Shopify Admin API.
+
+Each benchmark syncs a set of streams through `Tap_Shopify.sync_all` in its own
+process, so peak memory is measured per benchmark, and reports the records
+synced a second, the requests made and the peak RSS.
+
+    python -m benchmarks.run                      # run the default scenario
+    python -m benchmarks.run --scenario small --save
+    python -m benchmarks.run --scenario small --compare --repeat 3
+    python -m benchmarks.run orders --tap-config '{"fast_conformance": true}'
+
+Baselines are saved in `benchmarks/baselines`, one file per scenario. Timings
+depend on the machine they are taken on, so compare against a baseline saved
+on the same machine.
+"""
+
+import argparse
+import io
+import json
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.fake_shopify import FakeShopify, Store
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+# streams selected by each benchmark
+BENCHMARKS = {
+    "orders": ["orders"],
+    "order_children": [
+        "orders",
+        "line_items",
+        "shipping_lines",
+        "tax_lines",
+        "order_discount_codes",
+        "refunds",
+        "refund_line_items",
+        "order_adjustments",
+    ],
+    "transactions": ["transactions"],
+    "customers": ["customers"],
+    "products": ["products"],
+    "inventory": ["inventory_levels", "inventory_items"],
+}
+
+SCENARIOS = {
+    "small": {
+        "store": {"orders": 1000, "customers": 1000, "products": 200},
+        "server": {"bucket_size": 40_000},
+    },
+    "default": {
+        "store": {"orders": 10_000, "customers": 10_000, "products": 2000},
+        "server": {"bucket_size": 40_000},
+        "benchmarks": [name for name in BENCHMARKS if name != "transactions"],
+    },
+    # a standard plan bucket, with every 10th request rejected as well
+    "throttled": {
+        "store": {"orders": 2000, "customers": 2000, "products": 100},
+        "server": {"bucket_size": 40, "throttle_every": 10},
+        "benchmarks": ["orders", "customers", "products"],
+    },
+}
+
+
+class _RecordCounter(io.TextIOBase):
+    """Stands in for stdout, counting the records written per stream."""
+
+    _PREFIX = '{"type":"RECORD","stream":"'
+
+    def __init__(self):
+        self.records = Counter()
+        self.bytes = 0
+
+    def write(self, text):
+        self.bytes += len(text)
+
+        if text.startswith(self._PREFIX):
+            start = len(self._PREFIX)
+            end = text.index('"', start)
+            self.records[text[start:end]] += 1
+
+        return len(text)
+
+
+def _peak_rss_mb():
+    # on Linux, ru_maxrss carries over the peak of the parent process from
+    # before the worker was started, while VmHWM covers only the worker
+    try:
+        status = Path("/proc/self/status").read_text()
+        return int(re.search(r"^VmHWM:\s+(\d+) kB", status, re.M)[1]) / 1024
+    except (OSError, TypeError):
+        pass
+
+    # bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_worker(benchmark, config):
+    """Sync the streams of `benchmark` and print the results as JSON."""
+    from singer_sdk.helpers import _catalog
+    from singer_sdk.singerlib.catalog import Catalog
+
+    from tap_shopify.tap import Tap_Shopify
+
+    catalog = Catalog.from_dict(Tap_Shopify(config=config).catalog_dict)
+    _catalog.deselect_all_streams(catalog=catalog)
+
+    for stream in BENCHMARKS[benchmark]:
+        _catalog.set_catalog_stream_selected(
+            catalog=catalog, stream_name=stream, selected=True
+        )
+
+    tap = Tap_Shopify(config=config, catalog=catalog.to_dict())
+    output = _RecordCounter()
+    stdout, sys.stdout = sys.stdout, output
+
+    try:
+        start = time.perf_counter()
+        tap.sync_all()
+        seconds = time.perf_counter() - start
+    finally:
+        sys.stdout = stdout
+
+    result = {
+        "records": dict(output.records),
+        "output_mb": output.bytes / 1024 / 1024,
+        "seconds": seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    print(json.dumps(result))
+
+
+def run_benchmark(server, benchmark, tap_config):
+    """Run `benchmark` in a new process against `server`, returning its results."""
+    config = {
+        "access_token": "bench",
+        "store": "bench",
+        "admin_url": server.url,
+        **tap_config,
+    }
+    server.reset_counts()
+
+    process = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", benchmark],
+        input=json.dumps(config),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    if process.returncode:
+        raise RuntimeError(f"Benchmark {benchmark} failed:\n{process.stderr}")
+
+    result = json.loads(process.stdout.splitlines()[-1])
+    records = sum(result["records"].values())
+
+    return {
+        **result,
+        "records_per_second": records / result["seconds"],
+        "requests": sum(server.requests.values()),
+        "throttled": server.throttled,
+    }
+
+
+def _change(value, baseline):
+    return f"{(value - baseline) / baseline:+.0%}" if baseline else ""
+
+
+def print_results(results, baseline=None):
+    """Print a table of `results`, with the change from `baseline` if given."""
+    rows = [("benchmark", "records", "rec/s", "change", "requests", "429s", "rss MB")]
+
+    for name, result in results.items():
+        base = (baseline or {}).get(name, {})
+        rows.append(
+            (
+                name,
+                str(sum(result["records"].values())),
+                f"{result['records_per_second']:.0f}",
+                _change(result["records_per_second"], base.get("records_per_second")),
+                f"{result['requests']}"
+                + (f" ({base['requests']})" if "requests" in base else ""),
+                str(result["throttled"]),
+                f"{result['peak_rss_mb']:.0f}"
+                + (f" ({base['peak_rss_mb']:.0f})" if "peak_rss_mb" in base else ""),
+            )
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def main(argv=None):
+    """Run the benchmarks of a scenario."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("benchmarks", nargs="*", help=", ".join(BENCHMARKS))
+    parser.add_argument("--scenario", default="default", choices=SCENARIOS)
+    parser.add_argument("--tap-config", default="{}", help="extra tap config as JSON")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="runs of each benchmark, fastest kept"
+    )
+    parser.add_argument("--save", action="store_true", help="save as the baseline")
+    parser.add_argument(
+        "--compare", action="store_true", help="compare with the saved baseline"
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, json.load(sys.stdin))
+        return
+
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    scenario = SCENARIOS[args.scenario]
+    benchmarks = args.benchmarks or scenario.get("benchmarks", list(BENCHMARKS))
+    baseline_path = BASELINES_DIR / f"{args.scenario}.json"
+    baseline = None
+
+    if args.compare:
+        baseline = json.loads(baseline_path.read_text())["results"]
+
+    print(f"Generating the {args.scenario} store...", file=sys.stderr)
+    store = Store.generate(**scenario["store"])
+    results = {}
+
+    with FakeShopify(store, **scenario["server"]) as server:
+        for benchmark in benchmarks:
+            print(f"Running {benchmark}...", file=sys.stderr)
+            runs = [
+                run_benchmark(server, benchmark, json.loads(args.tap_config))
+                for _ in range(args.repeat)
+            ]
+            # the fastest run is the least disturbed by other work on the machine
+            results[benchmark] = max(runs, key=lambda r: r["records_per_second"])
+
+    print_results(results, baseline)
+
+    if args.save:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(
+                {
+                    "scenario": scenario,
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved the baseline to {baseline_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
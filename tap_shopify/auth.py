@@ -1,8 +1,21 @@
 """tap_shopify Authentication."""
 
-from singer_sdk.authenticators import APIKeyAuthenticator, SingletonMeta
+from singer_sdk.authenticators import APIKeyAuthenticator
 
+from tap_shopify.rate_limit import ShopifyRateLimiter
 
-# The SingletonMeta metaclass makes the streams reuse the same authenticator instance.
-class tap_shopifyAuthenticator(APIKeyAuthenticator, metaclass=SingletonMeta):
-    """Authenticator class for tap_shopify."""
+
+class tap_shopifyAuthenticator(APIKeyAuthenticator):
+    """Authenticator class for tap_shopify.
+
+    One instance is shared by every stream of a store (see `Tap_Shopify`), rather
+    than one per process, so each store of a multi-store sync has its own.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialise the authenticator and the shop's rate limiter."""
+        super().__init__(*args, **kwargs)
+
+        # shared along with the authenticator, as every stream draws from the
+        # same shop-wide API limits
+        self.rate_limiter = ShopifyRateLimiter()
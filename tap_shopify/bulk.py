@@ -0,0 +1,69 @@
+"""Grouping of bulk operation results for tap_shopify.
+
+A bulk operation returns the nodes of nested connections as JSONL lines of
+their own, each with the id of its parent in `__parentId`, and a line is not
+guaranteed to follow its parent. The result for a large shop can run to many
+GB, so rather than held in memory, its nodes are spooled to a temporary SQLite
+database and read back grouped by parent.
+
+https://shopify.dev/docs/api/usage/bulk-operations/queries#the-jsonl-data-format
+"""
+
+import pickle
+import sqlite3
+
+
+class BulkResultSpool:
+    """Nodes of a bulk operation result, kept on disk and read back by parent."""
+
+    def __init__(self):
+        """Open an empty spool."""
+        # an empty path opens a private database on disk, deleted once closed
+        self._db = sqlite3.connect("")
+        self._db.execute("CREATE TABLE parents (id TEXT, node BLOB)")
+        self._db.execute("CREATE TABLE children (parent_id TEXT, node BLOB)")
+
+    def __enter__(self):
+        """Return the spool."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the spool, deleting its database."""
+        self.close()
+
+    def close(self):
+        """Close the spool, deleting its database."""
+        self._db.close()
+
+    def add(self, node):
+        """Store `node`, as a child if it has a `__parentId`."""
+        # pickled, as nodes are decoded with Decimal values
+        if parent_id := node.get("__parentId"):
+            self._db.execute(
+                "INSERT INTO children VALUES (?, ?)", (parent_id, pickle.dumps(node))
+            )
+        else:
+            self._db.execute(
+                "INSERT INTO parents VALUES (?, ?)", (node["id"], pickle.dumps(node))
+            )
+
+    def groups(self):
+        """Yield each parent node with a list of its children, in the order read."""
+        self._db.execute("CREATE INDEX children_parent_id ON children (parent_id)")
+
+        for parent_id, node in self._db.execute(
+            "SELECT id, node FROM parents ORDER BY rowid"
+        ):
+            children = self._db.execute(
+                "SELECT node FROM children WHERE parent_id = ? ORDER BY rowid",
+                (parent_id,),
+            )
+            yield pickle.loads(node), [pickle.loads(child) for (child,) in children]
+
+    def orphans(self):
+        """Return the number of children of each parent missing from the result."""
+        orphans = self._db.execute(
+            "SELECT parent_id, COUNT(*) FROM children "
+            "WHERE parent_id NOT IN (SELECT id FROM parents) GROUP BY parent_id"
+        )
+        return dict(orphans)
@@ -1,42 +1,228 @@
 """REST client handling, including tap_shopifyStream base class."""
 
+import json
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from functools import cached_property
+from itertools import chain, islice
 from pathlib import Path
-from urllib.parse import parse_qsl
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
 
+import requests
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
 from singer_sdk.pagination import HeaderLinkPaginator
+from singer_sdk.singerlib import RecordMessage
 from singer_sdk.streams import RESTStream
+from typing_extensions import override
 
-from tap_shopify.auth import tap_shopifyAuthenticator
+from tap_shopify import hiddendict
+from tap_shopify.coercion import compile_converter
+from tap_shopify.concurrency import iter_concurrently
+from tap_shopify.conformance import compile_conformer
+from tap_shopify.dedup import DEFAULT_DEDUP_WINDOW_SIZE, RecentKeys
+from tap_shopify.graphql import (
+    BULK_OPERATION_QUERY,
+    BULK_OPERATION_RUN_MUTATION,
+    response_payload,
+)
+from tap_shopify.json_stream import iter_json_array
+from tap_shopify.metrics import StreamMetrics
+from tap_shopify.page_size import DEFAULT_SLOW_PAGE_SECONDS, MAX_PAGE_SIZE, PageSize
+from tap_shopify.session import DEFAULT_CONNECT_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
 
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
 API_VERSION = "2025-10"
 
+# seconds between bulk operation status checks
+BULK_OPERATION_POLL_INTERVAL = 10
+
+DEFAULT_BACKFILL_CONCURRENCY = 4
+
+# pages between checkpoints of the page cursor in state
+DEFAULT_PAGE_CHECKPOINT_INTERVAL = 100
+
+# bytes read from the response stream at a time when parsing a page
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# bytes of a response body held in memory before the rest is spooled to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# parent records to split into embedded child stream records at a time
+EMBEDDED_BATCH_SIZE = 250
+
+# matches record paths of the form "$.orders[*]"
+_ARRAY_JSONPATH = re.compile(r"\$\.(\w+)\[\*\]")
+
+
+def parse_timestamp(value):
+    """Return the datetime of an ISO 8601 timestamp, in UTC if it has no zone."""
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    if not timestamp.tzinfo:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+    return timestamp
+
+
+def with_shop_property(schema, multi_store):
+    """Return `schema` with the `shop` property of multi-store syncs, if enabled."""
+    if multi_store:
+        schema["properties"]["shop"] = {"type": ["string"]}
+
+    return schema
+
+
+def spool_body(response):
+    """Read the body of a streamed `response` into a local file, and read it from there.
+
+    The body is still read a chunk at a time, but all of it is read before any
+    record is parsed, so a connection dropped mid-body fails (and retries) the
+    request rather than the records parsed from it. Returns the bytes read from
+    the wire.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    try:
+        for chunk in response.iter_content(chunk_size=PARSE_CHUNK_SIZE):
+            body.write(chunk)
+
+        wire_bytes = response.raw.tell()
+    except BaseException:
+        body.close()
+        raise
+
+    response.raw.release_conn()
+    body.seek(0)
+
+    # `iter_content` and `content` now read the decoded body from the file
+    response.raw = body
+    response._content_consumed = False
+
+    return wire_bytes
+
+
+class _CountedChunks:
+    """Iterates over chunks of a response body, counting their bytes."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.bytes = 0
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            self.bytes += len(chunk)
+            yield chunk
+
 
 class tap_shopifyStream(RESTStream):
     """tap_shopify stream class."""
 
+    def __init__(self, *args, **kwargs):
+        """Initialise the stream."""
+        super().__init__(*args, **kwargs)
+
+        # wrapped here, as subclasses override `post_process` and call it in turn
+        post_process = self._timed(self.post_process)
+
+        if self.multi_store:
+            post_process = self._with_shop(post_process)
+
+        self.post_process = post_process  # type: ignore[method-assign]
+
+    @property
+    def shop(self) -> Optional[str]:
+        """Return the store synced, if it is one of a multi-store sync."""
+        return self._tap.shop  # type: ignore[attr-defined]
+
+    @property
+    def multi_store(self) -> bool:
+        """Return whether records are synced from several stores."""
+        return self._tap.multi_store  # type: ignore[attr-defined]
+
+    @cached_property
+    def performance_metrics(self):
+        """Return the performance measurements of the stream."""
+        tags = {"stream": self.name}
+
+        if self.shop:
+            tags["shop"] = self.shop
+
+        return StreamMetrics(tags)
+
+    def _timed(self, post_process):
+        metrics = self.performance_metrics
+
+        def timed_post_process(row, context=None):
+            start = time.perf_counter()
+            row = post_process(row, context)
+            metrics.observe_records(row is not None, time.perf_counter() - start)
+            return row
+
+        return timed_post_process
+
+    def _with_shop(self, post_process):
+        shop = self.shop
+
+        def post_process_with_shop(row, context=None):
+            row = post_process(row, context)
+
+            if row is not None:
+                row["shop"] = shop
+
+            return row
+
+        return post_process_with_shop
+
+    @override
+    def log_sync_costs(self):
+        super().log_sync_costs()
+        self.performance_metrics.log(self.metrics_logger)
+
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
-        url_base = self.config.get(
+        store_config = self._tap.store_config  # type: ignore[attr-defined]
+        url_base = store_config.get(
             "admin_url"
-        ) or "https://{store}.myshopify.com/admin".format(store=self.config["store"])
+        ) or "https://{store}.myshopify.com/admin".format(store=store_config["store"])
 
         return f"{url_base}/api/{API_VERSION}"
 
+    # file in SCHEMAS_DIR holding the stream schema
+    schema_filename: Optional[str] = None
+
+    @override
+    @property
+    def schema(self) -> dict:
+        # read on first use rather than in `__init__`, so a sync only reads the
+        # schemas of the streams it syncs
+        if self._schema is None and self.schema_filename:
+            self._schema = with_shop_property(
+                json.loads((SCHEMAS_DIR / self.schema_filename).read_text()),
+                self.multi_store,
+            )
+
+        return super().schema
+
     records_jsonpath = "$[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.next_page"  # Or override `get_next_page_token`.
-    last_id = None
+    _starting_replication_value = None
+
+    # state the page cursor is checkpointed in, while requesting records
+    _page_cursor_state: Optional[dict] = None
+    _pages_since_checkpoint = 0
+
+    # page cursor to checkpoint once the records requested before it are emitted
+    _pending_page_info: Optional[str] = None
 
     @property
     def authenticator(self):
-        """Return a new authenticator object."""
-        return tap_shopifyAuthenticator(
-            self,
-            key="X-Shopify-Access-Token",
-            value=str(self.config["access_token"]),
-            location="header",
-        )
+        """Return the authenticator shared by the streams of the store."""
+        return self._tap.get_authenticator(self)  # type: ignore[attr-defined]
 
     @property
     def http_headers(self) -> dict:
@@ -46,16 +232,604 @@ class tap_shopifyStream(RESTStream):
             headers["User-Agent"] = self.config.get("user_agent")
         return headers
 
+    @override
+    @property
+    def requests_session(self) -> requests.Session:
+        # one session per tap, so connections are reused across streams
+        return self._tap.requests_session  # type: ignore[attr-defined]
+
+    @override
+    @property
+    def timeout(self):
+        return (
+            self.config.get("connect_timeout") or DEFAULT_CONNECT_TIMEOUT,
+            self.config.get("request_timeout") or DEFAULT_REQUEST_TIMEOUT,
+        )
+
     def get_new_paginator(self):
         """Return a new paginator instance."""
-        return HeaderLinkPaginator()
+        paginator = HeaderLinkPaginator()
+
+        # continue from the page checkpointed by an interrupted run
+        if self._page_cursor_state and "page_info" in self._page_cursor_state:
+            page_info = self._page_cursor_state["page_info"]
+            paginator._value = urlparse("?" + urlencode({"page_info": page_info}))
+
+        return paginator
+
+    @override
+    def prepare_request(self, context, next_page_token):
+        if next_page_token and self._page_cursor_state is not None:
+            self._checkpoint_page_cursor(next_page_token)
+
+        return super().prepare_request(context, next_page_token)
+
+    def _checkpoint_page_cursor(self, next_page_token):
+        self._pages_since_checkpoint += 1
+
+        if self._pages_since_checkpoint < self.config.get(
+            "page_checkpoint_interval", DEFAULT_PAGE_CHECKPOINT_INTERVAL
+        ):
+            return
+
+        # records of the pages before `next_page_token` may still be held in a
+        # batch, so the cursor is written once they are emitted (see `get_records`)
+        if page_info := dict(parse_qsl(next_page_token.query)).get("page_info"):
+            self._pending_page_info = page_info
+            self._pages_since_checkpoint = 0
+
+    def _write_page_checkpoint(self):
+        page_info, self._pending_page_info = self._pending_page_info, None
+
+        if page_info and self._page_cursor_state is not None:
+            self._page_cursor_state["page_info"] = page_info
+            self._is_state_flushed = False
+            self._write_state_message()
+
+    @override
+    def _write_state_message(self):
+        # the state covers every record processed, so the embedded records read
+        # from them are emitted first
+        self._sync_embedded_child_streams()
+
+        if self.parent_stream_type and self.state_partitioning_keys == []:
+            # without bookmarks of its own, a child stream leaves writing state to
+            # its top-level stream, which does so once their children are emitted
+            self._is_state_flushed = True
+            return
+
+        if not getattr(self._tap, "syncing_concurrently", False):
+            super()._write_state_message()
+            return
+
+        if not self._is_state_flushed and self.tap_state:
+            self._tap.write_stream_state(self.name, self.stream_state)  # type: ignore
+            self._is_state_flushed = True
+
+    @override
+    def _request(self, prepared_request, context):
+        rate_limiter = self.authenticator.rate_limiter
+        wait = rate_limiter.acquire(prepared_request)
+
+        # stream the body to a local file, so `parse_response` can decode records
+        # from it one at a time
+        response = self.requests_session.send(
+            prepared_request,
+            stream=True,
+            timeout=self.timeout,
+            allow_redirects=self.allow_redirects,
+        )
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags=(
+                {"url": prepared_request.path_url}
+                if self._LOG_REQUEST_METRIC_URLS
+                else None
+            ),
+        )
+
+        # `elapsed` runs until the headers arrive, so the body is timed as it is read
+        request_seconds = response.elapsed.total_seconds()
+
+        try:
+            self.validate_response(response)
+            start = time.perf_counter()
+            wire_bytes = spool_body(response)
+            request_seconds += time.perf_counter() - start
+        except Exception:
+            response.close()
+            raise
+        finally:
+            self.performance_metrics.observe_request(
+                request_seconds, wait, rate_limiter.headroom(prepared_request.url)
+            )
+
+        self.performance_metrics.observe_wire_bytes(wire_bytes)
+        response.request_seconds = request_seconds  # type: ignore[attr-defined]
+        return response
+
+    def parse_response(self, response):
+        """Parse records from the response body one at a time.
+
+        Pages are parsed incrementally when `records_jsonpath` selects a top-level
+        array (e.g. `$.orders[*]`), so memory is bounded by the largest record
+        rather than the whole page.
+        """
+        match = _ARRAY_JSONPATH.fullmatch(self.records_jsonpath)
+
+        if not match:
+            yield from self._timed_decode(super().parse_response(response), response)
+            return
+
+        with response:
+            chunks = _CountedChunks(response.iter_content(chunk_size=PARSE_CHUNK_SIZE))
+            yield from self._timed_decode(
+                iter_json_array(chunks, match.group(1)), response, chunks
+            )
+
+    def _timed_decode(self, records, response, chunks=None):
+        decode_seconds = 0.0
+        completed = False
+        records = iter(records)
+
+        try:
+            while True:
+                start = time.perf_counter()
+
+                try:
+                    record = next(records)
+                except StopIteration:
+                    completed = True
+                    return
+                finally:
+                    decode_seconds += time.perf_counter() - start
+
+                yield record
+        finally:
+            decoded_bytes = chunks.bytes if chunks else len(response.content)
+            self.performance_metrics.observe_body(decoded_bytes, decode_seconds)
+
+            if completed and self.page_size:
+                self.page_size.observe(response.request_seconds, decoded_bytes)
+
+    @override
+    def validate_response(self, response):
+        self.authenticator.rate_limiter.observe(response)
+        super().validate_response(response)
+
+    @cached_property
+    def _synced_child_streams(self):
+        return [
+            stream
+            for stream in self.child_streams
+            if stream.selected or stream.has_selected_descendents
+        ]
+
+    @cached_property
+    def _embedded_child_streams(self):
+        return [
+            stream
+            for stream in self._synced_child_streams
+            if isinstance(stream, tap_shopifyStream) and stream.embedded
+        ]
+
+    def get_records(self, context):
+        """Return records, syncing child streams for batches of them at a time.
+
+        Child streams that prefetch are handed each batch of records ahead of its
+        sync. The records of embedded child streams are read from each record as
+        it is processed, and synced for many records at once, before any state is
+        written. A page cursor is checkpointed once every record of the batches
+        requested before it is processed.
+        """
+        # resolved once per context, for `_is_duplicate` to compare rows with
+        self._starting_replication_value = (
+            self.get_starting_replication_key_value(context)
+            if self.replication_key
+            else None
+        )
+        self._embedded_records = [[] for _ in self._embedded_child_streams]
+        self._embedded_parents = 0
+
+        for batch in self._get_record_batches(context):
+            yield from batch
+
+            # resumed once every record of the batch is processed
+            if self._embedded_parents >= EMBEDDED_BATCH_SIZE:
+                self._sync_embedded_child_streams()
+
+            if self._pending_page_info:
+                self._write_page_checkpoint()
+
+        self._sync_embedded_child_streams()
+
+    def _get_record_batches(self, context):
+        prefetch_streams = [
+            stream
+            for stream in self._synced_child_streams
+            if isinstance(stream, tap_shopifyStream) and stream.prefetch_batch_size
+        ]
+
+        if not prefetch_streams:
+            yield from ([record] for record in super().get_records(context))
+            return
+
+        batch_size = max(stream.prefetch_batch_size or 0 for stream in prefetch_streams)
+        records = iter(super().get_records(context))
+
+        while batch := list(islice(records, batch_size)):
+            for stream in prefetch_streams:
+                stream.prefetch(batch)
+            yield batch
+
+    @override
+    def generate_child_contexts(self, record, context):
+        # read before the record is written, which drops deselected properties
+        # such as the ones embedded records are read from
+        if self._embedded_child_streams and self.stream_maps[0].get_filter_result(
+            record
+        ):
+            for stream, records in zip(
+                self._embedded_child_streams, self._embedded_records
+            ):
+                records.extend(stream.get_embedded_records(record))
+
+            self._embedded_parents += 1
+
+        if len(self._embedded_child_streams) < len(self._synced_child_streams):
+            yield from super().generate_child_contexts(record, context)
+
+    @override
+    def _sync_children(self, child_context):
+        if child_context is None:
+            super()._sync_children(child_context)
+            return
+
+        # embedded child streams are synced by `_sync_embedded_child_streams`
+        for stream in self._synced_child_streams:
+            if stream not in self._embedded_child_streams:
+                stream.sync(context=child_context)
+
+    def _sync_embedded_child_streams(self):
+        if not self._embedded_parents:
+            return
+
+        # sync each stream once for the records read from the whole batch
+        streams = self._embedded_child_streams
+        records = self._embedded_records
+        self._embedded_records = [[] for _ in streams]
+        self._embedded_parents = 0
+
+        for stream, stream_records in zip(streams, records):
+            stream.sync(context=hiddendict(records=stream_records))
+
+    # whether this stream's records are read from its parent's records with
+    # `get_embedded_records`, rather than requested
+    embedded = False
+
+    # records read for each embedded child stream, from the parent records
+    # processed since they were last synced
+    _embedded_records: list
+    _embedded_parents = 0
+
+    @property
+    def prefetch_batch_size(self) -> Optional[int]:
+        """Return how many parent records to hand `prefetch` at once.
+
+        Child streams that fetch for many parents per request override this; the
+        default of None requests records per parent context as usual.
+        """
+        return None
+
+    def prefetch(self, records):
+        """Fetch child records for a batch of parent records ahead of their sync."""
+
+    # whether the endpoint accepts a `fields` parameter to limit the properties
+    # returned for each record
+    supports_fields_param = True
+
+    # records per page the endpoint accepts, or None if it does not page
+    max_page_size: Optional[int] = MAX_PAGE_SIZE
+
+    @cached_property
+    def page_size(self) -> Optional[PageSize]:
+        """Return the size of the pages to request, or None to not set one."""
+        if not self.max_page_size:
+            return None
+
+        return PageSize(
+            min(self.config.get("page_size") or MAX_PAGE_SIZE, self.max_page_size),
+            slow_seconds=self.config.get("slow_page_seconds")
+            or DEFAULT_SLOW_PAGE_SECONDS,
+        )
+
+    @property
+    def parent_fields(self) -> list:
+        """Return the top-level fields this stream reads from parent records."""
+        return []
+
+    @cached_property
+    def selected_fields(self) -> Optional[list]:
+        """Return the top-level fields to request, or None to request them all.
+
+        Primary and replication keys are always requested, along with any fields
+        that selected child streams read from each record.
+        """
+        if not self.supports_fields_param:
+            return None
+
+        properties = self.schema.get("properties", {})
+        fields = {name for name in properties if self.mask[("properties", name)]}
+
+        if len(fields) == len(properties):
+            return None
+
+        fields.update(self.primary_keys or [])
+
+        if self.replication_key:
+            fields.add(self.replication_key)
+
+        for child in self.child_streams:
+            if not isinstance(child, tap_shopifyStream):
+                continue
+
+            if child.selected or child.has_selected_descendents:
+                fields.update(child.parent_fields)
+
+        # added by the tap rather than returned by Shopify
+        if self.multi_store:
+            fields.discard("shop")
+
+        return sorted(fields)
+
+    def validate_graphql_response(self, response):
+        """Raise for GraphQL errors, retrying when the query was throttled."""
+        data: dict = response_payload(response)
+
+        # https://shopify.dev/docs/api/admin-graphql/2025-10#status-and-error-codes
+        if gql_errors := data.get("errors"):
+            if any(
+                (error.get("extensions") or {}).get("code") == "THROTTLED"
+                for error in gql_errors
+            ):
+                raise RetriableAPIError(f"GraphQL throttled: {gql_errors}", response)
+
+            raise FatalAPIError(f"GraphQL errors: {gql_errors}")
+
+    def request_graphql(self, query, variables=None, context=None) -> dict:
+        """Run a GraphQL query against the Admin API and return its `data`."""
+        return self.request_graphql_response(query, variables, context)["data"]
+
+    def request_graphql_response(self, query, variables=None, context=None) -> dict:
+        """Run a GraphQL query and return the whole response, with `extensions`."""
+        prepared_request = self.build_prepared_request(
+            method="POST",
+            url=f"{self.url_base}/graphql.json",
+            json={"query": query, "variables": variables or {}},
+            headers=self.http_headers,
+        )
+
+        def graphql_request(prepared_request, context):
+            response = self._request(prepared_request, context)
+            self.validate_graphql_response(response)
+            return response
+
+        response = self.request_decorator(graphql_request)(prepared_request, context)
+        return response_payload(response)
+
+    def get_search_query(self, context):
+        """Return the GraphQL search query for the records to sync.
+
+        As with the REST params, records updated since the bookmark are searched
+        for, or else those created since `start_date`.
+        """
+        context_state = self.get_context_state(context)
+        last_updated = context_state.get("replication_key_value")
+        start_date = self.config.get("start_date")
+
+        if last_updated:
+            return f"updated_at:>='{last_updated}'"
+
+        if start_date:
+            return f"created_at:>='{start_date}'"
+
+        return ""
+
+    def get_backfill_windows(self, context):
+        """Return the `updated_at` windows to request concurrently, if enabled.
+
+        The range from the starting bookmark (or `start_date`) to now is split into
+        `backfill_window_days` windows, each given as the URL params bounding it.
+        The last window is left open-ended to pick up records updated mid-sync.
+        """
+        window_days = self.config.get("backfill_window_days")
+
+        if not window_days or self.replication_key != "updated_at":
+            return []
+
+        # not every schema declares `updated_at` as date-time, so parse it here
+        # rather than with `get_starting_timestamp`
+        start_value = self.get_starting_replication_key_value(context)
+
+        if not start_value:
+            return []
+
+        start = parse_timestamp(start_value)
+        context_state = self.get_context_state(context)
+        start_date = self.config.get("start_date")
+        window_size = timedelta(days=window_days)
+        now = datetime.now(timezone.utc)
+        windows = []
+
+        while start < now:
+            window = {"updated_at_min": start.isoformat(timespec="seconds")}
+
+            if not context_state.get("replication_key_value") and start_date:
+                window["created_at_min"] = start_date
+
+            start += window_size
+
+            if start < now:
+                # bounds are inclusive, and timestamps are to the second
+                window["updated_at_max"] = (start - timedelta(seconds=1)).isoformat(
+                    timespec="seconds"
+                )
+
+            windows.append(window)
+
+        return windows
+
+    def request_records(self, context):
+        """Request records, fetching backfill windows concurrently if enabled.
+
+        Windows are yielded in order, so records stay sorted for sorted streams and
+        the bookmark advances as it would for a single request chain.
+        """
+        windows = self.get_backfill_windows(context)
+
+        if len(windows) < 2 and context is None:
+            yield from self._request_checkpointed_records()
+            return
+
+        if len(windows) < 2:
+            yield from super().request_records(context)
+            return
+
+        self.logger.info("Requesting %d backfill windows", len(windows))
+
+        def window_records(window):
+            return lambda: super(tap_shopifyStream, self).request_records(
+                {**(context or {}), "backfill_window": window}
+            )
+
+        yield from iter_concurrently(
+            [window_records(window) for window in windows],
+            max_workers=self.config.get(
+                "backfill_concurrency", DEFAULT_BACKFILL_CONCURRENCY
+            ),
+        )
+
+    def _request_checkpointed_records(self):
+        """Request records, checkpointing the page cursor every so many pages.
+
+        A run interrupted part way through then resumes from the last page
+        checkpointed rather than from the bookmark, or from the bookmark if the
+        cursor is no longer valid. The cursor is removed from state once all
+        records are requested.
+        """
+        if not self.config.get(
+            "page_checkpoint_interval", DEFAULT_PAGE_CHECKPOINT_INTERVAL
+        ):
+            yield from super().request_records(None)
+            return
+
+        state = self._page_cursor_state = self.stream_state
+        self._pages_since_checkpoint = 0
+
+        try:
+            records = iter(super().request_records(None))
+
+            if "page_info" in state:
+                self.logger.info("Resuming from the page checkpointed by the last run")
+
+                try:
+                    records = chain(list(islice(records, 1)), records)
+                except FatalAPIError as ex:
+                    self.logger.warning(
+                        "Could not resume from the page checkpointed by the last "
+                        "run, resuming from the bookmark instead: %s",
+                        ex,
+                    )
+                    del state["page_info"]
+                    records = iter(super().request_records(None))
+
+            yield from records
+        finally:
+            self._page_cursor_state = None
+            self._pending_page_info = None
+
+        state.pop("page_info", None)
+
+    def run_bulk_operation(self, query, context=None):
+        """Run a bulk query operation and yield each object from its JSONL result.
+
+        Shopify runs one bulk query operation at a time per shop, so streams
+        syncing side by side wait for each other's to finish.
+
+        https://shopify.dev/docs/api/usage/bulk-operations/queries
+        """
+        with self._tap.bulk_operation_lock:  # type: ignore[attr-defined]
+            yield from self._run_bulk_operation(query, context)
+
+    def _run_bulk_operation(self, query, context):
+        data = self.request_graphql(
+            BULK_OPERATION_RUN_MUTATION, {"query": query}, context
+        )
+
+        if user_errors := data["bulkOperationRunQuery"]["userErrors"]:
+            raise FatalAPIError(f"Bulk operation errors: {user_errors}")
+
+        operation = data["bulkOperationRunQuery"]["bulkOperation"]
+        self.logger.info("Started bulk operation %s", operation["id"])
+
+        while operation["status"] in {"CREATED", "RUNNING"}:
+            time.sleep(BULK_OPERATION_POLL_INTERVAL)
+            operation = self.request_graphql(
+                BULK_OPERATION_QUERY, {"id": operation["id"]}, context
+            )["node"]
+
+        if operation["status"] != "COMPLETED":
+            raise FatalAPIError(
+                f"Bulk operation {operation['id']} {operation['status'].lower()}: "
+                f"{operation.get('errorCode')}"
+            )
+
+        self.logger.info(
+            "Bulk operation %s completed with %s objects",
+            operation["id"],
+            operation.get("objectCount"),
+        )
+
+        if not operation["url"]:
+            return  # nothing matched the query
+
+        # the result is a signed storage URL, so send it without the access token
+        response = self.requests_session.send(
+            requests.Request("GET", operation["url"]).prepare(),
+            stream=True,
+            timeout=self.timeout,
+        )
+
+        with response:
+            self.validate_response(response)
+
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line, parse_float=Decimal)
 
     def get_url_params(self, context, next_page_token):
         """Return a dictionary of values to be used in URL parameterization."""
         params: dict = {}
 
+        if self.selected_fields:
+            params["fields"] = ",".join(self.selected_fields)
+
         if next_page_token:
-            return dict(parse_qsl(next_page_token.query))
+            # page_info links may not carry the fields of the first request, and
+            # carry the page size of the last one
+            return {
+                **params,
+                **dict(parse_qsl(next_page_token.query)),
+                **self.page_size_params,
+            }
+
+        params.update(self.page_size_params)
+
+        if context and "backfill_window" in context:
+            params.update(context["backfill_window"])
+            return params
 
         context_state = self.get_context_state(context)
         last_updated = context_state.get("replication_key_value")
@@ -69,22 +843,76 @@ class tap_shopifyStream(RESTStream):
 
         return params
 
+    @property
+    def page_size_params(self) -> dict:
+        """Return the URL params setting the size of the next page requested."""
+        return {"limit": self.page_size.size} if self.page_size else {}
+
+    @cached_property
+    def _conform_record(self):
+        unmapped: set = set()
+
+        def on_unmapped(path):
+            if path not in unmapped:
+                unmapped.add(path)
+                self.logger.warning(
+                    "Property '%s' was present in the '%s' stream but not found in "
+                    "catalog schema. Ignoring.",
+                    path,
+                    self.name,
+                )
+
+        return compile_conformer(self.effective_schema, self.mask, on_unmapped)
+
+    @override
+    def _generate_record_messages(self, record):
+        if not self.config.get("fast_conformance"):
+            yield from super()._generate_record_messages(record)
+            return
+
+        # as the SDK does, but with a conformer compiled for this stream
+        record = self._conform_record(record)
+
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=self._stream_version,
+                    time_extracted=datetime.now(timezone.utc),
+                )
+
+    @cached_property
+    def _coerce_record(self):
+        return compile_converter(self.schema)
+
     def post_process(self, row, context=None):
-        """Deduplicate rows by id or updated_at."""
+        """Deduplicate rows by id or updated_at, and coerce values to the schema."""
+        if self._is_duplicate(row, context):
+            return None
+
+        return self._coerce_record(row) if self._coerce_record else row
+
+    @cached_property
+    def _recent_keys(self):
+        return RecentKeys(
+            self.config.get("dedup_window_size", DEFAULT_DEDUP_WINDOW_SIZE)
+        )
+
+    def _is_duplicate(self, row, context):
         if not self.replication_key:
-            return row
+            return False
 
         row_id = row.get("id")
         row_updated_at = row.get(self.replication_key)
 
         if not row_id or not row_updated_at:
-            return row
+            return False
 
-        if (
-            row_id == self.last_id
-            or row_updated_at == self.get_starting_replication_key_value(context)
-        ):
-            return None
+        # synced by the previous run, which ended on it
+        if row_updated_at == self._starting_replication_value:
+            return True
 
-        self.last_id = row_id
-        return row
+        return self._recent_keys.seen((row_id, row_updated_at))
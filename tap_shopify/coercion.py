@@ -0,0 +1,107 @@
+"""Schema-driven type coercion for tap_shopify records.
+
+The REST Admin API returns money amounts and some quantities as JSON strings
+(e.g. `"total_price": "10.00"`), whichever type a stream's schema declares for
+them. A converter is compiled once per schema that walks only the properties
+needing coercion, so each record is coerced in a single pass.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+
+def _types(schema):
+    types = schema.get("type", [])
+    return {types} if isinstance(types, str) else set(types)
+
+
+def _to_decimal(value):
+    if isinstance(value, str):
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            return value
+
+    return value
+
+
+def _to_int(value):
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def _to_date_time(value):
+    # the API sends "" for some unset timestamps, which is not a valid date-time
+    return value or None
+
+
+def _object_converter(properties):
+    converters = [
+        (name, converter)
+        for name, schema in properties.items()
+        if (converter := compile_converter(schema))
+    ]
+
+    if not converters:
+        return None
+
+    def convert(record):
+        if not isinstance(record, dict):
+            return record
+
+        for name, converter in converters:
+            value = record.get(name)
+
+            if value is not None:
+                record[name] = converter(value)
+
+        return record
+
+    return convert
+
+
+def _array_converter(item_converter):
+    def convert(items):
+        if not isinstance(items, list):
+            return items
+
+        for index, item in enumerate(items):
+            if item is not None:
+                items[index] = item_converter(item)
+
+        return items
+
+    return convert
+
+
+def compile_converter(schema):
+    """Return a function coercing values of `schema` in place, or None if none do.
+
+    Strings are coerced to `Decimal` for number properties and to `int` for
+    integer properties, unless the property also allows strings. Empty
+    date-time strings become None. Values that cannot be coerced are left as
+    they are, for schema validation to report.
+    """
+    types = _types(schema)
+
+    if "object" in types or "properties" in schema:
+        return _object_converter(schema.get("properties", {}))
+
+    if "array" in types:
+        item_converter = compile_converter(schema.get("items", {}))
+        return item_converter and _array_converter(item_converter)
+
+    if "string" in types:
+        return _to_date_time if schema.get("format") == "date-time" else None
+
+    if "number" in types:
+        return _to_decimal
+
+    if "integer" in types:
+        return _to_int
+
+    return None
@@ -0,0 +1,93 @@
+"""Thread pool helpers for tap_shopify.
+
+Requests to Shopify spend almost all of their time waiting on the network, so
+threads are enough to overlap them; the shop-wide rate limiter keeps the
+combined request rate within the API budget.
+"""
+
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from singer_sdk.io_base import SingerWriter
+
+# seconds between checks for cancellation while a producer waits on a full buffer
+_POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Raised:
+    def __init__(self, exception):
+        self.exception = exception
+
+
+def _put(items, item, stop):
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+def _produce(factory, items, stop):
+    if stop.is_set():
+        return
+
+    try:
+        for item in factory():
+            if not _put(items, item, stop):
+                return
+    except BaseException as ex:  # re-raised in the consuming thread
+        _put(items, _Raised(ex), stop)
+        return
+
+    _put(items, _DONE, stop)
+
+
+def iter_concurrently(factories, max_workers, buffer_size=1000):
+    """Yield from the iterables built by `factories`, in order.
+
+    Up to `max_workers` iterables are consumed concurrently in worker threads,
+    each buffering at most `buffer_size` items ahead of the caller. Items are
+    yielded as if the iterables had been chained, and an exception raised in a
+    worker is raised here when its iterable is reached.
+    """
+    stop = threading.Event()
+    buffers: list = [queue.Queue(buffer_size) for _ in factories]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for factory, items in zip(factories, buffers):
+                executor.submit(_produce, factory, items, stop)
+
+            for items in buffers:
+                while (item := items.get()) is not _DONE:
+                    if isinstance(item, _Raised):
+                        raise item.exception
+
+                    yield item
+        finally:
+            # unblock and stop any workers still running if we exit early
+            stop.set()
+
+
+class LockedSingerWriter(SingerWriter):
+    """Singer message writer that keeps messages from concurrent streams whole."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialise the writer and its output lock."""
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def write_message(self, message):
+        """Write a message to stdout, serialising it outside of the lock."""
+        line = self.format_message(message) + "\n"
+
+        with self._lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
@@ -0,0 +1,117 @@
+"""Fast record conformance for tap_shopify.
+
+The SDK conforms each record by walking it against the stream schema, checking
+the type of every value and re-reading the schema at each level, before it
+separately walks the record again to drop deselected properties. For large
+nested records such as orders, that is one of the biggest CPU costs of a sync.
+
+Records decoded from Shopify's JSON only ever hold JSON types, so most of those
+checks never apply. Here the schema and selection are compiled once per stream
+into nested functions that make a single pass over each record, pruning
+deselected and unknown properties and applying only the conversions the schema
+calls for.
+"""
+
+import math
+from decimal import Decimal
+
+
+def _types(schema):
+    types = schema.get("type", [])
+    return {types} if isinstance(types, str) else set(types)
+
+
+def _to_bool(value):
+    return value != 0
+
+
+def _to_finite(value):
+    if isinstance(value, (float, Decimal)) and (math.isnan(value) or math.isinf(value)):
+        return None
+
+    return value
+
+
+def _compile_object(schema, mask, breadcrumb, path, on_unmapped):
+    converters = {}
+    deselected = set()
+
+    for name, property_schema in schema.get("properties", {}).items():
+        property_breadcrumb = (*breadcrumb, "properties", name)
+
+        if mask is None or mask[property_breadcrumb]:
+            converters[name] = _compile_property(
+                property_schema,
+                mask,
+                property_breadcrumb,
+                f"{path}.{name}" if path else name,
+                on_unmapped,
+            )
+        else:
+            deselected.add(name)
+
+    additional_properties = schema.get("additionalProperties")
+
+    def conform(record):
+        if not isinstance(record, dict):
+            return record
+
+        output = {}
+
+        for name, value in record.items():
+            if name in converters:
+                converter = converters[name]
+                output[name] = (
+                    value if converter is None or value is None else converter(value)
+                )
+            elif name in deselected:
+                continue
+            elif additional_properties:
+                output[name] = value
+            else:
+                on_unmapped(f"{path}.{name}" if path else name)
+
+        return output
+
+    return conform
+
+
+def _compile_array(item_converter):
+    def conform(items):
+        if not isinstance(items, list):
+            return items
+
+        return [item if item is None else item_converter(item) for item in items]
+
+    return conform
+
+
+def _compile_property(schema, mask, breadcrumb, path, on_unmapped):
+    types = _types(schema)
+
+    if "object" in types and "properties" in schema:
+        return _compile_object(schema, mask, breadcrumb, path, on_unmapped)
+
+    if "array" in types and isinstance(schema.get("items"), dict):
+        # selection does not apply within arrays
+        item_converter = _compile_property(schema["items"], None, (), path, on_unmapped)
+        return item_converter and _compile_array(item_converter)
+
+    if types and types <= {"boolean", "null"}:
+        return _to_bool
+
+    if "number" in types:
+        return _to_finite
+
+    return None
+
+
+def compile_conformer(schema, mask, on_unmapped):
+    """Return a function conforming a record to `schema` and selection `mask`.
+
+    The function returns a new record without deselected properties or those
+    missing from the schema (for which `on_unmapped` is called with the property
+    path), with booleans given as numbers converted, and with non-finite numbers
+    replaced by None, like the SDK's recursive conformance.
+    """
+    return _compile_object(schema, mask, (), "", on_unmapped)
@@ -0,0 +1,39 @@
+"""Bounded record deduplication for tap_shopify.
+
+Records near a page boundary can be returned twice when others are edited while
+a sync pages through them, shifting them across pages. The most recently seen
+record keys are remembered, up to a fixed number, so repeats are dropped within
+that window without keeping every key of a large sync in memory.
+"""
+
+from collections import OrderedDict
+
+# record keys remembered per stream
+DEFAULT_DEDUP_WINDOW_SIZE = 10_000
+
+
+class RecentKeys:
+    """The most recently seen keys, up to `maxsize`, least recent evicted first."""
+
+    def __init__(self, maxsize=DEFAULT_DEDUP_WINDOW_SIZE):
+        """Initialise an empty window of up to `maxsize` keys."""
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+
+    def __len__(self):
+        """Return the number of keys remembered."""
+        return len(self._keys)
+
+    def seen(self, key):
+        """Return whether `key` was seen recently, remembering it either way."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+
+        if self.maxsize > 0:
+            self._keys[key] = None
+
+            if len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+        return False
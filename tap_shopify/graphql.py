@@ -0,0 +1,659 @@
+"""GraphQL queries and record mappers for tap_shopify.
+
+The Admin GraphQL API returns global ids (``gid://shopify/Order/123``), camelCase
+field names and upper-case enums. The helpers here translate those nodes back
+into the REST record shapes described by the JSON schemas in `schemas/`, so
+GraphQL-backed fetches emit the same records as their REST counterparts.
+"""
+
+import json
+
+_MONEY_BAG = (
+    "shopMoney { amount currencyCode } presentmentMoney { amount currencyCode }"
+)
+
+_TAX_LINE_FIELDS = f"title rate priceSet {{ {_MONEY_BAG} }}"
+
+_TRANSACTION_FIELDS = """
+  id
+  kind
+  status
+  gateway
+  test
+  authorizationCode
+  authorizationExpiresAt
+  errorCode
+  createdAt
+  processedAt
+  receiptJson
+  amountSet { presentmentMoney { amount currencyCode } }
+  parentTransaction { id }
+  device { id }
+  location { id }
+  user { id }
+  paymentDetails {
+    ... on CardPaymentDetails {
+      avsResultCode
+      bin
+      cvvResultCode
+      number
+      company
+    }
+  }
+"""
+
+# https://shopify.dev/docs/api/admin-graphql/2025-10/queries/nodes
+ORDER_TRANSACTIONS_QUERY = f"""
+query OrderTransactions($ids: [ID!]!) {{
+  nodes(ids: $ids) {{
+    ... on Order {{
+      id
+      transactions {{ {_TRANSACTION_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+_VARIANT_FIELDS = """
+  id
+  title
+  price
+  compareAtPrice
+  sku
+  barcode
+  position
+  inventoryPolicy
+  inventoryQuantity
+  taxable
+  createdAt
+  updatedAt
+  selectedOptions { value }
+  image { id }
+  inventoryItem {
+    id
+    tracked
+    requiresShipping
+    measurement { weight { unit value } }
+  }
+"""
+
+_IMAGE_FIELDS = "id altText url width height"
+
+_PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+
+# https://shopify.dev/docs/api/admin-graphql/2025-10/queries/products
+PRODUCTS_QUERY = f"""
+query Products(
+  $first: Int!, $after: String, $query: String, $variants: Int!, $images: Int!
+) {{
+  products(first: $first, after: $after, query: $query, sortKey: UPDATED_AT) {{
+    nodes {{
+      id
+      title
+      descriptionHtml
+      vendor
+      productType
+      handle
+      status
+      tags
+      templateSuffix
+      createdAt
+      updatedAt
+      publishedAt
+      options {{ id name position optionValues {{ name }} }}
+      variants(first: $variants) {{ nodes {{ {_VARIANT_FIELDS} }} {_PAGE_INFO} }}
+      images(first: $images) {{ nodes {{ {_IMAGE_FIELDS} }} {_PAGE_INFO} }}
+    }}
+    {_PAGE_INFO}
+  }}
+}}
+"""
+
+# the variants or images of a product beyond those in its PRODUCTS_QUERY page
+PRODUCT_CONNECTION_QUERIES = {
+    connection: f"""
+query ProductConnection($id: ID!, $first: Int!, $after: String) {{
+  node(id: $id) {{
+    ... on Product {{
+      {connection}(first: $first, after: $after) {{
+        nodes {{ {fields} }}
+        {_PAGE_INFO}
+      }}
+    }}
+  }}
+}}
+""" for connection, fields in [("variants", _VARIANT_FIELDS), ("images", _IMAGE_FIELDS)]
+}
+
+# https://shopify.dev/docs/api/admin-graphql/2025-10/mutations/bulkOperationRunQuery
+BULK_OPERATION_RUN_MUTATION = """
+mutation BulkOperationRunQuery($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+# https://shopify.dev/docs/api/admin-graphql/2025-10/objects/BulkOperation
+BULK_OPERATION_QUERY = """
+query BulkOperation($id: ID!) {
+  node(id: $id) {
+    ... on BulkOperation { id status errorCode objectCount url }
+  }
+}
+"""
+
+# Bulk operations flatten nested connections (line items, shipping lines) into
+# their own JSONL lines carrying a `__parentId`, while plain lists (tax lines,
+# refunds, transactions) stay inline on the order.
+# https://shopify.dev/docs/api/usage/bulk-operations/queries
+_ORDERS_BULK_QUERY = f"""
+{{
+  orders(query: %(search)s, sortKey: UPDATED_AT) {{
+    edges {{
+      node {{
+        id
+        name
+        email
+        phone
+        note
+        tags
+        test
+        confirmed
+        confirmationNumber
+        taxesIncluded
+        taxExempt
+        sourceName
+        customerLocale
+        poNumber
+        paymentGatewayNames
+        cancelReason
+        cancelledAt
+        closedAt
+        createdAt
+        updatedAt
+        processedAt
+        currencyCode
+        presentmentCurrencyCode
+        displayFinancialStatus
+        displayFulfillmentStatus
+        totalWeight
+        discountCodes
+        customer {{ id }}
+        subtotalPriceSet {{ {_MONEY_BAG} }}
+        totalPriceSet {{ {_MONEY_BAG} }}
+        totalTaxSet {{ {_MONEY_BAG} }}
+        totalDiscountsSet {{ {_MONEY_BAG} }}
+        totalShippingPriceSet {{ {_MONEY_BAG} }}
+        totalOutstandingSet {{ {_MONEY_BAG} }}
+        currentSubtotalPriceSet {{ {_MONEY_BAG} }}
+        currentTotalPriceSet {{ {_MONEY_BAG} }}
+        currentTotalTaxSet {{ {_MONEY_BAG} }}
+        currentTotalDiscountsSet {{ {_MONEY_BAG} }}
+        taxLines {{ {_TAX_LINE_FIELDS} }}
+        refunds {{ id createdAt note }}
+        %(transactions)s
+        lineItems {{
+          edges {{
+            node {{
+              __typename
+              id
+              name
+              title
+              sku
+              quantity
+              currentQuantity
+              unfulfilledQuantity
+              vendor
+              variantTitle
+              requiresShipping
+              taxable
+              isGiftCard
+              product {{ id }}
+              variant {{ id }}
+              customAttributes {{ key value }}
+              originalUnitPriceSet {{ {_MONEY_BAG} }}
+              totalDiscountSet {{ {_MONEY_BAG} }}
+              taxLines {{ {_TAX_LINE_FIELDS} }}
+            }}
+          }}
+        }}
+        shippingLines {{
+          edges {{
+            node {{
+              __typename
+              id
+              title
+              code
+              source
+              carrierIdentifier
+              originalPriceSet {{ {_MONEY_BAG} }}
+              discountedPriceSet {{ {_MONEY_BAG} }}
+              taxLines {{ {_TAX_LINE_FIELDS} }}
+            }}
+          }}
+        }}
+      }}
+    }}
+  }}
+}}
+"""
+
+
+# connections listing the resources that own metafields, by the REST name of the
+# resource given as a metafield's `owner_resource`
+METAFIELD_OWNER_CONNECTIONS = {
+    "collection": "collections",
+    "customer": "customers",
+    "order": "orders",
+    "product": "products",
+    "variant": "productVariants",
+}
+
+# each metafield is a line of its own, with its owner's id as `__parentId`
+_METAFIELDS_BULK_QUERY = """
+{
+  %s {
+    edges {
+      node {
+        id
+        metafields {
+          edges {
+            node { id namespace key value type description createdAt updatedAt }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def metafields_bulk_query(owner_resource):
+    """Return the bulk operation query for the metafields of `owner_resource`."""
+    return _METAFIELDS_BULK_QUERY % METAFIELD_OWNER_CONNECTIONS[owner_resource]
+
+
+def orders_bulk_query(search, transactions=False):
+    """Return the bulk operation query for orders matching `search`."""
+    return _ORDERS_BULK_QUERY % {
+        "search": json.dumps(search),
+        "transactions": (
+            f"transactions {{ {_TRANSACTION_FIELDS} }}" if transactions else ""
+        ),
+    }
+
+
+def to_gid(resource, resource_id):
+    """Return the GraphQL global id for a REST resource id."""
+    return f"gid://shopify/{resource}/{resource_id}"
+
+
+def from_gid(gid):
+    """Return the numeric REST id for a GraphQL global id."""
+    if not gid:
+        return None
+
+    # drop any query string, e.g. gid://shopify/OrderTransaction/1?foo=bar
+    return int(gid.split("?")[0].rsplit("/", 1)[-1])
+
+
+def response_payload(response):
+    """Return the decoded JSON body of a GraphQL `response`.
+
+    The rate limiter, the validation of the response and the stream that sent the
+    query all read the body, so it is decoded once and kept on the response.
+    """
+    try:
+        return response.graphql_payload
+    except AttributeError:
+        response.graphql_payload = response.json()
+        return response.graphql_payload
+
+
+def _node_id(node):
+    return from_gid(node["id"]) if node else None
+
+
+def _enum(value):
+    return value.lower() if value else None
+
+
+def _money(money):
+    if not money:
+        return None
+
+    return {"amount": money["amount"], "currency_code": money["currencyCode"]}
+
+
+def _money_set(money_bag):
+    if not money_bag:
+        return None
+
+    return {
+        "shop_money": _money(money_bag.get("shopMoney")),
+        "presentment_money": _money(money_bag.get("presentmentMoney")),
+    }
+
+
+def _amount(money_bag):
+    return ((money_bag or {}).get("shopMoney") or {}).get("amount")
+
+
+def _tax_lines(nodes):
+    return [
+        {
+            "title": node.get("title"),
+            "rate": node.get("rate"),
+            "price": _amount(node.get("priceSet")),
+            "price_set": _money_set(node.get("priceSet")),
+        }
+        for node in nodes or []
+    ]
+
+
+def transaction_from_node(node):
+    """Map an `OrderTransaction` node to the REST transaction shape."""
+    money = (node.get("amountSet") or {}).get("presentmentMoney") or {}
+    card = node.get("paymentDetails") or {}
+    receipt = node.get("receiptJson")
+
+    return {
+        "id": from_gid(node["id"]),
+        "kind": _enum(node.get("kind")),
+        "status": _enum(node.get("status")),
+        "gateway": node.get("gateway"),
+        "test": node.get("test"),
+        "authorization": node.get("authorizationCode"),
+        "authorization_expires_at": node.get("authorizationExpiresAt"),
+        "error_code": _enum(node.get("errorCode")),
+        "created_at": node.get("createdAt"),
+        "processed_at": node.get("processedAt"),
+        "receipt": json.loads(receipt) if receipt else None,
+        "amount": money.get("amount"),
+        "currency": money.get("currencyCode"),
+        "parent_id": _node_id(node.get("parentTransaction")),
+        "device_id": _node_id(node.get("device")),
+        "location_id": (
+            {"id": _node_id(node["location"])} if node.get("location") else None
+        ),
+        "user_id": _node_id(node.get("user")),
+        "payment_details": (
+            {
+                "avs_result_code": card.get("avsResultCode"),
+                "credit_card_bin": card.get("bin"),
+                "cvv_result_code": card.get("cvvResultCode"),
+                "credit_card_number": card.get("number"),
+                "credit_card_company": card.get("company"),
+            }
+            if card
+            else None
+        ),
+    }
+
+
+# REST weight units of the GraphQL WeightUnit enum, and grams in each unit
+_WEIGHT_UNITS: dict = {
+    "GRAMS": ("g", 1),
+    "KILOGRAMS": ("kg", 1000),
+    "OUNCES": ("oz", 28.349523125),
+    "POUNDS": ("lb", 453.59237),
+}
+
+
+def product_from_node(node):
+    """Map a `Product` node to the REST product shape.
+
+    The node's `variants` and `images` hold all of its variants and images, as
+    lists of nodes rather than the connections queried.
+    """
+    product_id = from_gid(node["id"])
+    variants = [variant_from_node(variant, product_id) for variant in node["variants"]]
+    images = [
+        image_from_node(image, product_id, position, variants)
+        for position, image in enumerate(node["images"], start=1)
+    ]
+
+    return {
+        "id": product_id,
+        "admin_graphql_api_id": node["id"],
+        "title": node.get("title"),
+        "body_html": node.get("descriptionHtml"),
+        "vendor": node.get("vendor"),
+        "product_type": node.get("productType"),
+        "handle": node.get("handle"),
+        "status": _enum(node.get("status")),
+        "tags": ", ".join(node.get("tags") or []),
+        "template_suffix": node.get("templateSuffix"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "published_at": node.get("publishedAt"),
+        "options": [
+            {
+                "id": from_gid(option["id"]),
+                "product_id": product_id,
+                "name": option.get("name"),
+                "position": option.get("position"),
+                "values": [value["name"] for value in option.get("optionValues", [])],
+            }
+            for option in node.get("options") or []
+        ],
+        "variants": variants,
+        "images": images,
+        "image": images[0] if images else None,
+    }
+
+
+def variant_from_node(node, product_id):
+    """Map a `ProductVariant` node to the REST variant shape."""
+    item = node.get("inventoryItem") or {}
+    weight = ((item.get("measurement") or {}).get("weight")) or {}
+    weight_unit, unit_grams = _WEIGHT_UNITS.get(weight.get("unit"), (None, None))
+    options = [option["value"] for option in node.get("selectedOptions") or []]
+    options += [None] * (3 - len(options))
+
+    return {
+        "id": from_gid(node["id"]),
+        "admin_graphql_api_id": node["id"],
+        "product_id": product_id,
+        "title": node.get("title"),
+        "price": node.get("price"),
+        "compare_at_price": node.get("compareAtPrice"),
+        "sku": node.get("sku"),
+        "barcode": node.get("barcode"),
+        "position": node.get("position"),
+        "inventory_policy": _enum(node.get("inventoryPolicy")),
+        "inventory_management": "shopify" if item.get("tracked") else None,
+        "inventory_quantity": node.get("inventoryQuantity"),
+        "inventory_item_id": _node_id(item),
+        "requires_shipping": item.get("requiresShipping"),
+        "taxable": node.get("taxable"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "option1": options[0],
+        "option2": options[1],
+        "option3": options[2],
+        "image_id": _node_id(node.get("image")),
+        "weight": weight.get("value"),
+        "weight_unit": weight_unit,
+        "grams": (
+            round(weight["value"] * unit_grams)
+            if unit_grams and weight.get("value") is not None
+            else None
+        ),
+    }
+
+
+def image_from_node(node, product_id, position, variants):
+    """Map an `Image` node to the REST product image shape."""
+    image_id = from_gid(node["id"])
+
+    return {
+        "id": image_id,
+        "admin_graphql_api_id": node["id"],
+        "product_id": product_id,
+        "position": position,
+        "alt": node.get("altText"),
+        "src": node.get("url"),
+        "width": node.get("width"),
+        "height": node.get("height"),
+        "variant_ids": [
+            variant["id"] for variant in variants if variant["image_id"] == image_id
+        ],
+    }
+
+
+def metafield_from_node(node, owner_resource):
+    """Map a bulk operation `Metafield` line to the REST metafield shape."""
+    return {
+        "id": from_gid(node["id"]),
+        "namespace": node.get("namespace"),
+        "key": node.get("key"),
+        "value": node.get("value"),
+        "type": node.get("type"),
+        "description": node.get("description"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "owner_id": from_gid(node["__parentId"]),
+        "owner_resource": owner_resource,
+    }
+
+
+def order_from_node(node):
+    """Map a bulk operation `Order` line to the REST order shape.
+
+    Line items and shipping lines arrive as separate lines, so start empty and
+    are appended with `line_item_from_node` and `shipping_line_from_node`.
+    """
+    weight = node.get("totalWeight")
+
+    order = {
+        "id": from_gid(node["id"]),
+        "admin_graphql_api_id": node["id"],
+        "name": node.get("name"),
+        "email": node.get("email"),
+        "contact_email": node.get("email"),
+        "phone": node.get("phone"),
+        "note": node.get("note"),
+        "tags": ", ".join(node.get("tags") or []),
+        "test": node.get("test"),
+        "confirmed": node.get("confirmed"),
+        "confirmation_number": node.get("confirmationNumber"),
+        "taxes_included": node.get("taxesIncluded"),
+        "tax_exempt": node.get("taxExempt"),
+        "source_name": node.get("sourceName"),
+        "customer_locale": node.get("customerLocale"),
+        "po_number": node.get("poNumber"),
+        "payment_gateway_names": node.get("paymentGatewayNames"),
+        "cancel_reason": _enum(node.get("cancelReason")),
+        "cancelled_at": node.get("cancelledAt"),
+        "closed_at": node.get("closedAt"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "processed_at": node.get("processedAt"),
+        "currency": node.get("currencyCode"),
+        "presentment_currency": node.get("presentmentCurrencyCode"),
+        "financial_status": _enum(node.get("displayFinancialStatus")),
+        "fulfillment_status": _enum(node.get("displayFulfillmentStatus")),
+        "total_weight": int(weight) if weight is not None else None,
+        "discount_codes": [{"code": code} for code in node.get("discountCodes") or []],
+        "customer": _node_ref(node.get("customer")),
+        "subtotal_price": _amount(node.get("subtotalPriceSet")),
+        "subtotal_price_set": _money_set(node.get("subtotalPriceSet")),
+        "total_price": _amount(node.get("totalPriceSet")),
+        "total_price_set": _money_set(node.get("totalPriceSet")),
+        "total_tax": _amount(node.get("totalTaxSet")),
+        "total_tax_set": _money_set(node.get("totalTaxSet")),
+        "total_discounts": _amount(node.get("totalDiscountsSet")),
+        "total_discounts_set": _money_set(node.get("totalDiscountsSet")),
+        "total_shipping_price_set": _money_set(node.get("totalShippingPriceSet")),
+        "total_outstanding": _amount(node.get("totalOutstandingSet")),
+        "current_subtotal_price": _amount(node.get("currentSubtotalPriceSet")),
+        "current_subtotal_price_set": _money_set(node.get("currentSubtotalPriceSet")),
+        "current_total_price": _amount(node.get("currentTotalPriceSet")),
+        "current_total_price_set": _money_set(node.get("currentTotalPriceSet")),
+        "current_total_tax": _amount(node.get("currentTotalTaxSet")),
+        "current_total_tax_set": _money_set(node.get("currentTotalTaxSet")),
+        "current_total_discounts": _amount(node.get("currentTotalDiscountsSet")),
+        "current_total_discounts_set": _money_set(node.get("currentTotalDiscountsSet")),
+        "tax_lines": _tax_lines(node.get("taxLines")),
+        "refunds": [refund_from_node(refund) for refund in node.get("refunds") or []],
+        "line_items": [],
+        "shipping_lines": [],
+    }
+
+    # only queried when the transactions stream is selected
+    if "transactions" in node:
+        order["transactions"] = [
+            transaction_from_node(transaction) for transaction in node["transactions"]
+        ]
+
+    return order
+
+
+def _node_ref(node):
+    return {"id": from_gid(node["id"])} if node else None
+
+
+def line_item_from_node(node):
+    """Map a bulk operation `LineItem` line to the REST line item shape."""
+    return {
+        "id": from_gid(node["id"]),
+        "admin_graphql_api_id": node["id"],
+        "name": node.get("name"),
+        "title": node.get("title"),
+        "sku": node.get("sku"),
+        "quantity": node.get("quantity"),
+        "current_quantity": node.get("currentQuantity"),
+        "fulfillable_quantity": node.get("unfulfilledQuantity"),
+        "vendor": node.get("vendor"),
+        "variant_title": node.get("variantTitle"),
+        "requires_shipping": node.get("requiresShipping"),
+        "taxable": node.get("taxable"),
+        "gift_card": node.get("isGiftCard"),
+        "product_id": _node_id(node.get("product")),
+        "variant_id": _node_id(node.get("variant")),
+        "properties": [
+            {"name": attribute["key"], "value": attribute["value"]}
+            for attribute in node.get("customAttributes") or []
+        ],
+        "price": _amount(node.get("originalUnitPriceSet")),
+        "price_set": _money_set(node.get("originalUnitPriceSet")),
+        "total_discount": _amount(node.get("totalDiscountSet")),
+        "total_discount_set": _money_set(node.get("totalDiscountSet")),
+        "tax_lines": _tax_lines(node.get("taxLines")),
+    }
+
+
+def shipping_line_from_node(node):
+    """Map a bulk operation `ShippingLine` line to the REST shipping line shape."""
+    return {
+        "id": from_gid(node["id"]),
+        "title": node.get("title"),
+        "code": node.get("code"),
+        "source": node.get("source"),
+        "carrier_identifier": node.get("carrierIdentifier"),
+        "price": _amount(node.get("originalPriceSet")),
+        "price_set": _money_set(node.get("originalPriceSet")),
+        "discounted_price": _amount(node.get("discountedPriceSet")),
+        "discounted_price_set": _money_set(node.get("discountedPriceSet")),
+        "tax_lines": _tax_lines(node.get("taxLines")),
+    }
+
+
+def refund_from_node(node):
+    """Map an inline `Refund` object to the REST refund shape.
+
+    Refund line items and adjustments are connections nested in a list, which
+    bulk operations cannot query, so they are left empty.
+    """
+    return {
+        "id": from_gid(node["id"]),
+        "admin_graphql_api_id": node["id"],
+        "created_at": node.get("createdAt"),
+        "note": node.get("note"),
+        "refund_line_items": [],
+        "order_adjustments": [],
+        "transactions": [],
+    }
@@ -0,0 +1,130 @@
+"""Incremental JSON parsing for tap_shopify.
+
+REST pages wrap their records in a single top-level array, e.g.
+`{"orders": [...]}`, and a page of large records can run to tens of MB. Parsing
+the array one element at a time from the response body means only one
+record (plus a read buffer) is held in memory, rather than the whole page.
+"""
+
+import codecs
+import json
+from decimal import Decimal
+
+_decoder = json.JSONDecoder(parse_float=Decimal)
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Text buffer over an iterable of byte chunks, filled on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.buffer = ""
+        self.pos = 0
+
+    def read_more(self, min_chars=1):
+        """Append at least `min_chars` more text, returning False if none was left."""
+        # keep only what is still to be consumed, so the buffer stays record-sized,
+        # and join it with the new text in one step
+        consumed = self.pos
+        parts = [self.buffer[consumed:]]
+        read = 0
+
+        while read < min_chars:
+            chunk = next(self._chunks, None)
+
+            if chunk is None:
+                break
+
+            text = self._decode(chunk) if isinstance(chunk, bytes) else chunk
+            parts.append(text)
+            read += len(text)
+
+        self.buffer = "".join(parts)
+        self.pos = 0
+
+        return read > 0
+
+    def peek(self):
+        """Return the next non-whitespace character, or None at EOF."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.read_more():
+                return None
+
+    def expect(self, char):
+        """Consume `char`, which must be the next non-whitespace character."""
+        found = self.peek()
+
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                pending = len(self.buffer) - self.pos
+
+                # double the pending text on each attempt, so a large value is
+                # re-scanned a logarithmic number of times
+                if not self.read_more(max(pending, 1)):
+                    raise
+                continue
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.read_more():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks, key):
+    """Yield each element of the array under top-level `key` as it is parsed.
+
+    `chunks` is an iterable of bytes (or str), such as
+    `response.iter_content(...)`. Nothing is yielded if the key is missing or
+    null.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(":")
+
+        if name == key and reader.peek() == "[":
+            reader.expect("[")
+
+            if reader.peek() == "]":
+                return
+
+            while True:
+                yield reader.value()
+
+                if reader.peek() == "]":
+                    return
+
+                reader.expect(",")
+
+        reader.value()  # skip other members
+
+        if reader.peek() == "}":
+            return
+
+        reader.expect(",")
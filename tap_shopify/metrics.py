@@ -0,0 +1,222 @@
+"""Per-stream performance metrics for tap_shopify.
+
+The SDK counts records and times requests, but does not show where a stream's
+time goes. Each stream also measures its request latencies, the bytes it
+reads, the time it waits on the rate limit, the headroom left in the shop's
+call bucket and the time spent decoding and post-processing records. These
+are logged as Singer METRIC lines at the end of a sync, and can also be written
+to a Prometheus textfile for the node exporter to collect.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+# upper bounds of the request latency buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_PROMETHEUS_PREFIX = "tap_shopify"
+
+
+def log_point(logger, metric_type, metric, value, tags):
+    """Log a measurement as a Singer METRIC line, as the SDK does."""
+    point = {"type": metric_type, "metric": metric, "value": value, "tags": tags}
+    logger.info("METRIC: %s", json.dumps(point, default=str), extra={"point": point})
+
+
+class Histogram:
+    """Counts of observed values by bucket, with their sum."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """Initialise an empty histogram with buckets up to each of `bounds`."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Count `value` in the first bucket it does not exceed."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Return (upper bound, count of values up to it) for each bucket."""
+        buckets = []
+        total = 0
+
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            buckets.append(("+Inf" if bound == float("inf") else str(bound), total))
+
+        return buckets
+
+
+class StreamMetrics:
+    """Performance measurements of a single stream, safe to update from threads."""
+
+    def __init__(self, tags=None):
+        """Initialise the metrics with nothing measured, tagged with `tags`."""
+        self.tags = tags or {}
+        self._lock = threading.Lock()
+        self.request_latency = Histogram()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.rate_limit_wait = 0.0
+        self.min_headroom = None
+        self.decode_seconds = 0.0
+        self.post_process_seconds = 0.0
+        self.records = 0
+        self._started = None
+        self._finished = None
+
+    def _touch(self, now):
+        self._started = self._started or now
+        self._finished = now
+
+    def observe_request(self, latency, wait, headroom):
+        """Record a request's latency, rate limit wait and the bucket headroom."""
+        with self._lock:
+            self._touch(time.monotonic() - latency - wait)
+            self.request_latency.observe(latency)
+            self.rate_limit_wait += wait
+
+            if headroom is not None and (
+                self.min_headroom is None or headroom < self.min_headroom
+            ):
+                self.min_headroom = headroom
+
+    def observe_wire_bytes(self, wire_bytes):
+        """Record the bytes of a response body as read from the wire."""
+        with self._lock:
+            self.wire_bytes += wire_bytes
+
+    def observe_body(self, decoded_bytes, decode_seconds):
+        """Record the bytes of a decoded response body, and the time to parse it."""
+        with self._lock:
+            self._touch(time.monotonic())
+            self.decoded_bytes += decoded_bytes
+            self.decode_seconds += decode_seconds
+
+    def observe_records(self, records, post_process_seconds):
+        """Record records post-processed, and the time taken."""
+        with self._lock:
+            self._touch(time.monotonic())
+            self.records += records
+            self.post_process_seconds += post_process_seconds
+
+    @property
+    def records_per_second(self):
+        """Return the records processed a second while the stream was active."""
+        if not self._started or self._finished == self._started:
+            return None
+
+        return self.records / (self._finished - self._started)
+
+    def points(self):
+        """Return (type, metric, value, tags) of each measurement, if any."""
+        if not self.request_latency.count and not self.records:
+            return []
+
+        latency = self.request_latency
+        points = [
+            (
+                "histogram",
+                "http_request_latency",
+                {
+                    "buckets": dict(latency.cumulative()),
+                    "count": latency.count,
+                    "sum": latency.sum,
+                },
+                {},
+            ),
+            ("counter", "response_bytes", self.wire_bytes, {"encoding": "wire"}),
+            ("counter", "response_bytes", self.decoded_bytes, {"encoding": "decoded"}),
+            ("timer", "rate_limit_wait", self.rate_limit_wait, {}),
+            ("timer", "decode_duration", self.decode_seconds, {}),
+            ("timer", "post_process_duration", self.post_process_seconds, {}),
+        ]
+
+        if self.min_headroom is not None:
+            points.append(("gauge", "call_limit_headroom", self.min_headroom, {}))
+
+        if self.records_per_second is not None:
+            points.append(("gauge", "records_per_second", self.records_per_second, {}))
+
+        return points
+
+    def log(self, logger):
+        """Log each measurement as a Singer METRIC line."""
+        for metric_type, metric, value, tags in self.points():
+            log_point(logger, metric_type, metric, value, {**self.tags, **tags})
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+def prometheus_text(stream_metrics):
+    """Return the metrics of each stream in the Prometheus text format."""
+    families: dict = {}
+
+    def add(family, metric_type, suffix, labels, value):
+        families.setdefault(family, (metric_type, []))[1].append(
+            (suffix, labels, value)
+        )
+
+    for metrics in stream_metrics:
+        for metric_type, metric, value, tags in metrics.points():
+            labels = {**metrics.tags, **tags}
+            name = f"{_PROMETHEUS_PREFIX}_{metric}"
+
+            if metric_type == "histogram":
+                # samples of a histogram family are suffixed by what they hold
+                family = f"{name}_seconds"
+
+                for bound, count in value["buckets"].items():
+                    bucket_labels = {**labels, "le": bound}
+                    add(family, "histogram", "_bucket", bucket_labels, count)
+
+                add(family, "histogram", "_sum", labels, value["sum"])
+                add(family, "histogram", "_count", labels, value["count"])
+            elif metric_type == "counter":
+                add(f"{name}_total", "counter", "", labels, value)
+            elif metric_type == "timer":
+                add(f"{name}_seconds_total", "counter", "", labels, value)
+            else:
+                add(name, "gauge", "", labels, value)
+
+    lines = []
+
+    for family, (metric_type, samples) in families.items():
+        lines.append(f"# TYPE {family} {metric_type}")
+        lines.extend(
+            f"{family}{suffix}{{{_labels(labels)}}} {value}"
+            for suffix, labels, value in samples
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path, stream_metrics):
+    """Write the metrics of each stream to the Prometheus textfile at `path`.
+
+    The file is replaced in one step, so a collector never reads part of it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, suffix=".tmp", delete=False
+    ) as file:
+        file.write(prometheus_text(stream_metrics))
+
+    os.replace(file.name, path)
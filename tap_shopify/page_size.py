@@ -0,0 +1,69 @@
+"""Adaptive page sizes for tap_shopify REST streams.
+
+Most REST endpoints return 50 records a page unless asked for up to 250, so
+pages are requested at the maximum. Large records (e.g. products with hundreds
+of variants) can make a full page slow to return or too big to hold, so the
+page size is halved while pages come back slow or oversized, and grown back
+gradually once they recover.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# records per page accepted by the REST endpoints
+MAX_PAGE_SIZE = 250
+MIN_PAGE_SIZE = 10
+
+# seconds to request and read a page, beyond which the page size is reduced
+DEFAULT_SLOW_PAGE_SECONDS = 10.0
+
+# decoded bytes of a page, beyond which the page size is reduced
+MAX_PAGE_BYTES = 8 * 1024 * 1024
+
+
+class PageSize:
+    """The number of records to request a page, adjusted to how pages respond.
+
+    Safe to share between the threads requesting backfill windows of a stream.
+    """
+
+    def __init__(
+        self,
+        maximum=MAX_PAGE_SIZE,
+        slow_seconds=DEFAULT_SLOW_PAGE_SECONDS,
+        max_bytes=MAX_PAGE_BYTES,
+        minimum=MIN_PAGE_SIZE,
+    ):
+        """Initialise the page size at `maximum`."""
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.slow_seconds = slow_seconds
+        self.max_bytes = max_bytes
+        self.size = maximum
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, nbytes):
+        """Adjust the page size to a page that took `seconds` and `nbytes`.
+
+        Slow or oversized pages halve the size, and pages well within both limits
+        grow it by a quarter, so it recovers over a few pages.
+        """
+        with self._lock:
+            size = self.size
+
+            if seconds > self.slow_seconds or nbytes > self.max_bytes:
+                size = max(self.minimum, size // 2)
+            elif seconds < self.slow_seconds / 2 and nbytes < self.max_bytes / 2:
+                size = min(self.maximum, size + max(1, size // 4))
+
+            if size != self.size:
+                logger.debug(
+                    "Page size %d -> %d after a page of %.1fs and %d bytes",
+                    self.size,
+                    size,
+                    seconds,
+                    nbytes,
+                )
+                self.size = size
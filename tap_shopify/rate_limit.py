@@ -0,0 +1,158 @@
+"""Client-side model of the Shopify API rate limits for tap_shopify.
+
+Shopify meters each shop with leaky buckets: the REST Admin API counts requests
+and reports the bucket level in the `X-Shopify-Shop-Api-Call-Limit` header,
+while the GraphQL Admin API counts query cost points and reports them in
+`extensions.cost.throttleStatus`. Tracking both from every response lets the tap
+pace its requests before the bucket fills, rather than reacting to 429s.
+
+https://shopify.dev/docs/api/usage/rate-limits
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+from tap_shopify.graphql import response_payload
+
+logger = logging.getLogger(__name__)
+
+# keep this share of each bucket free for other apps installed on the shop
+HEADROOM = 0.1
+
+# standard plan limits, replaced by the values the API reports
+REST_CAPACITY = 40
+GRAPHQL_CAPACITY = 2000
+GRAPHQL_RESTORE_RATE = 100
+
+# the REST bucket leaks at 1/20th of its size per second on every plan, e.g.
+# 40 calls at 2/s (standard) or 400 calls at 20/s (Plus)
+REST_LEAK_SECONDS = 20
+
+# assumed cost of a GraphQL query until the API has reported one
+GRAPHQL_DEFAULT_COST = 50
+
+
+class LeakyBucket:
+    """Estimate of a single Shopify bucket, drained at its leak rate over time."""
+
+    def __init__(self, capacity, leak_rate):
+        """Initialise an empty bucket."""
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.level = 0.0
+        self._updated = time.monotonic()
+
+    def _drain(self, now):
+        self.level = max(0.0, self.level - (now - self._updated) * self.leak_rate)
+        self._updated = now
+
+    def reserve(self, amount, now):
+        """Add `amount` to the bucket and return the seconds to wait before use.
+
+        The amount is reserved immediately, so concurrent callers queue up behind
+        each other instead of all waiting for the same slot.
+        """
+        self._drain(now)
+        self.level += amount
+        overflow = self.level - self.capacity * (1 - HEADROOM)
+
+        return max(0.0, overflow / self.leak_rate)
+
+    def observe(self, level, capacity, leak_rate, now):
+        """Replace the estimate with the state reported by the API."""
+        self.level = float(level)
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self._updated = now
+
+
+class ShopifyRateLimiter:
+    """Paces requests to a shop against its REST and GraphQL buckets.
+
+    Thread-safe: waits are reserved under a lock and slept outside it.
+    """
+
+    def __init__(self):
+        """Initialise the limiter with standard plan limits."""
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._graphql_cost = float(GRAPHQL_DEFAULT_COST)
+        self.rest = LeakyBucket(REST_CAPACITY, REST_CAPACITY / REST_LEAK_SECONDS)
+        self.graphql = LeakyBucket(GRAPHQL_CAPACITY, GRAPHQL_RESTORE_RATE)
+
+    @staticmethod
+    def _is_graphql(url):
+        return urlparse(url).path.endswith("/graphql.json")
+
+    def acquire(self, request):
+        """Block until `request` can be sent, returning the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+
+            if self._is_graphql(request.url):
+                wait = self.graphql.reserve(self._graphql_cost, now)
+            else:
+                wait = self.rest.reserve(1, now)
+
+            wait = max(wait, self._blocked_until - now)
+
+        if wait > 0:
+            logger.debug("Waiting %.2fs for the Shopify rate limit", wait)
+            time.sleep(wait)
+
+        return max(wait, 0.0)
+
+    def headroom(self, url):
+        """Return the share of the bucket metering requests to `url` left free."""
+        bucket = self.graphql if self._is_graphql(url) else self.rest
+
+        with self._lock:
+            return max(0.0, 1 - bucket.level / bucket.capacity)
+
+    def observe(self, response):
+        """Update the bucket estimates from a Shopify API response."""
+        now = time.monotonic()
+
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After") or 1)
+
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            return
+
+        if self._is_graphql(response.url):
+            self._observe_graphql(response, now)
+            return
+
+        # e.g. "32/40"
+        call_limit = response.headers.get("X-Shopify-Shop-Api-Call-Limit")
+
+        if not call_limit:
+            return
+
+        used, capacity = (int(value) for value in call_limit.split("/"))
+
+        with self._lock:
+            self.rest.observe(used, capacity, capacity / REST_LEAK_SECONDS, now)
+
+    def _observe_graphql(self, response, now):
+        try:
+            cost = response_payload(response)["extensions"]["cost"]
+        except (ValueError, KeyError, TypeError):
+            return
+
+        # https://shopify.dev/docs/api/usage/rate-limits#graphql-admin-api-rate-limits
+        throttle_status = cost["throttleStatus"]
+        capacity = throttle_status["maximumAvailable"]
+
+        with self._lock:
+            self.graphql.observe(
+                capacity - throttle_status["currentlyAvailable"],
+                capacity,
+                throttle_status["restoreRate"],
+                now,
+            )
+            self._graphql_cost = float(cost["requestedQueryCost"])
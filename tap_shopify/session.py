@@ -0,0 +1,41 @@
+"""HTTP session shared by the tap_shopify streams.
+
+Every stream sends its requests through one session per tap, so connections to
+the shop are kept alive and reused across streams instead of paying for a new
+TLS handshake each time a stream starts.
+"""
+
+import importlib.util
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+# seconds to wait for a connection, and then for each read from the socket
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_REQUEST_TIMEOUT = 300
+
+
+def accept_encoding():
+    """Return the content codings to ask Shopify for.
+
+    JSON pages compress around 10x. Brotli is preferred, but urllib3 can only
+    decode it with the optional `brotli` package installed.
+    """
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        return "br, gzip"
+
+    return "gzip"
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """Return a session keeping up to `pool_size` connections alive per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = accept_encoding()
+
+    return session
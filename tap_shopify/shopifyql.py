@@ -0,0 +1,144 @@
+"""ShopifyQL helpers for tap_shopify.
+
+The columns a ShopifyQL query returns are only known by running it, so they are
+cached on disk between runs rather than probed from the API every time the tap
+builds its streams.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from singer_sdk import typing as th
+
+logger = logging.getLogger(__name__)
+
+# seconds a cached column set is used for before the query is probed again
+DEFAULT_SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+# JSON Schema types of the ShopifyQL column data types that are not strings,
+# https://shopify.dev/docs/api/admin-graphql/2025-10/enums/ColumnDataType
+_COLUMN_TYPES = {
+    "DAY_TIMESTAMP": th.DateType,
+    "FLOAT": th.NumberType,
+    "INTEGER": th.IntegerType,
+    "MONEY": th.NumberType,
+    "PERCENT": th.NumberType,
+}
+
+_DATE_RANGE = re.compile(r"\b(SINCE|UNTIL)\s+\S+", re.IGNORECASE)
+_RELATIVE_DATE = re.compile(r"-(\d+)([dw])", re.IGNORECASE)
+
+
+def default_cache_dir():
+    """Return the directory ShopifyQL columns are cached in by default."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "tap-shopify" / "shopifyql"
+
+
+def column_type(data_type):
+    """Return the JSON Schema type of a ShopifyQL column `data_type`.
+
+    Types without a closer match, including any added to the API later, are
+    strings.
+    """
+    return _COLUMN_TYPES.get(data_type, th.StringType)
+
+
+def strip_date_range(query):
+    """Return `query` without its SINCE and UNTIL clauses."""
+    return _DATE_RANGE.sub("", query).strip()
+
+
+def get_clause(query, keyword):
+    """Return the value of the `keyword` (SINCE or UNTIL) clause, if any."""
+    match = re.search(rf"\b{keyword}\s+(\S+)", query, re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def set_clause(query, keyword, value):
+    """Return `query` with its `keyword` (SINCE or UNTIL) clause set to `value`."""
+    if re.search(rf"\b{keyword}\b", query, re.IGNORECASE):
+        return re.sub(
+            rf"\b{keyword}\s+\S+", f"{keyword} {value}", query, flags=re.IGNORECASE
+        )
+
+    return query.rstrip() + f" {keyword} {value}"
+
+
+def resolve_date(value, today):
+    """Return the date a SINCE/UNTIL value refers to, or None if unsupported.
+
+    Supports ISO dates, `today`, `yesterday`, and offsets in days or weeks such as
+    `-30d`. Calendar offsets (e.g. `-3m`) and functions are not resolved.
+    """
+    value = value.lower()
+
+    if value == "today":
+        return today
+
+    if value == "yesterday":
+        return today - timedelta(days=1)
+
+    if match := _RELATIVE_DATE.fullmatch(value):
+        days = int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+        return today - timedelta(days=days)
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def cache_key(query, api_version):
+    """Return the cache key for the columns of `query`.
+
+    The date range does not change the columns returned, and neither does
+    whitespace, so both are normalised away.
+    """
+    normalised = " ".join(strip_date_range(query).split())
+    digest = hashlib.sha256(f"{api_version}\n{normalised}".encode())
+
+    return digest.hexdigest()
+
+
+class ColumnCache:
+    """On-disk cache of ShopifyQL query columns, one JSON file per query."""
+
+    def __init__(self, directory, ttl=DEFAULT_SCHEMA_CACHE_TTL):
+        """Initialise a cache of files in `directory` that expire after `ttl`."""
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def get(self, key):
+        """Return the cached columns for `key`, or None if missing or expired."""
+        path = self.directory / f"{key}.json"
+
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, columns):
+        """Cache `columns` for `key`, logging rather than failing on errors."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            # write then rename, so concurrent runs never read a partial file
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.directory, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(columns, file)
+
+            os.replace(file.name, self.directory / f"{key}.json")
+        except OSError as ex:
+            logger.warning("Could not cache ShopifyQL columns: %s", ex)
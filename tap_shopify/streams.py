@@ -1,20 +1,70 @@
 """Stream type classes for tap-shopify."""
 
 import json
-import re
-from decimal import Decimal
+from datetime import datetime, timedelta, timezone
 from functools import cached_property
-from pathlib import Path
+from itertools import islice
+from typing import Optional
 
-import requests
 from singer_sdk import typing as th
 from singer_sdk.exceptions import FatalAPIError
 from typing_extensions import override
 
-from tap_shopify import hiddendict
-from tap_shopify.client import tap_shopifyStream
-
-SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
+from tap_shopify.bulk import BulkResultSpool
+from tap_shopify.client import (
+    API_VERSION,
+    parse_timestamp,
+    tap_shopifyStream,
+    with_shop_property,
+)
+from tap_shopify.graphql import (
+    ORDER_TRANSACTIONS_QUERY,
+    PRODUCT_CONNECTION_QUERIES,
+    PRODUCTS_QUERY,
+    line_item_from_node,
+    metafield_from_node,
+    metafields_bulk_query,
+    order_from_node,
+    orders_bulk_query,
+    product_from_node,
+    response_payload,
+    shipping_line_from_node,
+    to_gid,
+    transaction_from_node,
+)
+from tap_shopify.page_size import MAX_PAGE_SIZE
+from tap_shopify.shopifyql import (
+    DEFAULT_SCHEMA_CACHE_TTL,
+    ColumnCache,
+    cache_key,
+    column_type,
+    default_cache_dir,
+    get_clause,
+    resolve_date,
+    set_clause,
+    strip_date_range,
+)
+
+# orders per `nodes(ids:)` query when `batch_transactions` is enabled
+TRANSACTIONS_BATCH_SIZE = 50
+
+# products per GraphQL query to start with, when `graphql_products` is enabled,
+# before the page is sized to PRODUCTS_QUERY_COST
+GRAPHQL_PRODUCTS_PAGE_SIZE = 5
+
+# requested cost to size GraphQL product queries to, within the maximum of 1000
+# https://shopify.dev/docs/api/usage/rate-limits#graphql-admin-api-rate-limits
+PRODUCTS_QUERY_COST = 900
+
+# variants and images queried with each product, and per query for the rest
+PRODUCT_CONNECTION_PAGE_SIZE = 25
+PRODUCT_CONNECTION_MAX_PAGE_SIZE = 100
+
+# maximum number of ids accepted by /inventory_items.json
+INVENTORY_ITEMS_BATCH_SIZE = 100
+
+# maximum number of location_ids accepted by /inventory_levels.json
+INVENTORY_LEVELS_LOCATIONS_BATCH_SIZE = 50
 
 
 class AbandonedCheckouts(tap_shopifyStream):
@@ -25,7 +75,7 @@ class AbandonedCheckouts(tap_shopifyStream):
     records_jsonpath = "$.checkouts[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "abandoned_checkout.json"
+    schema_filename = "abandoned_checkout.json"
 
 
 class CollectStream(tap_shopifyStream):
@@ -36,7 +86,7 @@ class CollectStream(tap_shopifyStream):
     records_jsonpath = "$.collects[*]"
     primary_keys = ["id"]
     replication_key = "id"
-    schema_filepath = SCHEMAS_DIR / "collect.json"
+    schema_filename = "collect.json"
 
     def get_url_params(self, context, next_page_token):
         """Return a dictionary of values to be used in URL parameterization."""
@@ -59,7 +109,7 @@ class CustomCollections(tap_shopifyStream):
     records_jsonpath = "$.custom_collections[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "custom_collection.json"
+    schema_filename = "custom_collection.json"
 
 
 class CustomersStream(tap_shopifyStream):
@@ -70,7 +120,7 @@ class CustomersStream(tap_shopifyStream):
     records_jsonpath = "$.customers[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "customer.json"
+    schema_filename = "customer.json"
 
 
 class LocationsStream(tap_shopifyStream):
@@ -80,59 +130,190 @@ class LocationsStream(tap_shopifyStream):
     path = "/locations.json"
     records_jsonpath = "$.locations[*]"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "location.json"
-
-    def get_child_context(self, record, context):
-        """Return a context dictionary for child streams."""
-        return {"location_id": record["id"]}
+    schema_filename = "location.json"
+    max_page_size = None  # every location is returned at once
 
 
 class InventoryLevelsStream(tap_shopifyStream):
-    """Inventory levels stream."""
+    """Inventory levels stream.
 
-    parent_stream_type = LocationsStream
+    Levels are requested for many locations at once, and only those updated
+    since the last sync are fetched.
+    """
 
     name = "inventory_levels"
     path = "/inventory_levels.json"
     records_jsonpath = "$.inventory_levels[*]"
-    primary_keys = ["inventory_item_id"]
-    schema_filepath = SCHEMAS_DIR / "inventory_level.json"
+    primary_keys = ["inventory_item_id", "location_id"]
+    replication_key = "updated_at"
+    schema_filename = "inventory_level.json"
+    state_partitioning_keys = []
+    supports_fields_param = False
 
     def get_child_context(self, record, context):
         """Return a context dictionary for child streams."""
         return {"inventory_item_id": record["inventory_item_id"]}
 
+    def request_records(self, context):
+        """Request levels for every location, in batches of locations."""
+        location_ids = iter(self._get_location_ids(context))
+
+        while batch := list(
+            islice(location_ids, INVENTORY_LEVELS_LOCATIONS_BATCH_SIZE)
+        ):
+            yield from super().request_records(
+                {**(context or {}), "location_ids": ",".join(str(i) for i in batch)}
+            )
+
+    def _get_location_ids(self, context):
+        # requested here rather than through the locations stream, which would
+        # checkpoint its own state from inside this stream's sync
+        location_ids: list = []
+        url: Optional[str] = f"{self.url_base}{LocationsStream.path}"
+
+        while url:
+            prepared_request = self.build_prepared_request(
+                method="GET", url=url, headers=self.http_headers
+            )
+            response = self.request_decorator(self._request)(prepared_request, context)
+
+            with response:
+                location_ids.extend(
+                    location["id"] for location in response.json().get("locations", [])
+                )
+
+            url = response.links.get("next", {}).get("url")
+
+        return location_ids
+
     def get_url_params(self, context, next_page_token):
         """Return a dictionary of values to be used in URL parameterization."""
-        params = super().get_url_params(context, next_page_token)
+        if next_page_token:
+            return super().get_url_params(context, next_page_token)
 
-        if not next_page_token:
-            params["location_ids"] = context["location_id"]
+        params = {"location_ids": context["location_ids"], **self.page_size_params}
+
+        if window := context.get("backfill_window"):
+            params["updated_at_min"] = window["updated_at_min"]
+
+            if "updated_at_max" in window:
+                params["updated_at_max"] = window["updated_at_max"]
+        elif updated_at_min := self.get_starting_replication_key_value(context):
+            # the endpoint filters on updated_at only, so start_date applies here too
+            params["updated_at_min"] = updated_at_min
 
         return params
 
 
 class InventoryItemsStream(tap_shopifyStream):
-    """Inventory items stream."""
+    """Inventory items stream.
+
+    Items are requested by id in batches gathered from the parent inventory
+    levels, and each item is synced once however many locations stock it.
+    """
 
     parent_stream_type = InventoryLevelsStream
 
     name = "inventory_items"
-    path = "/inventory_items/{inventory_item_id}.json"
-    records_jsonpath = "$.inventory_item"
+    path = "/inventory_items.json"
+    records_jsonpath = "$.inventory_items[*]"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "inventory_item.json"
+    schema_filename = "inventory_item.json"
+    state_partitioning_keys = []
+    prefetch_batch_size = INVENTORY_ITEMS_BATCH_SIZE
+    supports_fields_param = False
+
+    @override
+    @property
+    def parent_fields(self):
+        return ["inventory_item_id"]
+
+    def __init__(self, *args, **kwargs):
+        """Initialise the inventory items stream."""
+        super().__init__(*args, **kwargs)
+        self._prefetched: dict = {}
+        self._fetched_ids: set = set()
+
+    def prefetch(self, records):
+        """Fetch the inventory items for a batch of levels not yet synced."""
+        self._prefetched = {}
+        item_ids = iter(
+            dict.fromkeys(
+                record["inventory_item_id"]
+                for record in records
+                if record["inventory_item_id"] not in self._fetched_ids
+            )
+        )
+
+        while batch := list(islice(item_ids, INVENTORY_ITEMS_BATCH_SIZE)):
+            self._fetched_ids.update(batch)
+            context = {"inventory_item_ids": ",".join(str(i) for i in batch)}
+
+            for record in self.request_records(context):
+                self._prefetched[record["id"]] = record
+
+    def get_records(self, context):
+        """Return the prefetched inventory item for the level, if not yet synced."""
+        if record := self._prefetched.pop(context["inventory_item_id"], None):
+            yield record
+
+    def get_url_params(self, context, next_page_token):
+        """Return a dictionary of values to be used in URL parameterization."""
+        if next_page_token:
+            return super().get_url_params(context, next_page_token)
+
+        return {"ids": context["inventory_item_ids"], **self.page_size_params}
 
 
 class MetafieldsStream(tap_shopifyStream):
-    """Metafields stream."""
+    """Metafields stream.
+
+    Shop metafields are requested from the REST API, and the metafields of each
+    other resource in `metafield_owners` are extracted by a bulk operation.
+    """
 
     name = "metafields"
     path = "/metafields.json"
     records_jsonpath = "$.metafields[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "metafield.json"
+    schema_filename = "metafield.json"
+
+    @property
+    def partitions(self):
+        """Return a context for each resource in `metafield_owners`.
+
+        Each owner is bookmarked apart, as they are extracted separately, and an
+        owner added later starts from `start_date` rather than the bookmark of
+        the others.
+        """
+        owners = self.config.get("metafield_owners") or ["shop"]
+        return [{"owner_resource": owner} for owner in owners]
+
+    def request_records(self, context):
+        """Request the metafields of the resource of `context`."""
+        owner = context["owner_resource"]
+
+        if owner == "shop":
+            yield from super().request_records(context)
+            return
+
+        start_value = self.get_starting_replication_key_value(context)
+        start = parse_timestamp(start_value) if start_value else None
+
+        self.logger.info("Extracting %s metafields", owner)
+
+        for node in self.run_bulk_operation(metafields_bulk_query(owner), context):
+            # lines without a parent are the owners themselves
+            if "__parentId" not in node:
+                continue
+
+            # owners cannot be searched by the time their metafields changed,
+            # so every metafield is extracted and those synced before dropped
+            if start and parse_timestamp(node["updatedAt"]) < start:
+                continue
+
+            yield metafield_from_node(node, owner)
 
 
 class OrdersStream(tap_shopifyStream):
@@ -143,29 +324,70 @@ class OrdersStream(tap_shopifyStream):
     records_jsonpath = "$.orders[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "order.json"
-    is_sorted = True
+    schema_filename = "order.json"
 
-    def post_process(self, row, context=None):
-        """Perform syntactic transformations only."""
-        row = super().post_process(row, context)
+    @override
+    @property
+    def is_sorted(self):
+        # bulk operation results are not guaranteed to be in sort key order
+        return not self.config.get("bulk_mode")
 
-        if row:
-            row["subtotal_price"] = Decimal(row["subtotal_price"])
-            row["total_price"] = Decimal(row["total_price"])
-        return row
+    def get_bulk_query(self, context):
+        """Return the bulk operation query for the orders to sync."""
+        selected_descendents = {
+            stream.name for stream in self.descendent_streams if stream.selected
+        }
+
+        if selected_descendents & {"refund_line_items", "order_adjustments"}:
+            self.logger.warning(
+                "Refund line items and order adjustments are not available in "
+                "bulk mode, so no records will be synced for them"
+            )
+
+        return orders_bulk_query(
+            self.get_search_query(context),
+            transactions="transactions" in selected_descendents,
+        )
+
+    def request_records(self, context):
+        """Request orders, through a bulk operation if `bulk_mode` is enabled."""
+        if not self.config.get("bulk_mode"):
+            yield from super().request_records(context)
+            return
+
+        query = self.get_bulk_query(context)
+
+        # the lines of nested connections are not guaranteed to follow their
+        # order, so every line is spooled to disk before any order is yielded
+        with BulkResultSpool() as spool:
+            for node in self.run_bulk_operation(query, context):
+                spool.add(node)
+
+            for node, children in spool.groups():
+                order = order_from_node(node)
+
+                for child in children:
+                    if child["__typename"] == "LineItem":
+                        order["line_items"].append(line_item_from_node(child))
+                    else:
+                        order["shipping_lines"].append(shipping_line_from_node(child))
+
+                yield order
+
+            for parent_id, count in spool.orphans().items():
+                self.logger.warning(
+                    "Skipping %d lines of order %s, missing from the result",
+                    count,
+                    parent_id,
+                )
 
     def get_child_context(self, record, context):
         """Return a context dictionary for child streams."""
-        return {
-            "order_id": record["id"],
-            "order": hiddendict(record),
-        }
+        return {"order_id": record["id"]}
 
     def get_url_params(self, context, next_page_token):
         """Return a dictionary of values to be used in URL parameterization."""
         params = super().get_url_params(context, next_page_token)
-        params["limit"] = 250
 
         if not next_page_token:
             params["status"] = "any"
@@ -174,16 +396,32 @@ class OrdersStream(tap_shopifyStream):
         return params
 
 
-class _OrderEmbeddedStream(tap_shopifyStream):
-    parent_stream_type = OrdersStream
+class _EmbeddedStream(tap_shopifyStream):
     state_partitioning_keys = []  # do not store any state bookmarks
+    embedded = True
+    parent_id_key: str
 
-    def get_records(self, context):
-        yield from context["order"][self.name]
+    @override
+    @property
+    def parent_fields(self):
+        return [self.name]
 
-    def post_process(self, row, context=None):
-        row["order_id"] = context["order_id"]
-        return row
+    def get_embedded_records(self, parent):
+        """Return the records of this stream held in a parent record."""
+        # copied, as the parent record is written after they are read
+        return [
+            {**record, self.parent_id_key: parent["id"]}
+            for record in parent.get(self.name) or []
+        ]
+
+    @override
+    def request_records(self, context):
+        yield from context["records"]
+
+
+class _OrderEmbeddedStream(_EmbeddedStream):
+    parent_stream_type = OrdersStream
+    parent_id_key = "order_id"
 
 
 class LineItemsStream(_OrderEmbeddedStream):
@@ -191,7 +429,7 @@ class LineItemsStream(_OrderEmbeddedStream):
 
     name = "line_items"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "line_item.json"
+    schema_filename = "line_item.json"
 
 
 class ShippingLinesStream(_OrderEmbeddedStream):
@@ -199,7 +437,7 @@ class ShippingLinesStream(_OrderEmbeddedStream):
 
     name = "shipping_lines"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "shipping_line.json"
+    schema_filename = "shipping_line.json"
 
 
 class TaxLinesStream(_OrderEmbeddedStream):
@@ -207,18 +445,90 @@ class TaxLinesStream(_OrderEmbeddedStream):
 
     name = "tax_lines"
     primary_keys = ["order_id", "title", "rate", "price"]
-    schema_filepath = SCHEMAS_DIR / "tax_line.json"
+    schema_filename = "tax_line.json"
 
 
 class ProductsStream(tap_shopifyStream):
-    """Products stream."""
+    """Products stream.
+
+    With `graphql_products` enabled, products are paged through the GraphQL
+    Admin API with their variants and images, rather than the REST API.
+    """
 
     name = "products"
     path = "/products.json"
     records_jsonpath = "$.products[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "product.json"
+    schema_filename = "product.json"
+
+    @override
+    @property
+    def is_sorted(self):
+        # the GraphQL query sorts by the replication key
+        return bool(self.config.get("graphql_products"))
+
+    def request_records(self, context):
+        """Request products, through GraphQL if `graphql_products` is enabled."""
+        if not self.config.get("graphql_products"):
+            yield from super().request_records(context)
+            return
+
+        variables = {
+            "first": GRAPHQL_PRODUCTS_PAGE_SIZE,
+            "query": self.get_search_query(context) or None,
+            "variants": PRODUCT_CONNECTION_PAGE_SIZE,
+            "images": PRODUCT_CONNECTION_PAGE_SIZE,
+        }
+
+        while True:
+            response = self.request_graphql_response(PRODUCTS_QUERY, variables, context)
+            products = response["data"]["products"]
+
+            for node in products["nodes"]:
+                node["variants"] = self._all_nodes(node, "variants", context)
+                node["images"] = self._all_nodes(node, "images", context)
+                yield product_from_node(node)
+
+            if not products["pageInfo"]["hasNextPage"]:
+                return
+
+            variables["after"] = products["pageInfo"]["endCursor"]
+            variables["first"] = self._products_page_size(variables["first"], response)
+
+    def _all_nodes(self, product, connection, context):
+        nodes = product[connection]["nodes"]
+        page_info = product[connection]["pageInfo"]
+
+        # products with more variants or images than queried with each product
+        while page_info["hasNextPage"]:
+            data = self.request_graphql(
+                PRODUCT_CONNECTION_QUERIES[connection],
+                {
+                    "id": product["id"],
+                    "first": PRODUCT_CONNECTION_MAX_PAGE_SIZE,
+                    "after": page_info["endCursor"],
+                },
+                context,
+            )
+            nodes.extend(data["node"][connection]["nodes"])
+            page_info = data["node"][connection]["pageInfo"]
+
+        return nodes
+
+    @staticmethod
+    def _products_page_size(page_size, response):
+        # the requested cost grows with the products queried, so scale the page
+        # to keep it within the budget
+        cost = (response.get("extensions") or {}).get("cost") or {}
+        requested = cost.get("requestedQueryCost")
+
+        if not requested:
+            return page_size
+
+        return max(
+            1, min(MAX_PAGE_SIZE, int(page_size * PRODUCTS_QUERY_COST / requested))
+        )
 
 
 class TransactionsStream(tap_shopifyStream):
@@ -230,8 +540,55 @@ class TransactionsStream(tap_shopifyStream):
     path = "/orders/{order_id}/transactions.json"
     records_jsonpath = "$.transactions[*]"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "transaction.json"
+    schema_filename = "transaction.json"
     state_partitioning_keys = []
+    max_page_size = None  # every transaction of the order is returned at once
+
+    def __init__(self, *args, **kwargs):
+        """Initialise the transactions stream."""
+        super().__init__(*args, **kwargs)
+        self._prefetched: dict = {}
+
+    @override
+    @property
+    def prefetch_batch_size(self):
+        if self.config.get("batch_transactions") or self.config.get("bulk_mode"):
+            return TRANSACTIONS_BATCH_SIZE
+
+        return None
+
+    def prefetch(self, records):
+        """Fetch transactions for a batch of orders through GraphQL."""
+        if self.config.get("bulk_mode"):
+            # already fetched inline by the orders bulk operation
+            self._prefetched = {
+                record["id"]: record.pop("transactions", []) for record in records
+            }
+            return
+
+        self._prefetched = {}
+        order_ids = {to_gid("Order", record["id"]): record["id"] for record in records}
+        gids = iter(order_ids)
+
+        while batch := list(islice(gids, TRANSACTIONS_BATCH_SIZE)):
+            data = self.request_graphql(ORDER_TRANSACTIONS_QUERY, {"ids": batch})
+
+            for node in data["nodes"]:
+                if not node:
+                    continue  # order deleted since its page was read
+
+                self._prefetched[order_ids[node["id"]]] = [
+                    transaction_from_node(transaction)
+                    for transaction in node["transactions"]
+                ]
+
+    def get_records(self, context):
+        """Return prefetched transactions for the order when batching."""
+        if self.prefetch_batch_size:
+            yield from self._prefetched.pop(context["order_id"], [])
+            return
+
+        yield from super().get_records(context)
 
     def post_process(self, row, context=None):
         """Attach order context to each transaction."""
@@ -249,26 +606,12 @@ class RefundsStream(_OrderEmbeddedStream):
 
     name = "refunds"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "refund.json"
-
-    def get_child_context(self, record, context):
-        """Pass refund context to child streams."""
-        return {
-            "refund_id": record["id"],
-            "refund": hiddendict(record),
-        }
+    schema_filename = "refund.json"
 
 
-class _RefundEmbeddedStream(tap_shopifyStream):
+class _RefundEmbeddedStream(_EmbeddedStream):
     parent_stream_type = RefundsStream
-    state_partitioning_keys = []  # do not store any state bookmarks
-
-    def get_records(self, context):
-        yield from context["refund"][self.name]
-
-    def post_process(self, row, context=None):
-        row["refund_id"] = context["refund_id"]
-        return row
+    parent_id_key = "refund_id"
 
 
 class RefundLineItemsStream(_RefundEmbeddedStream):
@@ -276,7 +619,7 @@ class RefundLineItemsStream(_RefundEmbeddedStream):
 
     name = "refund_line_items"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "refund_line_item.json"
+    schema_filename = "refund_line_item.json"
 
 
 class OrderAdjustmentsStream(_RefundEmbeddedStream):
@@ -284,7 +627,7 @@ class OrderAdjustmentsStream(_RefundEmbeddedStream):
 
     name = "order_adjustments"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "order_adjustment.json"
+    schema_filename = "order_adjustment.json"
 
 
 class UsersStream(tap_shopifyStream):
@@ -294,7 +637,7 @@ class UsersStream(tap_shopifyStream):
     path = "/users.json"
     records_jsonpath = "$.users[*]"
     primary_keys = ["id"]
-    schema_filepath = SCHEMAS_DIR / "user.json"
+    schema_filename = "user.json"
 
 
 class OrderDiscountCodesStream(_OrderEmbeddedStream):
@@ -302,15 +645,21 @@ class OrderDiscountCodesStream(_OrderEmbeddedStream):
 
     name = "order_discount_codes"
     primary_keys = ["order_id", "index"]
-    schema_filepath = SCHEMAS_DIR / "order_discount_codes.json"
+    schema_filename = "order_discount_codes.json"
 
-    def get_records(self, context):
-        """Yield each discount code with a 1-based index per order."""
-        discount_codes = context["order"].get("discount_codes") or []
-        for idx, code in enumerate(discount_codes, start=1):
-            if not code:
-                continue
-            yield {**code, "index": idx}
+    @override
+    @property
+    def parent_fields(self):
+        return ["discount_codes"]
+
+    def get_embedded_records(self, parent):
+        """Return each discount code with a 1-based index per order."""
+        discount_codes = parent.get("discount_codes") or []
+        return [
+            {**code, "index": idx, "order_id": parent["id"]}
+            for idx, code in enumerate(discount_codes, start=1)
+            if code
+        ]
 
 
 class GiftCardsStream(tap_shopifyStream):
@@ -321,7 +670,7 @@ class GiftCardsStream(tap_shopifyStream):
     records_jsonpath = "$.gift_cards[*]"
     primary_keys = ["id"]
     replication_key = "updated_at"
-    schema_filepath = SCHEMAS_DIR / "gift_cards.json"
+    schema_filename = "gift_cards.json"
 
 
 class ShopifyQLStream(tap_shopifyStream):
@@ -345,8 +694,15 @@ class ShopifyQLStream(tap_shopifyStream):
     -----------------------------------------------------------------------
     The Singer schema is built by making a real API request with a
     constrained 1-day window and reading the column metadata from the
-    response. All values are typed as StringType (Shopify returns everything
-    as strings — cast to numeric/date types in dbt).
+    response. Each column is typed from its ShopifyQL data type: money, float
+    and percent columns are numbers, integer columns integers and day columns
+    dates. Other columns are strings. Rows are decoded to those types as they
+    are parsed.
+
+    The columns are cached on disk per query and API version, for
+    `shopifyql_schema_cache_ttl` seconds (a day by default), so the probe is
+    not repeated every time the tap starts. Set `shopifyql_schema_refresh` to
+    probe again regardless.
 
     -----------------------------------------------------------------------
     Incremental sync
@@ -358,17 +714,34 @@ class ShopifyQLStream(tap_shopifyStream):
     used as-is.
 
     Queries without a TIMESERIES clause are always full-refresh.
+
+    -----------------------------------------------------------------------
+    Windows
+    -----------------------------------------------------------------------
+    With `window_days` set, the reporting period is split into windows of
+    that many days, which are queried concurrently (up to
+    `backfill_concurrency` at once) and emitted in order.
     """
 
-    schema_filepath = None  # schema is discovered dynamically via API
     http_method = "POST"
     path = "/graphql.json"
+    max_page_size = None
 
     @override
     @property
     def is_sorted(self):
         return bool(self.replication_key)
 
+    @override
+    @property
+    def is_timestamp_replication_key(self):
+        # TIMESERIES columns such as "day" are dates, not date-times
+        property_schema = self.schema["properties"].get(self.replication_key, {})
+        return (
+            property_schema.get("format") == "date"
+            or super().is_timestamp_replication_key
+        )
+
     # GraphQL wrapper for the shopifyqlQuery field (API 2025-10+).
     # Double-braces {{ }} are literal braces in the formatted output.
     _GRAPHQL_TEMPLATE = (
@@ -383,55 +756,120 @@ class ShopifyQLStream(tap_shopifyStream):
         query_entry = kwargs.pop("query")
         self.name = query_entry["name"]
         self._configured_query = query_entry["query"]
-        self.primary_keys = query_entry.get("primary_keys") or []
-        self.replication_key = query_entry.get("replication_key")
+        self._window_days = query_entry.get("window_days")
 
         super().__init__(*args, **kwargs)
 
+        # set after the SDK has initialised them
+        self.primary_keys = query_entry.get("primary_keys") or []
+        self.replication_key = query_entry.get("replication_key")
+
     @cached_property
     def schema(self) -> dict:
-        """Discover schema by probing the API with a 1-day window."""
-        probe_query = re.sub(
-            r"\b(SINCE|UNTIL)\s+\S+",
-            "",
-            self._configured_query,
-            flags=re.IGNORECASE,
-        ).strip()
+        """Build the schema from the query's columns."""
+        props = [
+            th.Property(col["name"], column_type(col.get("dataType")))
+            for col in self.columns
+        ]
+        return with_shop_property(th.PropertiesList(*props).to_dict(), self.multi_store)
+
+    @cached_property
+    def columns(self) -> list:
+        """Return the query's columns, probing the API unless cached on disk."""
+        cache = ColumnCache(
+            self.config.get("shopifyql_schema_cache_dir") or default_cache_dir(),
+            self.config.get("shopifyql_schema_cache_ttl", DEFAULT_SCHEMA_CACHE_TTL),
+        )
+        key = cache_key(self._configured_query, API_VERSION)
+
+        if not self.config.get("shopifyql_schema_refresh"):
+            if (columns := cache.get(key)) is not None:
+                return columns
+
+        columns = self.probe_columns()
+        cache.set(key, columns)
+        return columns
+
+    def probe_columns(self):
+        """Return the query's columns by running it for a 1-day window."""
+        probe_query = strip_date_range(self._configured_query)
         probe_query += " SINCE -1d UNTIL -0d"
 
         graphql = self._GRAPHQL_TEMPLATE.format(shopifyql=json.dumps(probe_query))
-        response = requests.post(
-            self.url_base + self.path,
+        prepared_request = self.build_prepared_request(
+            method=self.http_method,
+            url=self.url_base + self.path,
             json={"query": graphql},
-            headers={"X-Shopify-Access-Token": self.config["access_token"]},
+            headers=self.http_headers,
         )
-        self.validate_response(response)
-        query: dict = response.json()["data"]["shopifyqlQuery"]
+        response = self.request_decorator(self._request)(prepared_request, None)
+        query: dict = response_payload(response)["data"]["shopifyqlQuery"]
 
         # https://shopify.dev/docs/api/admin-graphql/2025-10/objects/ShopifyqlTableData
-        columns = query["tableData"]["columns"] if "tableData" in query else []
+        return query["tableData"]["columns"] if "tableData" in query else []
 
-        props = [th.Property(col["name"], th.StringType) for col in columns]
-        return th.PropertiesList(*props).to_dict()
+    def get_since_date(self, context):
+        """Return the first date to query from state or `start_date`, if any."""
+        starting_ts = self.get_starting_timestamp(context)
+        return starting_ts.date() if starting_ts else None
+
+    @override
+    def get_backfill_windows(self, context):
+        """Split the query's reporting period into `window_days` windows.
+
+        Each window is queried separately, so a wide period is not returned in
+        one response bound by the query's LIMIT. The last window keeps the
+        query's own UNTIL clause.
+        """
+        window_days = self._window_days
+
+        if not window_days:
+            return []
+
+        today = datetime.now(timezone.utc).date()
+        query = self._configured_query
+        since = self.get_since_date(context) or resolve_date(
+            get_clause(query, "SINCE") or "", today
+        )
+        until = resolve_date(get_clause(query, "UNTIL") or "today", today)
+
+        if not since or not until:
+            self.logger.warning(
+                "Not splitting '%s' into windows, as its SINCE and UNTIL dates "
+                "could not be resolved",
+                self.name,
+            )
+            return []
+
+        windows = []
+
+        while since <= until:
+            end = since + timedelta(days=window_days - 1)
+            window = {"since": since.isoformat()}
+
+            if end < until:
+                window["until"] = end.isoformat()
+
+            windows.append(window)
+            since = end + timedelta(days=1)
+
+        return windows
 
     def prepare_request_payload(self, context, next_page_token):
         """Build the GraphQL POST body, injecting state into the SINCE clause."""
         query = self._configured_query
 
+        if context and "backfill_window" in context:
+            window = context["backfill_window"]
+            query = set_clause(query, "SINCE", window["since"])
+
+            if "until" in window:
+                query = set_clause(query, "UNTIL", window["until"])
+
         # Inject or replace SINCE using the starting timestamp, which resolves
         # to the last state value on incremental runs or start_date on first run.
-        starting_ts = self.get_starting_timestamp(context)
-        if starting_ts:
-            since_date = starting_ts.date().isoformat()
-            if re.search(r"\bSINCE\b", query, re.IGNORECASE):
-                query = re.sub(
-                    r"\bSINCE\s+\S+",
-                    f"SINCE {since_date}",
-                    query,
-                    flags=re.IGNORECASE,
-                )
-            else:
-                query = query.rstrip() + f" SINCE {since_date}"
+        elif since_date := self.get_since_date(context):
+            query = set_clause(query, "SINCE", since_date.isoformat())
 
         graphql = self._GRAPHQL_TEMPLATE.format(shopifyql=json.dumps(query))
         return {"query": graphql}
@@ -439,12 +877,9 @@ class ShopifyQLStream(tap_shopifyStream):
     @override
     def validate_response(self, response):
         super().validate_response(response)
+        self.validate_graphql_response(response)
 
-        data: dict = response.json()
-
-        # https://shopify.dev/docs/api/admin-graphql/2025-10#status-and-error-codes
-        if gql_errors := data.get("errors"):
-            raise FatalAPIError(f"GraphQL errors: {gql_errors}")
+        data: dict = response_payload(response)
 
         # https://shopify.dev/docs/api/admin-graphql/2025-10/objects/ShopifyqlQueryResponse
         query: dict = data["data"]["shopifyqlQuery"]
@@ -453,11 +888,17 @@ class ShopifyQLStream(tap_shopifyStream):
             raise FatalAPIError(f"ShopifyQL parse errors: {parse_errors}")
 
     def parse_response(self, response):
-        """Unpack the tabular ShopifyQL response into one dict per row."""
-        query: dict = response.json()["data"]["shopifyqlQuery"]
+        """Unpack the tabular ShopifyQL response into one typed dict per row."""
+        query: dict = response_payload(response)["data"]["shopifyqlQuery"]
 
         # https://shopify.dev/docs/api/admin-graphql/2025-10/objects/ShopifyqlTableData#field-ShopifyqlTableData
-        yield from (query["tableData"]["rows"] if "tableData" in query else [])
+        rows = query["tableData"]["rows"] if "tableData" in query else []
+
+        # compiled once per schema, converting only the columns that need it
+        if convert := self._coerce_record:
+            rows = map(convert, rows)
+
+        yield from rows
 
     def get_new_paginator(self):  # noqa: D403
         """ShopifyQL returns all rows in a single response — no pagination."""
@@ -1,9 +1,36 @@
 """tap_shopify tap class."""
 
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Optional
+
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers.types import TapState
 from typing_extensions import override
 
+from tap_shopify.auth import tap_shopifyAuthenticator
+from tap_shopify.client import (
+    DEFAULT_BACKFILL_CONCURRENCY,
+    DEFAULT_PAGE_CHECKPOINT_INTERVAL,
+    tap_shopifyStream,
+)
+from tap_shopify.concurrency import LockedSingerWriter
+from tap_shopify.dedup import DEFAULT_DEDUP_WINDOW_SIZE
+from tap_shopify.graphql import METAFIELD_OWNER_CONNECTIONS
+from tap_shopify.metrics import write_textfile
+from tap_shopify.page_size import DEFAULT_SLOW_PAGE_SECONDS, MAX_PAGE_SIZE
+from tap_shopify.session import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_REQUEST_TIMEOUT,
+    create_session,
+)
+from tap_shopify.shopifyql import DEFAULT_SCHEMA_CACHE_TTL
+
 # Import stream types
 from tap_shopify.streams import (
     AbandonedCheckouts,
@@ -29,6 +56,11 @@ from tap_shopify.streams import (
     UsersStream,
 )
 
+DEFAULT_STORE_CONCURRENCY = 4
+
+# settings each of `stores` has its own value of
+_STORE_SETTINGS = ("store", "access_token", "admin_url")
+
 STREAM_TYPES = [
     AbandonedCheckouts,
     CollectStream,
@@ -52,27 +84,73 @@ STREAM_TYPES = [
 ]
 
 
+class _StoreStateWriter:
+    """Writes the state of one store of a multi-store sync through its parent."""
+
+    def __init__(self, tap, shop):
+        self._tap = tap
+        self._shop = shop
+
+    def write_state(self, state):
+        self._tap.write_store_state(self._shop, state)
+
+
 class Tap_Shopify(Tap):
     """tap_shopify tap class."""
 
     name = "tap-shopify"
+    message_writer_class = LockedSingerWriter
+
+    # state last written while streams sync concurrently (see `sync_all`)
+    _published_state: Optional[TapState] = None
+
+    _authenticator: Optional[tap_shopifyAuthenticator] = None
+    _authenticator_lock = threading.Lock()
+
+    # taps syncing each of `stores`, in a multi-store sync
+    _store_taps: list = []
 
     config_jsonschema = th.PropertiesList(
         th.Property(
             "access_token",
             th.StringType,
-            required=True,
-            description="The access token to authenticate with the Shopify API",
+            description=(
+                "The access token to authenticate with the Shopify API. Required "
+                "unless `stores` is set"
+            ),
         ),
         th.Property(
             "store",
             th.StringType,
-            required=True,
             description=(
                 "Shopify store id, use the prefix of your admin url "
-                "e.g. https://[your store].myshopify.com/admin"
+                "e.g. https://[your store].myshopify.com/admin. Required unless "
+                "`stores` is set"
+            ),
+        ),
+        th.Property(
+            "stores",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property("store", th.StringType, required=True),
+                    th.Property("access_token", th.StringType, required=True),
+                    th.Property("admin_url", th.StringType),
+                )
+            ),
+            description=(
+                "Stores to sync in one run, each with its own `store`, "
+                "`access_token` and optional `admin_url`, in place of those "
+                "settings. Stores are synced concurrently, each with its own rate "
+                "limit and state, and records get a `shop` property holding their "
+                "store. Discovery uses the first store"
             ),
         ),
+        th.Property(
+            "store_concurrency",
+            th.IntegerType,
+            default=DEFAULT_STORE_CONCURRENCY,
+            description="Number of `stores` to sync at the same time",
+        ),
         th.Property(
             "start_date",
             th.DateTimeType,
@@ -90,6 +168,183 @@ class Tap_Shopify(Tap):
             th.BooleanType,
             description="Enabled Shopify plus account endpoints.",
         ),
+        th.Property(
+            "batch_transactions",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Fetch order transactions for up to 50 orders per GraphQL request, "
+                "instead of one REST request per order"
+            ),
+        ),
+        th.Property(
+            "graphql_products",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Page through products with their variants and images through the "
+                "GraphQL Admin API, instead of the REST API"
+            ),
+        ),
+        th.Property(
+            "metafield_owners",
+            th.ArrayType(
+                th.StringType(
+                    allowed_values=["shop", *sorted(METAFIELD_OWNER_CONNECTIONS)]
+                )
+            ),
+            description=(
+                "Resources to sync the metafields of: `shop`, `collection`, "
+                "`customer`, `order`, `product` or `variant`. Shop metafields "
+                "are requested from the REST API, and those of each other "
+                "resource are extracted by a GraphQL bulk operation. Defaults "
+                "to the shop's"
+            ),
+        ),
+        th.Property(
+            "bulk_mode",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Extract orders with their line items, shipping lines, refunds and "
+                "transactions through a single GraphQL bulk operation, instead of "
+                "paging the REST API. Refund line items and order adjustments are "
+                "not available in this mode"
+            ),
+        ),
+        th.Property(
+            "backfill_window_days",
+            th.IntegerType,
+            description=(
+                "Split the range synced by incremental `updated_at` streams into "
+                "windows of this many days, and request the windows concurrently"
+            ),
+        ),
+        th.Property(
+            "backfill_concurrency",
+            th.IntegerType,
+            default=4,
+            description=(
+                "Maximum number of backfill windows requested at the same time "
+                "(see `backfill_window_days`)"
+            ),
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            default=MAX_PAGE_SIZE,
+            description=(
+                "Number of records to request a page from REST endpoints, up to "
+                "250. Pages shrink from this while they are slow or large, and "
+                "grow back once they recover"
+            ),
+        ),
+        th.Property(
+            "slow_page_seconds",
+            th.NumberType,
+            default=DEFAULT_SLOW_PAGE_SECONDS,
+            description=(
+                "Seconds to request and read a page, beyond which smaller pages "
+                "are requested (see `page_size`)"
+            ),
+        ),
+        th.Property(
+            "page_checkpoint_interval",
+            th.IntegerType,
+            default=DEFAULT_PAGE_CHECKPOINT_INTERVAL,
+            description=(
+                "Number of pages between checkpoints of the page cursor of "
+                "top-level streams in state, from which an interrupted sync "
+                "resumes. 0 disables checkpoints"
+            ),
+        ),
+        th.Property(
+            "stream_concurrency",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Number of top-level streams (each with its child streams) to sync "
+                "at the same time"
+            ),
+        ),
+        th.Property(
+            "dedup_window_size",
+            th.IntegerType,
+            default=DEFAULT_DEDUP_WINDOW_SIZE,
+            description=(
+                "Number of the most recent (id, updated_at) pairs remembered per "
+                "stream to drop records repeated across pages. 0 disables it"
+            ),
+        ),
+        th.Property(
+            "fast_conformance",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Conform records to the catalog with functions compiled once per "
+                "stream, skipping the SDK's generic per-value type checks, which "
+                "only matter for values that cannot come from JSON"
+            ),
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            description=(
+                "Number of connections to the shop to keep alive for reuse. "
+                "Defaults to enough for `stream_concurrency` streams each "
+                "requesting `backfill_concurrency` windows at once"
+            ),
+        ),
+        th.Property(
+            "connect_timeout",
+            th.NumberType,
+            default=DEFAULT_CONNECT_TIMEOUT,
+            description="Seconds to wait for a connection to the Shopify API",
+        ),
+        th.Property(
+            "request_timeout",
+            th.NumberType,
+            default=DEFAULT_REQUEST_TIMEOUT,
+            description=(
+                "Seconds to wait for the Shopify API to send data before a request "
+                "is retried"
+            ),
+        ),
+        th.Property(
+            "metrics_textfile",
+            th.StringType,
+            description=(
+                "Path of a Prometheus textfile to write the performance metrics of "
+                "each stream to at the end of a sync, for the node exporter's "
+                "textfile collector"
+            ),
+        ),
+        th.Property(
+            "shopifyql_schema_cache_dir",
+            th.StringType,
+            description=(
+                "Directory to cache the columns of ShopifyQL queries in. Defaults "
+                "to `tap-shopify/shopifyql` in the user cache directory"
+            ),
+        ),
+        th.Property(
+            "shopifyql_schema_cache_ttl",
+            th.IntegerType,
+            default=DEFAULT_SCHEMA_CACHE_TTL,
+            description=(
+                "Seconds to use the cached columns of a ShopifyQL query for before "
+                "probing the API for them again"
+            ),
+        ),
+        th.Property(
+            "shopifyql_schema_refresh",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Probe the API for the columns of every ShopifyQL query, replacing "
+                "any cached columns"
+            ),
+        ),
         th.Property(
             "shopifyql_queries",
             th.ArrayType(
@@ -128,8 +383,9 @@ class Tap_Shopify(Tap):
                             "(1) SINCE/UNTIL dates control the reporting window — "
                             "the tap does not inject start_date into the query "
                             "automatically, so set the date range explicitly here. "
-                            "(2) Every value in the response is returned as a string. "
-                            "Cast to numeric/date types in your dbt models. "
+                            "(2) Values are typed from the column data types: money, "
+                            "float and percent columns are numbers, integer columns "
+                            "integers and day columns dates; the rest are strings. "
                             "(3) TIMESERIES day produces one row per day; "
                             "WITH TOTALS appends summary rows where 'day' is null. "
                             "(4) COMPARE TO previous_period may add a "
@@ -162,6 +418,19 @@ class Tap_Shopify(Tap):
                             "Example: 'day' for a TIMESERIES day query."
                         ),
                     ),
+                    th.Property(
+                        "window_days",
+                        th.IntegerType,
+                        description=(
+                            "Split the reporting period into windows of this many "
+                            "days, each queried separately and concurrently (see "
+                            "`backfill_concurrency`), so a wide period is not "
+                            "returned in one response subject to the query's LIMIT. "
+                            "Requires SINCE and UNTIL to be ISO dates, 'today', "
+                            "'yesterday' or offsets in days or weeks (e.g. '-30d'), "
+                            "unless the SINCE date comes from state or start_date."
+                        ),
+                    ),
                 )
             ),
             description=(
@@ -189,6 +458,77 @@ class Tap_Shopify(Tap):
         ),
     ).to_dict()
 
+    def __init__(self, *args, shop=None, initialized_at=None, **kwargs):
+        """Initialise the tap, syncing `shop` as one of a multi-store sync if set.
+
+        The taps of a multi-store sync share the `initialized_at` of the tap
+        running them (see `initialized_at`).
+        """
+        self.shop = shop
+        self._sync_initialized_at = initialized_at
+
+        # a shop runs one bulk operation at a time, whichever stream starts it
+        self.bulk_operation_lock = threading.Lock()
+
+        super().__init__(*args, **kwargs)
+
+    @override
+    @property
+    def initialized_at(self) -> int:
+        # full-table streams version their records by it, so the records of every
+        # store carry one version, and activating it keeps the other stores' rows
+        return self._sync_initialized_at or super().initialized_at
+
+    @override
+    def _validate_config(self, *, raise_errors=True):
+        errors = super()._validate_config(raise_errors=raise_errors)
+        config = self._config
+
+        if config.get("stores") or (config.get("access_token") and config.get("store")):
+            return errors
+
+        error = "Either `access_token` and `store`, or `stores`, must be set"
+
+        if raise_errors:
+            raise ConfigValidationError(error, errors=[error])
+
+        self.logger.warning(error)
+        return [*errors, error]
+
+    @property
+    def multi_store(self) -> bool:
+        """Return whether the tap syncs several stores, or one of several."""
+        return bool(self.shop or self.config.get("stores"))
+
+    @property
+    def store_config(self) -> dict:
+        """Return the settings holding the store to connect to and its token.
+
+        A multi-store tap without a store of its own connects to the first of
+        `stores` to discover streams.
+        """
+        if self.config.get("stores") and not self.config.get("access_token"):
+            return self.config["stores"][0]
+
+        return dict(self.config)
+
+    def get_authenticator(self, stream):
+        """Return the authenticator shared by every stream of the store.
+
+        It is created for the first stream to ask, and holds the store's rate
+        limiter, so streams syncing side by side pace themselves together.
+        """
+        with self._authenticator_lock:
+            if self._authenticator is None:
+                self._authenticator = tap_shopifyAuthenticator(
+                    stream,
+                    key="X-Shopify-Access-Token",
+                    value=str(self.store_config["access_token"]),
+                    location="header",
+                )
+
+        return self._authenticator
+
     @override
     def discover_streams(self):
         """Return a list of discovered streams.
@@ -206,4 +546,192 @@ class Tap_Shopify(Tap):
         for entry in self.config.get("shopifyql_queries") or []:
             streams.append(ShopifyQLStream(tap=self, query=entry))
 
+        if self.multi_store:
+            # records are only unique within their store
+            for stream in streams:
+                if stream.primary_keys:
+                    stream.primary_keys = ["shop", *stream.primary_keys]
+
+        return streams
+
+    @cached_property
+    def requests_session(self):
+        """Return the HTTP session shared by all streams."""
+        pool_size = self.config.get("http_pool_size") or max(
+            DEFAULT_POOL_SIZE,
+            (self.config.get("stream_concurrency") or 1)
+            * (self.config.get("backfill_concurrency") or DEFAULT_BACKFILL_CONCURRENCY),
+        )
+
+        return create_session(pool_size)
+
+    @property
+    def syncing_concurrently(self):
+        """Return whether streams are currently syncing on a worker pool."""
+        return self._published_state is not None
+
+    def write_stream_state(self, stream_name, stream_state):
+        """Write a STATE message with one stream's bookmarks brought up to date.
+
+        While streams sync concurrently, each worker only ever touches its own
+        bookmarks, so the state written is assembled from snapshots that workers
+        publish here instead of serialising `state` as other workers change it.
+        """
+        with self._state_lock:
+            published_state: TapState = self._published_state or {}
+            bookmarks = published_state.setdefault("bookmarks", {})
+            bookmarks[stream_name] = copy.deepcopy(stream_state)
+            self._state_writer.write_state(published_state)
+
+    def _sync_stream(self, stream):
+        stream.sync()
+        stream.finalize_state_progress_markers()
+
+        for synced_stream in [stream, *stream.descendent_streams]:
+            self.write_stream_state(synced_stream.name, synced_stream.stream_state)
+
+    def _get_selected_top_level_streams(self):
+        streams = []
+
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+
+            # child streams are synced by their parent
+            if not stream.parent_stream_type:
+                streams.append(stream)
+
         return streams
+
+    # `sync_all` is final in the SDK, but it offers no other way to run streams
+    # side by side, or to write metrics once every stream has synced
+    @override  # type: ignore[misc]
+    def sync_all(self):
+        try:
+            if self.config.get("stores"):
+                self._sync_stores()
+            else:
+                self._sync_all_streams()
+        finally:
+            if textfile := self.config.get("metrics_textfile"):
+                write_textfile(textfile, self.performance_metrics)
+
+    @property
+    def performance_metrics(self) -> list:
+        """Return the performance measurements of each stream, of every store."""
+        if self._store_taps:
+            return [
+                metrics
+                for tap in self._store_taps
+                for metrics in tap.performance_metrics
+            ]
+
+        return [
+            stream.performance_metrics
+            for stream in self.streams.values()
+            if isinstance(stream, tap_shopifyStream)
+        ]
+
+    def _store_tap(self, store):
+        # with only its own store's settings, so no other store's token
+        config = {
+            name: value
+            for name, value in self.config.items()
+            if name not in (*_STORE_SETTINGS, "stores", "metrics_textfile")
+        }
+        shop = store["store"]
+        tap = Tap_Shopify(
+            config={**config, **store},
+            catalog=self.input_catalog.to_dict() if self.input_catalog else None,
+            state=copy.deepcopy(self._stores_state.get(shop, {})),
+            message_writer=self.message_writer,
+            shop=shop,
+            initialized_at=self.initialized_at,
+        )
+        tap._state_writer = _StoreStateWriter(self, shop)  # type: ignore
+
+        return tap
+
+    @override
+    def load_state(self, state):
+        super().load_state(state)
+
+        # the state of each store of a multi-store sync (see `write_store_state`)
+        if state.get("stores"):
+            self._stores_state.update(copy.deepcopy(state["stores"]))
+
+    @property
+    def _stores_state(self) -> dict:
+        return self.state.setdefault("stores", {})  # type: ignore[typeddict-item]
+
+    def write_store_state(self, shop, store_state):
+        """Write a STATE message with one store's state brought up to date.
+
+        The state of each store of a multi-store sync is kept apart, under
+        `stores` by its `store` setting.
+        """
+        with self._state_lock:
+            self._stores_state[shop] = copy.deepcopy(store_state)
+            self._state_writer.write_state(self.state)
+
+    def _sync_stores(self):
+        self._state_lock = threading.Lock()
+        self._store_taps = [self._store_tap(store) for store in self.config["stores"]]
+        failed = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.config.get("store_concurrency")
+            or DEFAULT_STORE_CONCURRENCY
+        ) as executor:
+            futures = {
+                tap.shop: executor.submit(tap.sync_all) for tap in self._store_taps
+            }
+
+            # a failing store does not stop the others from finishing their sync
+            for shop, future in futures.items():
+                if error := future.exception():
+                    self.logger.error("Sync of store '%s' failed: %s", shop, error)
+                    failed.append(error)
+
+        if failed:
+            raise failed[0]
+
+    def _sync_all_streams(self):
+        # mirrors the SDK's sequential implementation, other than the workers
+        stream_concurrency = self.config.get("stream_concurrency") or 1
+
+        if stream_concurrency < 2:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        if self.state:
+            self._state_writer.write_state(self.state)
+
+        streams = self._get_selected_top_level_streams()
+
+        # create the shared session before any worker asks for it
+        self.requests_session
+
+        self._state_lock = threading.Lock()
+        self._published_state = copy.deepcopy(self.state)
+
+        try:
+            with ThreadPoolExecutor(max_workers=stream_concurrency) as executor:
+                futures = [executor.submit(self._sync_stream, s) for s in streams]
+
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    executor.shutdown(cancel_futures=True)
+                    raise
+        finally:
+            self._published_state = None
+
+        self._state_writer.write_state(self.state)
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
@@ -0,0 +1,73 @@
+"""Tests the time-sliced backfill windows."""
+
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+
+class TestBackfillWindows(unittest.TestCase):
+    """Test class for the backfill_window_days setting"""
+
+    def setUp(self):
+        self.start_date = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(
+            days=25
+        )
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "start_date": self.start_date.isoformat(timespec="seconds"),
+            "backfill_window_days": 10,
+        }
+
+        responses.reset()
+
+    @responses.activate
+    def test_windows_requested(self):
+        """Test each window is requested once and the bookmark covers them all."""
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["customers"])
+
+        def window_response(request):
+            params = parse_qs(urlparse(request.url).query)
+            updated_at = datetime.fromisoformat(params["updated_at_min"][0])
+            customer = {
+                "id": int(updated_at.timestamp()),
+                "updated_at": (updated_at + timedelta(hours=1)).isoformat(),
+            }
+            return 200, {}, json.dumps({"customers": [customer]})
+
+        responses.add_callback(
+            responses.GET,
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/customers.json",
+            callback=window_response,
+        )
+
+        records = test_utils.sync_records(tap)
+
+        # windows are requested concurrently, so in no particular order
+        windows = sorted(
+            (parse_qs(urlparse(call.request.url).query) for call in responses.calls),
+            key=lambda window: window["updated_at_min"],
+        )
+        self.assertEqual(len(windows), 3)
+        self.assertTrue(all(window["created_at_min"] for window in windows))
+        self.assertEqual(
+            [window.get("updated_at_max", [None])[0] for window in windows],
+            [
+                (self.start_date + timedelta(days=10, seconds=-1)).isoformat(),
+                (self.start_date + timedelta(days=20, seconds=-1)).isoformat(),
+                None,
+            ],
+        )
+
+        # windows are emitted in order
+        self.assertEqual(
+            [record["updated_at"] for record in records["customers"]],
+            sorted(record["updated_at"] for record in records["customers"]),
+        )
+        bookmark = tap.state["bookmarks"]["customers"]["replication_key_value"]
+        self.assertEqual(bookmark, records["customers"][-1]["updated_at"])
@@ -0,0 +1,44 @@
+"""Tests the fake Shopify Admin API used by the benchmarks."""
+
+import unittest
+
+import requests
+from benchmarks.fake_shopify import FakeShopify, Store
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+
+class TestFakeShopify(unittest.TestCase):
+    """Test class for the fake Shopify Admin API"""
+
+    def setUp(self):
+        self.store = Store.generate(orders=3, customers=120, products=1)
+
+    def test_customers_synced(self):
+        """Test the tap pages through every record of the fake store."""
+        with FakeShopify(self.store, bucket_size=1000) as server:
+            tap = test_utils.set_up_tap_with_custom_catalog(
+                {
+                    **test_utils.basic_mock_config,
+                    "admin_url": server.url,
+                    "page_size": 50,
+                },
+                ["customers"],
+            )
+            records = test_utils.sync_records(tap)
+
+        self.assertEqual(
+            [record["id"] for record in records["customers"]], list(range(1, 121))
+        )
+        self.assertEqual(server.requests["/customers"], 3)
+
+    def test_bucket_overflow_throttled(self):
+        """Test requests beyond the call bucket are answered with a 429."""
+        with FakeShopify(self.store, bucket_size=2) as server:
+            url = f"{server.url}/api/{API_VERSION}/orders.json"
+            responses = [requests.get(url, timeout=10) for _ in range(3)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertEqual(responses[1].headers["X-Shopify-Shop-Api-Call-Limit"], "2/2")
+        self.assertEqual(server.throttled, 1)
@@ -0,0 +1,150 @@
+"""Tests the bulk operation extraction mode."""
+
+import json
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.bulk import BulkResultSpool
+from tap_shopify.client import API_VERSION
+
+BULK_RESULT_URL = "https://storage.googleapis.com/shopify/bulk/orders.jsonl"
+
+MONEY_BAG = {
+    "shopMoney": {"amount": "10.0", "currencyCode": "GBP"},
+    "presentmentMoney": {"amount": "10.0", "currencyCode": "GBP"},
+}
+
+BULK_RESULT = [
+    {
+        "id": "gid://shopify/Order/1",
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "subtotalPriceSet": MONEY_BAG,
+        "totalPriceSet": MONEY_BAG,
+        "refunds": [{"id": "gid://shopify/Refund/5", "createdAt": None}],
+        "transactions": [{"id": "gid://shopify/OrderTransaction/7", "kind": "SALE"}],
+    },
+    {
+        "__typename": "LineItem",
+        "__parentId": "gid://shopify/Order/1",
+        "id": "gid://shopify/LineItem/11",
+        "quantity": 2,
+        "originalUnitPriceSet": MONEY_BAG,
+    },
+    {
+        "id": "gid://shopify/Order/2",
+        "updatedAt": "2024-01-02T00:00:00Z",
+        "subtotalPriceSet": MONEY_BAG,
+        "totalPriceSet": MONEY_BAG,
+        "refunds": [],
+        "transactions": [],
+    },
+    # not every line follows its order
+    {
+        "__typename": "LineItem",
+        "__parentId": "gid://shopify/Order/1",
+        "id": "gid://shopify/LineItem/12",
+        "quantity": 1,
+    },
+]
+
+
+class TestBulkResultSpool(unittest.TestCase):
+    """Test class for BulkResultSpool"""
+
+    def test_grouped_by_parent(self):
+        """Test nodes are read back grouped by parent, in the order added."""
+        nodes = [
+            {"id": "a", "price": Decimal("1.10")},
+            {"id": "c1", "__parentId": "b"},
+            {"id": "a1", "__parentId": "a"},
+            {"id": "b"},
+            {"id": "a2", "__parentId": "a"},
+            {"id": "x1", "__parentId": "x"},
+        ]
+
+        with BulkResultSpool() as spool:
+            for node in nodes:
+                spool.add(node)
+
+            self.assertEqual(
+                list(spool.groups()),
+                [(nodes[0], [nodes[2], nodes[4]]), (nodes[3], [nodes[1]])],
+            )
+            self.assertEqual(spool.orphans(), {"x": 1})
+
+
+class TestBulkMode(unittest.TestCase):
+    """Test class for the bulk_mode setting"""
+
+    def setUp(self):
+        self.mock_config = {**test_utils.basic_mock_config, "bulk_mode": True}
+
+        responses.reset()
+
+    @responses.activate
+    @mock.patch("tap_shopify.client.time.sleep")
+    def test_orders_from_bulk_operation(self, sleep):
+        """Test orders and their children are read from the bulk operation result."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["orders", "line_items", "refunds", "transactions"]
+        )
+
+        graphql_url = (
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/graphql.json"
+        )
+        operation = {"id": "gid://shopify/BulkOperation/1", "objectCount": "4"}
+
+        run = responses.add(
+            responses.POST,
+            graphql_url,
+            json={
+                "data": {
+                    "bulkOperationRunQuery": {
+                        "bulkOperation": {**operation, "status": "CREATED"},
+                        "userErrors": [],
+                    }
+                }
+            },
+        )
+        responses.add(
+            responses.POST,
+            graphql_url,
+            json={"data": {"node": {**operation, "status": "RUNNING", "url": None}}},
+        )
+        responses.add(
+            responses.POST,
+            graphql_url,
+            json={
+                "data": {
+                    "node": {**operation, "status": "COMPLETED", "url": BULK_RESULT_URL}
+                }
+            },
+        )
+        download = responses.add(
+            responses.GET,
+            BULK_RESULT_URL,
+            body="\n".join(json.dumps(line) for line in BULK_RESULT),
+        )
+
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIn(
+            "transactions {",
+            json.loads(run.calls[0].request.body)["variables"]["query"],
+        )
+        self.assertNotIn("X-Shopify-Access-Token", download.calls[0].request.headers)
+
+        self.assertEqual([order["id"] for order in records["orders"]], [1, 2])
+        self.assertEqual(records["orders"][0]["total_price"], 10)
+        self.assertEqual(
+            [(item["id"], item["order_id"]) for item in records["line_items"]],
+            [(11, 1), (12, 1)],
+        )
+        self.assertEqual(records["refunds"][0]["id"], 5)
+        self.assertEqual(records["transactions"][0]["id"], 7)
+        self.assertEqual(records["transactions"][0]["order_id"], 1)
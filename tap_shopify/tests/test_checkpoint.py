@@ -0,0 +1,197 @@
+"""Tests checkpointing and resuming from the page cursor."""
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import responses
+from responses import matchers
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+CUSTOMERS_URL = (
+    f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/customers.json"
+)
+
+
+def sync_messages(tap):
+    """Run a sync and return the emitted messages."""
+    with redirect_stdout(io.StringIO()) as stdout:
+        tap.sync_all()
+
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+class TestPageCheckpoints(unittest.TestCase):
+    """Test class for page cursor checkpoints"""
+
+    def setUp(self):
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "page_checkpoint_interval": 1,
+        }
+
+        responses.reset()
+
+    def _add_page(self, n, page_info=None, status=200):
+        customer = {"id": n, "updated_at": f"2024-01-0{n}T00:00:00Z"}
+
+        return responses.add(
+            responses.GET,
+            CUSTOMERS_URL,
+            json={"customers": [customer]} if status == 200 else {"errors": "x"},
+            status=status,
+            headers=(
+                {"Link": f'<{CUSTOMERS_URL}?page_info=p{n + 1}>; rel="next"'}
+                if n < 3
+                else {}
+            ),
+            match=[
+                matchers.query_param_matcher(
+                    {"page_info": page_info, "limit": "250"} if page_info else {},
+                    strict_match=bool(page_info),
+                )
+            ],
+        )
+
+    def _tap(self, state=None):
+        return test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["customers"], state=state
+        )
+
+    @responses.activate
+    def test_cursor_checkpointed(self):
+        """Test the cursor of the next page is checkpointed, then removed."""
+        for n, page_info in [(1, None), (2, "p2"), (3, "p3")]:
+            self._add_page(n, page_info)
+
+        messages = sync_messages(self._tap())
+        states = [
+            m["value"]["bookmarks"]["customers"]
+            for m in messages
+            if m["type"] == "STATE"
+        ]
+
+        self.assertEqual(
+            [state.get("page_info") for state in states], ["p2", "p3", None]
+        )
+
+    @responses.activate
+    def test_resumed_from_cursor(self):
+        """Test a sync resumes from the checkpointed cursor."""
+        self._add_page(2, "p2")
+        self._add_page(3, "p3")
+
+        messages = sync_messages(
+            self._tap(
+                {
+                    "bookmarks": {
+                        "customers": {
+                            "page_info": "p2",
+                            "replication_key": "updated_at",
+                            "replication_key_value": "2024-01-01T00:00:00Z",
+                        }
+                    }
+                }
+            )
+        )
+
+        self.assertEqual(
+            [m["record"]["id"] for m in messages if m["type"] == "RECORD"], [2, 3]
+        )
+
+    @responses.activate
+    def test_expired_cursor(self):
+        """Test a sync resumes from the bookmark if the cursor has expired."""
+        self._add_page(2, "p2", status=400)
+        first_page = self._add_page(1)
+        self._add_page(2, "p2")
+        self._add_page(3, "p3")
+
+        messages = sync_messages(
+            self._tap(
+                {
+                    "bookmarks": {
+                        "customers": {
+                            "page_info": "p2",
+                            "replication_key": "updated_at",
+                            "replication_key_value": "2023-12-31T00:00:00Z",
+                        }
+                    }
+                }
+            )
+        )
+
+        self.assertEqual(
+            parse_qs(urlparse(first_page.calls[0].request.url).query)["updated_at_min"],
+            ["2023-12-31T00:00:00Z"],
+        )
+        self.assertEqual(
+            [m["record"]["id"] for m in messages if m["type"] == "RECORD"], [1, 2, 3]
+        )
+
+    @responses.activate
+    @mock.patch("tap_shopify.streams.TRANSACTIONS_BATCH_SIZE", 3)
+    def test_cursor_checkpointed_after_batch(self):
+        """Test the cursor is only checkpointed once the records of the pages
+        before it, and their children, are emitted."""
+        base_url = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+        orders_url = f"{base_url}/orders.json"
+
+        for page, order_ids in enumerate([(1, 2), (3, 4)], start=1):
+            responses.add(
+                responses.GET,
+                orders_url,
+                json={
+                    "orders": [
+                        {
+                            "id": order_id,
+                            "updated_at": f"2024-01-0{order_id}T00:00:00Z",
+                            "line_items": [{"id": order_id * 10}],
+                        }
+                        for order_id in order_ids
+                    ]
+                },
+                headers=(
+                    {"Link": f'<{orders_url}?page_info=p2>; rel="next"'}
+                    if page == 1
+                    else {}
+                ),
+            )
+        responses.add(
+            responses.POST, f"{base_url}/graphql.json", json={"data": {"nodes": []}}
+        )
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**self.mock_config, "page_size": 2, "batch_transactions": True},
+            ["orders", "line_items", "transactions"],
+        )
+
+        messages = sync_messages(tap)
+        checkpoint = next(
+            index
+            for index, m in enumerate(messages)
+            if m["type"] == "STATE"
+            and m["value"]["bookmarks"]["orders"].get("page_info") == "p2"
+        )
+        emitted = [
+            (m["stream"], m["record"]["id"])
+            for m in messages[:checkpoint]
+            if m["type"] == "RECORD"
+        ]
+
+        # the first batch of orders held the first order of the second page
+        self.assertEqual(
+            sorted(emitted),
+            [
+                ("line_items", 10),
+                ("line_items", 20),
+                ("line_items", 30),
+                ("orders", 1),
+                ("orders", 2),
+                ("orders", 3),
+            ],
+        )
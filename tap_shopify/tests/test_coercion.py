@@ -0,0 +1,76 @@
+"""Tests the schema-compiled record coercion."""
+
+import unittest
+from decimal import Decimal
+
+from tap_shopify.coercion import compile_converter
+
+
+class TestCompileConverter(unittest.TestCase):
+    """Test class for compile_converter"""
+
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": ["integer", "null"]},
+            "name": {"type": ["string", "null"]},
+            "total_price": {"type": ["number", "null"]},
+            "legacy_id": {"type": ["integer", "string", "null"]},
+            "closed_at": {"type": ["string", "null"], "format": "date-time"},
+            "line_items": {
+                "type": ["array", "null"],
+                "items": {
+                    "type": ["object", "null"],
+                    "properties": {
+                        "quantity": {"type": ["integer", "null"]},
+                        "price": {"type": ["number", "null"]},
+                    },
+                },
+            },
+            "tags": {"type": ["array", "null"], "items": {"type": "string"}},
+        },
+    }
+
+    def test_record_coerced_in_place(self):
+        """Test values are coerced to the types their schema declares."""
+        convert = compile_converter(self.schema)
+        record = {
+            "id": "1",
+            "name": "10",
+            "total_price": "10.50",
+            "legacy_id": "2",
+            "closed_at": "",
+            "line_items": [{"quantity": "3", "price": "1.10"}, None],
+            "tags": ["a"],
+        }
+
+        self.assertIs(convert(record), record)
+        self.assertEqual(
+            record,
+            {
+                "id": 1,
+                "name": "10",
+                "total_price": Decimal("10.50"),
+                "legacy_id": "2",
+                "closed_at": None,
+                "line_items": [{"quantity": 3, "price": Decimal("1.10")}, None],
+                "tags": ["a"],
+            },
+        )
+
+    def test_invalid_values_left(self):
+        """Test values that cannot be coerced are left for validation to report."""
+        convert = compile_converter(self.schema)
+
+        self.assertEqual(
+            convert({"id": "x", "total_price": "", "line_items": "y"}),
+            {"id": "x", "total_price": "", "line_items": "y"},
+        )
+
+    def test_no_converter_needed(self):
+        """Test no converter is compiled for schemas of strings only."""
+        self.assertIsNone(
+            compile_converter(
+                {"type": "object", "properties": {"name": {"type": "string"}}}
+            )
+        )
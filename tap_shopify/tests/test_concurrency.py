@@ -0,0 +1,69 @@
+"""Tests concurrent syncing of streams."""
+
+import unittest
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.concurrency import iter_concurrently
+
+
+class TestStreamConcurrency(unittest.TestCase):
+    """Test class for the stream_concurrency setting"""
+
+    def setUp(self):
+        self.mock_config = {**test_utils.basic_mock_config, "stream_concurrency": 3}
+
+        responses.reset()
+
+    @responses.activate
+    def test_streams_synced_concurrently(self):
+        """Test independent streams all sync and keep their own bookmarks."""
+        streams = ["customers", "products", "gift_cards"]
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, streams)
+
+        for i, stream in enumerate(streams):
+            responses.add(
+                responses.GET,
+                f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+                f"/{stream}.json",
+                json={
+                    stream: [
+                        {"id": i * 10 + n, "updated_at": f"2024-01-0{n}T00:00:00Z"}
+                        for n in range(1, 4)
+                    ]
+                },
+            )
+
+        records = test_utils.sync_records(tap)
+
+        for stream in streams:
+            self.assertEqual(len(records[stream]), 3)
+            self.assertEqual(
+                tap.state["bookmarks"][stream]["replication_key_value"],
+                "2024-01-03T00:00:00Z",
+            )
+
+
+class TestIterConcurrently(unittest.TestCase):
+    """Test class for iter_concurrently"""
+
+    def test_items_in_order(self):
+        """Test items are yielded as if the iterables were chained."""
+        factories = [lambda i=i: range(i * 100, i * 100 + 100) for i in range(5)]
+
+        self.assertEqual(
+            list(iter_concurrently(factories, max_workers=3, buffer_size=7)),
+            list(range(500)),
+        )
+
+    def test_worker_error_raised(self):
+        """Test an error in a worker is raised to the caller."""
+
+        def failing():
+            yield 1
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            list(iter_concurrently([failing, lambda: range(3)], max_workers=2))
@@ -0,0 +1,85 @@
+"""Tests the compiled record conformance."""
+
+import logging
+import unittest
+from decimal import Decimal
+
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import (
+    TypeConformanceLevel,
+    conform_record_data_types,
+)
+from singer_sdk.singerlib import SelectionMask
+
+from tap_shopify.conformance import compile_conformer
+
+
+class TestCompileConformer(unittest.TestCase):
+    """Test class for compile_conformer"""
+
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": ["integer", "null"]},
+            "note": {"type": ["string", "null"]},
+            "test": {"type": ["boolean", "null"]},
+            "total": {"type": ["number", "null"]},
+            "customer": {
+                "type": ["object", "null"],
+                "properties": {
+                    "id": {"type": ["integer", "null"]},
+                    "email": {"type": ["string", "null"]},
+                },
+            },
+            "line_items": {
+                "type": ["array", "null"],
+                "items": {
+                    "type": ["object", "null"],
+                    "properties": {"id": {"type": ["integer", "null"]}},
+                },
+            },
+            "attributes": {
+                "type": ["object", "null"],
+                "properties": {},
+                "additionalProperties": True,
+            },
+        },
+    }
+
+    mask = SelectionMask(
+        {
+            (): True,
+            ("properties", "note"): False,
+            ("properties", "customer", "properties", "email"): False,
+        }
+    )
+
+    def record(self):
+        return {
+            "id": 1,
+            "note": "deselected",
+            "test": 0,
+            "total": Decimal("NaN"),
+            "customer": {"id": 2, "email": "deselected", "phone": "unmapped"},
+            "line_items": [{"id": 3, "sku": "unmapped"}, None],
+            "attributes": {"any": "value"},
+            "source": "unmapped",
+        }
+
+    def test_matches_sdk_conformance(self):
+        """Test records are conformed exactly as the SDK conforms them."""
+        unmapped = []
+        conform = compile_conformer(self.schema, self.mask, unmapped.append)
+
+        expected = self.record()
+        pop_deselected_record_properties(expected, self.schema, self.mask)
+        expected = conform_record_data_types(
+            stream_name="orders",
+            record=expected,
+            schema=self.schema,
+            level=TypeConformanceLevel.RECURSIVE,
+            logger=logging.getLogger(__name__),
+        )
+
+        self.assertEqual(conform(self.record()), expected)
+        self.assertEqual(unmapped, ["customer.phone", "line_items.sku", "source"])
@@ -27,6 +27,25 @@ class TestCore(unittest.TestCase):
         # expect valid catalog to be discovered
         self.assertEqual(len(catalog), 19, "Total streams from default catalog")
 
+    @responses.activate()
+    def test_schemas_read_when_synced(self):
+        """Test only the schemas of synced streams are read from disk."""
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["customers"])
+
+        responses.add(
+            responses.GET,
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/customers.json",
+            json=test_utils.customer_return_data,
+            status=200,
+        )
+
+        tap.sync_all()
+
+        self.assertEqual(
+            [name for name, stream in tap.streams.items() if stream._schema],
+            ["customers"],
+        )
+
     # Run standard built-in tap tests from the SDK:
     @responses.activate()
     def test_standard_tap_tests(self):
@@ -97,8 +116,8 @@ class TestCore(unittest.TestCase):
         )
         responses.add(
             responses.GET,
-            "https://mock-store.myshopify.com/"
-            + "admin/api/{API_VERSION}/inventory_items/1234.json",
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+            "/inventory_items.json?ids=1234",
             json={},
             status=200,
         )
@@ -0,0 +1,87 @@
+"""Tests dropping records repeated across pages."""
+
+import unittest
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.dedup import RecentKeys
+
+CUSTOMERS_URL = (
+    f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/customers.json"
+)
+
+
+class TestRecentKeys(unittest.TestCase):
+    """Test class for RecentKeys"""
+
+    def test_least_recent_evicted(self):
+        """Test only the most recently seen keys are remembered."""
+        keys = RecentKeys(maxsize=2)
+
+        self.assertFalse(keys.seen(1))
+        self.assertFalse(keys.seen(2))
+        self.assertTrue(keys.seen(1))
+        self.assertFalse(keys.seen(3))
+        self.assertEqual(len(keys), 2)
+        self.assertFalse(keys.seen(2))
+
+    def test_disabled(self):
+        """Test no keys are remembered with a size of 0."""
+        keys = RecentKeys(maxsize=0)
+
+        self.assertFalse(keys.seen(1))
+        self.assertFalse(keys.seen(1))
+
+
+class TestDeduplication(unittest.TestCase):
+    """Test class for deduplicating stream records"""
+
+    def setUp(self):
+        self.mock_config = test_utils.basic_mock_config
+
+        responses.reset()
+
+    @responses.activate
+    def test_repeated_records_dropped(self):
+        """Test a record repeated on a later page is synced once per update."""
+        responses.add(
+            responses.GET,
+            CUSTOMERS_URL,
+            json={
+                "customers": [
+                    {"id": 1, "updated_at": "2024-01-01T00:00:00Z"},
+                    {"id": 2, "updated_at": "2024-01-02T00:00:00Z"},
+                ]
+            },
+            headers={"Link": f'<{CUSTOMERS_URL}?page_info=next>; rel="next"'},
+            match=[responses.matchers.query_param_matcher({}, strict_match=False)],
+        )
+        responses.add(
+            responses.GET,
+            CUSTOMERS_URL,
+            json={
+                "customers": [
+                    {"id": 1, "updated_at": "2024-01-01T00:00:00Z"},
+                    {"id": 2, "updated_at": "2024-01-03T00:00:00Z"},
+                ]
+            },
+            match=[
+                responses.matchers.query_param_matcher(
+                    {"page_info": "next", "limit": "250"}
+                )
+            ],
+        )
+
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["customers"])
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual(
+            [(r["id"], r["updated_at"]) for r in records["customers"]],
+            [
+                (1, "2024-01-01T00:00:00Z"),
+                (2, "2024-01-02T00:00:00Z"),
+                (2, "2024-01-03T00:00:00Z"),
+            ],
+        )
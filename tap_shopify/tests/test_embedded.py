@@ -0,0 +1,199 @@
+"""Tests syncing the child streams embedded in order records."""
+
+import io
+import json
+import unittest
+from collections import Counter
+from contextlib import redirect_stdout
+
+import responses
+from singer_sdk.helpers import _catalog
+from singer_sdk.singerlib.catalog import Catalog
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.tap import Tap_Shopify
+
+
+class TestEmbeddedStreams(unittest.TestCase):
+    """Test class for the streams read from order records"""
+
+    def setUp(self):
+        self.mock_config = test_utils.basic_mock_config
+
+        responses.reset()
+
+    @responses.activate
+    def test_orders_split_once_per_batch(self):
+        """Test each embedded stream is synced once for a page of orders."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config,
+            [
+                "orders",
+                "line_items",
+                "order_discount_codes",
+                "refund_line_items",
+                "transactions",
+            ],
+        )
+
+        base_url = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+
+        responses.add(
+            responses.GET,
+            f"{base_url}/orders.json",
+            json={
+                "orders": [
+                    {
+                        "id": order_id,
+                        "updated_at": f"2024-01-0{order_id}T00:00:00Z",
+                        "line_items": [{"id": order_id * 10}],
+                        "discount_codes": [{"code": "A"}, None, {"code": "B"}],
+                        "refunds": [
+                            {
+                                "id": order_id * 100,
+                                "refund_line_items": [{"id": order_id * 1000}],
+                            }
+                        ],
+                    }
+                    for order_id in (1, 2)
+                ]
+            },
+            status=200,
+        )
+        for order_id in (1, 2):
+            responses.add(
+                responses.GET,
+                f"{base_url}/orders/{order_id}/transactions.json",
+                json={"transactions": [{"id": order_id * 5}]},
+                status=200,
+            )
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            tap.sync_all()
+
+        messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        records = [message for message in messages if message["type"] == "RECORD"]
+        schemas = Counter(
+            message["stream"] for message in messages if message["type"] == "SCHEMA"
+        )
+
+        self.assertEqual(schemas["line_items"], 1)
+        self.assertEqual(schemas["transactions"], 2)
+        self.assertEqual(
+            [
+                (message["stream"], message["record"])
+                for message in records
+                if message["stream"] != "orders"
+            ],
+            [
+                ("transactions", {"id": 5, "order_id": 1}),
+                ("transactions", {"id": 10, "order_id": 2}),
+                ("line_items", {"id": 10, "order_id": 1}),
+                ("line_items", {"id": 20, "order_id": 2}),
+                ("refund_line_items", {"id": 1000, "refund_id": 100}),
+                ("refund_line_items", {"id": 2000, "refund_id": 200}),
+                ("order_discount_codes", {"code": "A", "index": 1, "order_id": 1}),
+                ("order_discount_codes", {"code": "B", "index": 3, "order_id": 1}),
+                ("order_discount_codes", {"code": "A", "index": 1, "order_id": 2}),
+                ("order_discount_codes", {"code": "B", "index": 3, "order_id": 2}),
+            ],
+        )
+
+    @responses.activate
+    def test_read_from_deselected_properties(self):
+        """Test embedded records are read from properties deselected in the parent,
+        and emitted before any state covering their parent."""
+        tap = Tap_Shopify(config=self.mock_config)
+        tap.run_discovery()
+        catalog = Catalog.from_dict(tap.catalog_dict)
+        _catalog.deselect_all_streams(catalog=catalog)
+
+        for stream in ("orders", "line_items", "refund_line_items", "transactions"):
+            _catalog.set_catalog_stream_selected(
+                catalog=catalog, stream_name=stream, selected=True
+            )
+
+        for name in ("line_items", "refunds"):
+            _catalog.set_catalog_stream_selected(
+                catalog=catalog,
+                stream_name="orders",
+                selected=False,
+                breadcrumb=("properties", name),
+            )
+
+        tap = Tap_Shopify(config=self.mock_config, catalog=catalog.to_dict())
+        base_url = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+
+        responses.add(
+            responses.GET,
+            f"{base_url}/orders.json",
+            json={
+                "orders": [
+                    {
+                        "id": order_id,
+                        "updated_at": f"2024-01-0{order_id}T00:00:00Z",
+                        "line_items": [{"id": order_id * 10}],
+                        "refunds": [
+                            {
+                                "id": order_id * 100,
+                                "refund_line_items": [{"id": order_id * 1000}],
+                            }
+                        ],
+                    }
+                    for order_id in (1, 2)
+                ]
+            },
+        )
+        for order_id in (1, 2):
+            responses.add(
+                responses.GET,
+                f"{base_url}/orders/{order_id}/transactions.json",
+                json={"transactions": []},
+            )
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            tap.sync_all()
+
+        messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        records = [
+            (message["stream"], message["record"])
+            for message in messages
+            if message["type"] == "RECORD"
+        ]
+
+        self.assertEqual(
+            [record for stream, record in records if stream == "orders"],
+            [
+                {"id": 1, "updated_at": "2024-01-01T00:00:00Z"},
+                {"id": 2, "updated_at": "2024-01-02T00:00:00Z"},
+            ],
+        )
+        self.assertEqual(
+            [record for stream, record in records if stream != "orders"],
+            [
+                {"id": 10, "order_id": 1},
+                {"id": 20, "order_id": 2},
+                {"id": 1000, "refund_id": 100},
+                {"id": 2000, "refund_id": 200},
+            ],
+        )
+
+        # no state is written between an order and the children read from it
+        last_child = max(
+            index
+            for index, message in enumerate(messages)
+            if message.get("stream") in ("line_items", "refund_line_items")
+            and message["type"] == "RECORD"
+        )
+        first_order = next(
+            index
+            for index, message in enumerate(messages)
+            if message.get("stream") == "orders" and message["type"] == "RECORD"
+        )
+        self.assertFalse(
+            any(
+                message["type"] == "STATE"
+                for message in messages[first_order:last_child]
+            )
+        )
@@ -0,0 +1,57 @@
+"""Tests requesting only the selected fields of REST resources."""
+
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+ORDERS_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/orders.json"
+
+
+class TestSelectedFields(unittest.TestCase):
+    """Test class for the fields parameter"""
+
+    def setUp(self):
+        self.mock_config = test_utils.basic_mock_config
+
+        responses.reset()
+
+    def _request_params(self, stream_list):
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, stream_list)
+
+        orders = responses.add(
+            responses.GET,
+            ORDERS_URL,
+            json={
+                "orders": [
+                    {
+                        "id": 1,
+                        "updated_at": "2024-01-01T00:00:00Z",
+                        "line_items": [{"id": 10}],
+                    }
+                ]
+            },
+            status=200,
+        )
+
+        records = test_utils.sync_records(tap)
+
+        return parse_qs(urlparse(orders.calls[0].request.url).query), records
+
+    @responses.activate
+    def test_fields_for_selected_child_streams(self):
+        """Test orders are fetched with only the fields their children read."""
+        params, records = self._request_params(["line_items"])
+
+        self.assertEqual(params["fields"], ["id,line_items,updated_at"])
+        self.assertEqual(records["line_items"], [{"id": 10, "order_id": 1}])
+
+    @responses.activate
+    def test_no_fields_when_all_selected(self):
+        """Test all fields are requested when the whole stream is selected."""
+        params, _ = self._request_params(["orders"])
+
+        self.assertNotIn("fields", params)
@@ -0,0 +1,150 @@
+"""Tests the GraphQL products mode."""
+
+import json
+import unittest
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+GRAPHQL_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/graphql.json"
+
+THROTTLE_STATUS = {
+    "maximumAvailable": 2000,
+    "currentlyAvailable": 2000,
+    "restoreRate": 100,
+}
+
+
+def connection(nodes, cursor=None):
+    """Return a GraphQL connection of `nodes`, continuing after `cursor` if set."""
+    return {
+        "nodes": nodes,
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+    }
+
+
+def variant_node(variant_id):
+    """Return a `ProductVariant` node."""
+    return {
+        "id": f"gid://shopify/ProductVariant/{variant_id}",
+        "title": "Small / Red",
+        "price": "9.50",
+        "inventoryPolicy": "DENY",
+        "selectedOptions": [{"value": "Small"}, {"value": "Red"}],
+        "image": {"id": "gid://shopify/ProductImage/30"},
+        "inventoryItem": {
+            "id": f"gid://shopify/InventoryItem/{variant_id + 100}",
+            "tracked": True,
+            "requiresShipping": True,
+            "measurement": {"weight": {"unit": "KILOGRAMS", "value": 1.5}},
+        },
+    }
+
+
+def product_node(product_id, variants):
+    """Return a `Product` node with the `variants` connection."""
+    return {
+        "id": f"gid://shopify/Product/{product_id}",
+        "title": "Shirt",
+        "status": "ACTIVE",
+        "tags": ["a", "b"],
+        "updatedAt": f"2024-01-0{product_id}T00:00:00Z",
+        "options": [
+            {
+                "id": "gid://shopify/ProductOption/5",
+                "name": "Size",
+                "position": 1,
+                "optionValues": [{"name": "Small"}],
+            }
+        ],
+        "variants": variants,
+        "images": connection(
+            [{"id": "gid://shopify/ProductImage/30", "url": "https://img/30.png"}]
+        ),
+    }
+
+
+class TestGraphQLProducts(unittest.TestCase):
+    """Test class for the graphql_products setting"""
+
+    def setUp(self):
+        self.mock_config = {**test_utils.basic_mock_config, "graphql_products": True}
+
+        responses.reset()
+
+    @responses.activate
+    def test_products_paged(self):
+        """Test products are paged with all their variants in the REST shape."""
+        requests = []
+
+        def graphql_response(request):
+            body = json.loads(request.body)
+            variables = body["variables"]
+            requests.append(variables)
+
+            if "ProductConnection" in body["query"]:
+                data = {"node": {"variants": connection([variant_node(12)])}}
+                return 200, {}, json.dumps({"data": data})
+
+            if variables.get("after") is None:
+                products = connection(
+                    [product_node(1, connection([variant_node(11)], "v1"))], "p1"
+                )
+                requested = 450
+            else:
+                products = connection([product_node(2, connection([]))])
+                requested = 180
+
+            cost = {"requestedQueryCost": requested, "throttleStatus": THROTTLE_STATUS}
+            body = {"data": {"products": products}, "extensions": {"cost": cost}}
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=graphql_response)
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["products"])
+
+        records = test_utils.sync_records(tap)["products"]
+
+        self.assertEqual([record["id"] for record in records], [1, 2])
+        self.assertEqual([v["id"] for v in records[0]["variants"]], [11, 12])
+        self.assertEqual(
+            {
+                key: records[0]["variants"][0][key]
+                for key in (
+                    "product_id",
+                    "price",
+                    "inventory_policy",
+                    "inventory_item_id",
+                    "option2",
+                    "image_id",
+                    "weight_unit",
+                    "grams",
+                )
+            },
+            {
+                "product_id": 1,
+                "price": "9.50",
+                "inventory_policy": "deny",
+                "inventory_item_id": 111,
+                "option2": "Red",
+                "image_id": 30,
+                "weight_unit": "kg",
+                "grams": 1500,
+            },
+        )
+        self.assertEqual(records[0]["images"][0]["variant_ids"], [11, 12])
+        self.assertEqual(records[0]["image"]["src"], "https://img/30.png")
+        self.assertEqual(records[0]["options"][0]["values"], ["Small"])
+        self.assertEqual(records[0]["tags"], "a, b")
+
+        # the second page is sized to the cost reported for the first
+        self.assertEqual(
+            requests[1], {"id": "gid://shopify/Product/1", "first": 100, "after": "v1"}
+        )
+        self.assertEqual(requests[2]["after"], "p1")
+        self.assertEqual(requests[2]["first"], 10)
+        self.assertEqual(
+            tap.state["bookmarks"]["products"]["replication_key_value"],
+            "2024-01-02T00:00:00Z",
+        )
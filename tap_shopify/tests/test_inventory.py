@@ -0,0 +1,83 @@
+"""Tests the inventory streams."""
+
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+BASE_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+
+
+class TestInventoryStreams(unittest.TestCase):
+    """Test class for the inventory streams"""
+
+    def setUp(self):
+        self.mock_config = test_utils.basic_mock_config
+
+        responses.reset()
+
+    @responses.activate
+    def test_levels_and_items_batched(self):
+        """Test levels for all locations come in one request, and items are
+        requested by id once however many levels share them."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["inventory_levels", "inventory_items"]
+        )
+
+        responses.add(
+            responses.GET,
+            f"{BASE_URL}/locations.json",
+            json={"locations": [{"id": 1}]},
+            headers={"Link": f'<{BASE_URL}/locations.json?page_info=l2>; rel="next"'},
+        )
+        responses.add(
+            responses.GET,
+            f"{BASE_URL}/locations.json",
+            json={"locations": [{"id": 2}]},
+        )
+        levels = responses.add(
+            responses.GET,
+            f"{BASE_URL}/inventory_levels.json",
+            json={
+                "inventory_levels": [
+                    {
+                        "inventory_item_id": item_id,
+                        "location_id": location_id,
+                        "updated_at": f"2024-01-{item_id}T00:00:00Z",
+                    }
+                    for location_id in (1, 2)
+                    for item_id in (10, 11, 12)
+                ]
+            },
+        )
+        items = responses.add(
+            responses.GET,
+            f"{BASE_URL}/inventory_items.json",
+            json={"inventory_items": [{"id": item_id} for item_id in (10, 11, 12)]},
+        )
+
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual(levels.call_count, 1)
+        self.assertEqual(
+            parse_qs(urlparse(levels.calls[0].request.url).query)["location_ids"],
+            ["1,2"],
+        )
+        self.assertEqual(len(records["inventory_levels"]), 6)
+        self.assertEqual(
+            tap.state["bookmarks"]["inventory_levels"]["replication_key_value"],
+            "2024-01-12T00:00:00Z",
+        )
+        self.assertNotIn("locations", tap.state["bookmarks"])
+
+        self.assertEqual(items.call_count, 1)
+        self.assertEqual(
+            parse_qs(urlparse(items.calls[0].request.url).query)["ids"],
+            ["10,11,12"],
+        )
+        self.assertEqual(
+            [item["id"] for item in records["inventory_items"]], [10, 11, 12]
+        )
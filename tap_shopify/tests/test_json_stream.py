@@ -0,0 +1,48 @@
+"""Tests the incremental JSON page parser."""
+
+import json
+import unittest
+from decimal import Decimal
+
+from tap_shopify.json_stream import iter_json_array
+
+PAGE = {
+    "meta": {"skipped": [1, {"nested": "]}"}]},
+    "orders": [
+        {"id": 1, "total_price": 10.5, "name": "café ☃"},
+        {"id": 22, "line_items": [{"id": 3, "title": "a, b"}], "note": None},
+        12345,
+        "text",
+    ],
+    "after": True,
+}
+
+
+def chunked(data, size):
+    return [data[start:][:size] for start in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """Test class for iter_json_array"""
+
+    def test_chunk_boundaries(self):
+        """Test records parse the same however the body is split."""
+        body = json.dumps(PAGE, ensure_ascii=False, indent=1).encode()
+        expected = json.loads(body, parse_float=Decimal)["orders"]
+
+        for size in (1, 2, 7, 64, len(body)):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    list(iter_json_array(chunked(body, size), "orders")), expected
+                )
+
+    def test_missing_or_empty(self):
+        """Test nothing is yielded for a missing, null or empty array."""
+        for body in (b"{}", b'{"orders": null}', b'{"orders": []}', b'{"x": [1]}'):
+            with self.subTest(body=body):
+                self.assertEqual(list(iter_json_array([body], "orders")), [])
+
+    def test_invalid(self):
+        """Test a truncated body raises."""
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"orders": [{"id": 1}, {"id"'], "orders"))
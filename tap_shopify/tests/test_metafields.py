@@ -0,0 +1,233 @@
+"""Tests extracting the metafields of owner resources."""
+
+import json
+import unittest
+from unittest import mock
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+GRAPHQL_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/graphql.json"
+BULK_RESULT_URL = "https://storage.googleapis.com/shopify/bulk/metafields.jsonl"
+
+BULK_RESULT = [
+    {"id": "gid://shopify/Product/1"},
+    {
+        "__parentId": "gid://shopify/Product/1",
+        "id": "gid://shopify/Metafield/10",
+        "namespace": "custom",
+        "key": "material",
+        "value": "cotton",
+        "type": "single_line_text_field",
+        "updatedAt": "2024-01-05T00:00:00Z",
+    },
+    {
+        "__parentId": "gid://shopify/Product/1",
+        "id": "gid://shopify/Metafield/11",
+        "updatedAt": "2023-12-01T00:00:00Z",
+    },
+]
+
+
+class TestOwnerMetafields(unittest.TestCase):
+    """Test class for the metafield_owners setting"""
+
+    def setUp(self):
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "metafield_owners": ["product"],
+        }
+
+        responses.reset()
+
+    @staticmethod
+    def _state(bookmarks):
+        partitions = [
+            {
+                "context": {"owner_resource": owner},
+                "replication_key": "updated_at",
+                "replication_key_value": value,
+            }
+            for owner, value in bookmarks.items()
+        ]
+        return {"bookmarks": {"metafields": {"partitions": partitions}}}
+
+    @responses.activate
+    @mock.patch("tap_shopify.client.time.sleep")
+    def test_metafields_from_bulk_operation(self, sleep):
+        """Test owner metafields updated since the bookmark are extracted."""
+        operation = {"id": "gid://shopify/BulkOperation/1", "objectCount": "3"}
+        run = responses.add(
+            responses.POST,
+            GRAPHQL_URL,
+            json={
+                "data": {
+                    "bulkOperationRunQuery": {
+                        "bulkOperation": {**operation, "status": "CREATED"},
+                        "userErrors": [],
+                    }
+                }
+            },
+        )
+        responses.add(
+            responses.POST,
+            GRAPHQL_URL,
+            json={
+                "data": {
+                    "node": {**operation, "status": "COMPLETED", "url": BULK_RESULT_URL}
+                }
+            },
+        )
+        responses.add(
+            responses.GET,
+            BULK_RESULT_URL,
+            body="\n".join(json.dumps(line) for line in BULK_RESULT),
+        )
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config,
+            ["metafields"],
+            state=self._state({"product": "2024-01-01T00:00:00Z"}),
+        )
+
+        records = test_utils.sync_records(tap)["metafields"]
+
+        self.assertIn(
+            "products {", json.loads(run.calls[0].request.body)["variables"]["query"]
+        )
+        self.assertEqual(
+            records,
+            [
+                {
+                    "id": 10,
+                    "namespace": "custom",
+                    "key": "material",
+                    "value": "cotton",
+                    "type": "single_line_text_field",
+                    "description": None,
+                    "created_at": None,
+                    "updated_at": "2024-01-05T00:00:00Z",
+                    "owner_id": 1,
+                    "owner_resource": "product",
+                }
+            ],
+        )
+        # the shop's own metafields were not requested
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    @mock.patch("tap_shopify.client.time.sleep")
+    def test_bulk_operations_one_at_a_time(self, sleep):
+        """Test streams syncing side by side do not run bulk operations at once."""
+        running = []
+
+        def graphql_response(request):
+            variables = json.loads(request.body)["variables"]
+
+            if "query" in variables:
+                if running:
+                    errors = [{"message": "A bulk query operation is in progress"}]
+                    data = {"bulkOperation": None, "userErrors": errors}
+                else:
+                    kind = "orders" if "orders(" in variables["query"] else "products"
+                    running.append(kind)
+                    operation = {"id": f"gid://shopify/BulkOperation/{kind}"}
+                    data = {
+                        "bulkOperation": {**operation, "status": "CREATED"},
+                        "userErrors": [],
+                    }
+
+                return 200, {}, json.dumps({"data": {"bulkOperationRunQuery": data}})
+
+            kind = variables["id"].rsplit("/", 1)[-1]
+            node = {
+                "id": variables["id"],
+                "status": "COMPLETED",
+                "url": f"https://storage.googleapis.com/shopify/bulk/{kind}.jsonl",
+            }
+            return 200, {}, json.dumps({"data": {"node": node}})
+
+        def result_response(request):
+            kind = running.pop()
+            lines = BULK_RESULT if kind == "products" else []
+            return 200, {}, "\n".join(json.dumps(line) for line in lines)
+
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=graphql_response)
+        for kind in ("orders", "products"):
+            responses.add_callback(
+                responses.GET,
+                f"https://storage.googleapis.com/shopify/bulk/{kind}.jsonl",
+                callback=result_response,
+            )
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**self.mock_config, "bulk_mode": True, "stream_concurrency": 2},
+            ["metafields", "orders"],
+        )
+
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual([record["id"] for record in records["metafields"]], [10, 11])
+
+    @responses.activate
+    @mock.patch("tap_shopify.client.time.sleep")
+    def test_owner_added_later(self, sleep):
+        """Test an owner added after the others were bookmarked is extracted from
+        the start, and each owner's bookmark kept apart."""
+
+        def graphql_response(request):
+            variables = json.loads(request.body)["variables"]
+
+            if "query" in variables:
+                owner = "products" if "products {" in variables["query"] else "others"
+                data = {
+                    "bulkOperation": {
+                        "id": f"gid://shopify/BulkOperation/{owner}",
+                        "status": "CREATED",
+                    },
+                    "userErrors": [],
+                }
+                return 200, {}, json.dumps({"data": {"bulkOperationRunQuery": data}})
+
+            owner = variables["id"].rsplit("/", 1)[-1]
+            node = {
+                "id": variables["id"],
+                "status": "COMPLETED",
+                "url": f"https://storage.googleapis.com/shopify/bulk/{owner}.jsonl",
+            }
+            return 200, {}, json.dumps({"data": {"node": node}})
+
+        collection_result = [
+            {"id": "gid://shopify/Collection/2"},
+            {
+                "__parentId": "gid://shopify/Collection/2",
+                "id": "gid://shopify/Metafield/20",
+                "updatedAt": "2023-06-01T00:00:00Z",
+            },
+        ]
+
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=graphql_response)
+        for owner, lines in (("products", BULK_RESULT), ("others", collection_result)):
+            responses.add(
+                responses.GET,
+                f"https://storage.googleapis.com/shopify/bulk/{owner}.jsonl",
+                body="\n".join(json.dumps(line) for line in lines),
+            )
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**self.mock_config, "metafield_owners": ["product", "collection"]},
+            ["metafields"],
+            state=self._state({"product": "2024-01-01T00:00:00Z"}),
+        )
+
+        records = test_utils.sync_records(tap)["metafields"]
+
+        self.assertEqual([record["id"] for record in records], [10, 20])
+
+        bookmarks = {
+            partition["context"]["owner_resource"]: partition["replication_key_value"]
+            for partition in tap.state["bookmarks"]["metafields"]["partitions"]
+        }
+        self.assertEqual(
+            bookmarks,
+            {"product": "2024-01-05T00:00:00Z", "collection": "2023-06-01T00:00:00Z"},
+        )
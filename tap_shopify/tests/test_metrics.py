@@ -0,0 +1,136 @@
+"""Tests the per-stream performance metrics."""
+
+import io
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.metrics import Histogram, StreamMetrics, prometheus_text
+
+CUSTOMERS_URL = (
+    f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/customers.json"
+)
+
+
+class _SlowBody(io.BufferedReader):
+    """A response body that takes a while to arrive."""
+
+    def read(self, *args, **kwargs):
+        if not self.tell():
+            time.sleep(0.2)
+
+        return super().read(*args, **kwargs)
+
+
+class TestHistogram(unittest.TestCase):
+    """Test class for Histogram"""
+
+    def test_cumulative_counts(self):
+        """Test values are counted in every bucket they do not exceed."""
+        histogram = Histogram(bounds=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertEqual(histogram.sum, 2.65)
+
+
+class TestPrometheusText(unittest.TestCase):
+    """Test class for the Prometheus text format"""
+
+    def test_histogram_samples(self):
+        """Test histograms are written as bucket, sum and count samples of one
+        family, with label values escaped."""
+        metrics = StreamMetrics({"stream": 'a"b\\c\nd'})
+        metrics.observe_request(0.2, 0, None)
+
+        lines = prometheus_text([metrics]).splitlines()
+        family = "tap_shopify_http_request_latency_seconds"
+        labels = 'stream="a\\"b\\\\c\\nd"'
+
+        self.assertEqual(lines[0], f"# TYPE {family} histogram")
+        self.assertEqual(
+            [line.split("{")[0] for line in lines[1:14]],
+            [f"{family}_bucket"] * 11 + [f"{family}_sum", f"{family}_count"],
+        )
+        self.assertEqual(lines[2], f'{family}_bucket{{{labels},le="0.1"}} 0')
+        self.assertEqual(lines[3], f'{family}_bucket{{{labels},le="0.25"}} 1')
+        self.assertEqual(lines[11], f'{family}_bucket{{{labels},le="+Inf"}} 1')
+        self.assertEqual(lines[13], f"{family}_count{{{labels}}} 1")
+
+
+class TestStreamMetrics(unittest.TestCase):
+    """Test class for the performance metrics of a sync"""
+
+    def setUp(self):
+        self.textfile = Path(tempfile.mkdtemp()) / "tap_shopify.prom"
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "metrics_textfile": str(self.textfile),
+        }
+
+        responses.reset()
+
+    @responses.activate
+    def test_metrics_logged(self):
+        """Test each stream logs its metrics, and writes them to the textfile."""
+        body = {"customers": [{"id": 1, "updated_at": "2024-01-01T00:00:00Z"}]}
+        responses.add(
+            responses.GET,
+            CUSTOMERS_URL,
+            body=json.dumps(body).encode(),
+            headers={"X-Shopify-Shop-Api-Call-Limit": "10/40"},
+        )
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["customers"])
+
+        with self.assertLogs("singer_sdk.metrics", "INFO") as logs:
+            test_utils.sync_records(tap)
+
+        points = {
+            (point["metric"], point["tags"].get("encoding")): point
+            for point in (
+                json.loads(line.split("METRIC: ", 1)[1]) for line in logs.output
+            )
+            if point["tags"].get("stream") == "customers"
+        }
+
+        self.assertEqual(points[("http_request_latency", None)]["value"]["count"], 1)
+        self.assertEqual(
+            points[("response_bytes", "decoded")]["value"], len(json.dumps(body))
+        )
+        self.assertEqual(points[("call_limit_headroom", None)]["value"], 0.75)
+        self.assertIn(("post_process_duration", None), points)
+
+        textfile = self.textfile.read_text()
+
+        self.assertIn(
+            'tap_shopify_http_request_latency_seconds_count{stream="customers"} 1',
+            textfile,
+        )
+        self.assertIn(
+            'tap_shopify_call_limit_headroom{stream="customers"} 0.75', textfile
+        )
+
+    @responses.activate
+    def test_body_read_timed_as_request(self):
+        """Test the time to read a body counts as request latency, not decoding."""
+        body = {"customers": [{"id": 1, "updated_at": "2024-01-01T00:00:00Z"}]}
+        responses.add(
+            responses.GET,
+            CUSTOMERS_URL,
+            body=_SlowBody(io.BytesIO(json.dumps(body).encode())),
+        )
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["customers"])
+        test_utils.sync_records(tap)
+
+        metrics = tap.streams["customers"].performance_metrics
+
+        self.assertGreaterEqual(metrics.request_latency.sum, 0.2)
+        self.assertLess(metrics.decode_seconds, 0.2)
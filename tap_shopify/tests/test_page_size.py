@@ -0,0 +1,89 @@
+"""Tests adapting the page size to how pages respond."""
+
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.page_size import PageSize
+
+PRODUCTS_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/products.json"
+
+
+class TestPageSize(unittest.TestCase):
+    """Test class for PageSize"""
+
+    def test_shrinks_and_recovers(self):
+        """Test slow or large pages halve the size, which grows back after."""
+        page_size = PageSize(maximum=250, slow_seconds=10, max_bytes=1000, minimum=10)
+
+        page_size.observe(11, 0)
+        self.assertEqual(page_size.size, 125)
+        page_size.observe(1, 2000)
+        self.assertEqual(page_size.size, 62)
+        page_size.observe(6, 0)  # neither slow nor fast
+        self.assertEqual(page_size.size, 62)
+
+        for _ in range(10):
+            page_size.observe(1, 100)
+        self.assertEqual(page_size.size, 250)
+
+        for _ in range(10):
+            page_size.observe(11, 0)
+        self.assertEqual(page_size.size, 10)
+
+
+class TestAdaptivePageSize(unittest.TestCase):
+    """Test class for the page size requested by streams"""
+
+    def setUp(self):
+        self.mock_config = test_utils.basic_mock_config
+
+        responses.reset()
+
+    def _add_pages(self, pages):
+        for n in range(1, pages + 1):
+            next_url = f"{PRODUCTS_URL}?page_info=p{n + 1}&limit=50"
+            responses.add(
+                responses.GET,
+                PRODUCTS_URL,
+                json={"products": [{"id": n, "updated_at": f"2024-01-0{n}T00:00:00Z"}]},
+                headers=({"Link": f'<{next_url}>; rel="next"'} if n < pages else {}),
+            )
+
+    def _limits(self):
+        return [
+            parse_qs(urlparse(call.request.url).query)["limit"][0]
+            for call in responses.calls
+        ]
+
+    @responses.activate
+    def test_maximum_requested(self):
+        """Test pages are requested at the endpoint maximum, or as configured."""
+        self._add_pages(2)
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["products"])
+        test_utils.sync_records(tap)
+
+        self.assertEqual(self._limits(), ["250", "250"])
+
+        responses.reset()
+        self._add_pages(2)
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**self.mock_config, "page_size": 100}, ["products"]
+        )
+        test_utils.sync_records(tap)
+
+        self.assertEqual(self._limits(), ["100", "100"])
+
+    @responses.activate
+    def test_slow_pages_shrunk(self):
+        """Test the pages after slow ones are requested smaller."""
+        self._add_pages(3)
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**self.mock_config, "slow_page_seconds": 1e-9}, ["products"]
+        )
+        test_utils.sync_records(tap)
+
+        self.assertEqual(self._limits(), ["250", "125", "62"])
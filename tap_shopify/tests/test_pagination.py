@@ -1,13 +1,27 @@
 """Tests the tap settings."""
 
+import io
+import json
 import unittest
+from unittest import mock
 
 import responses
+from urllib3.exceptions import ProtocolError
 
 import tap_shopify.tests.utils as test_utils
 from tap_shopify.client import API_VERSION
 
 
+class _DroppedBody(io.BufferedReader):
+    """A response body whose connection drops after its first read."""
+
+    def read(self, *args, **kwargs):
+        if self.tell():
+            raise ProtocolError("Connection broken: IncompleteRead")
+
+        return super().read(10)
+
+
 class TestTapShopifyWithBaseCredentials(unittest.TestCase):
     """Test class for tap-shopify settings"""
 
@@ -36,7 +50,7 @@ class TestTapShopifyWithBaseCredentials(unittest.TestCase):
 
         rsp2 = responses.Response(
             responses.GET,
-            f"{resource_url}?limit=1&page_info=12345",
+            f"{resource_url}?limit=250&page_info=12345",
             json=test_utils.product_return_data,
             status=200,
             headers={"link": f"{resource_url}?limit=1&page_info=12346; rel=next"},
@@ -44,7 +58,7 @@ class TestTapShopifyWithBaseCredentials(unittest.TestCase):
 
         rsp3 = responses.Response(
             responses.GET,
-            f"{resource_url}?limit=1&page_info=12346",
+            f"{resource_url}?limit=250&page_info=12346",
             json=test_utils.product_return_data,
             status=200,
         )
@@ -58,3 +72,25 @@ class TestTapShopifyWithBaseCredentials(unittest.TestCase):
         self.assertIs(rsp1.call_count, 1)
         self.assertIs(rsp2.call_count, 1)
         self.assertIs(rsp3.call_count, 1)
+
+    @responses.activate
+    @mock.patch("time.sleep")
+    def test_dropped_body_retried(self, sleep):
+        """Test a page whose body is cut off is requested again, not half parsed."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.basic_mock_config, ["products"]
+        )
+
+        resource_url = (
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/products.json"
+        )
+        body = json.dumps(test_utils.product_return_data).encode()
+
+        # the first response matching a request is used, then the next
+        responses.get(resource_url, body=_DroppedBody(io.BytesIO(body)))
+        responses.get(resource_url, body=body)
+
+        records = test_utils.sync_records(tap)["products"]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(len(responses.calls), 2)
@@ -0,0 +1,89 @@
+"""Tests the shop-wide rate limiter."""
+
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from tap_shopify.rate_limit import ShopifyRateLimiter
+
+REST_URL = "https://mock-store.myshopify.com/admin/api/2025-10/orders.json"
+GRAPHQL_URL = "https://mock-store.myshopify.com/admin/api/2025-10/graphql.json"
+
+
+def make_response(url, status_code=200, headers=None, body=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = json.dumps(body or {}).encode()
+    return response
+
+
+class TestShopifyRateLimiter(unittest.TestCase):
+    """Test class for ShopifyRateLimiter"""
+
+    def setUp(self):
+        patcher = mock.patch("tap_shopify.rate_limit.time")
+        self.time = patcher.start()
+        self.time.monotonic.return_value = 100.0
+        self.addCleanup(patcher.stop)
+
+        self.rate_limiter = ShopifyRateLimiter()
+
+    def test_no_wait_with_headroom(self):
+        """Test requests are not delayed while the bucket has room."""
+        self.rate_limiter.observe(
+            make_response(REST_URL, headers={"X-Shopify-Shop-Api-Call-Limit": "4/40"})
+        )
+
+        self.assertEqual(self.rate_limiter.acquire(requests.Request(url=REST_URL)), 0)
+        self.time.sleep.assert_not_called()
+
+    def test_rest_call_limit_header(self):
+        """Test a nearly full REST bucket delays the next request."""
+        self.rate_limiter.observe(
+            make_response(REST_URL, headers={"X-Shopify-Shop-Api-Call-Limit": "38/40"})
+        )
+
+        # 39 calls against a 36 call ceiling, leaking at 2 calls/s
+        self.assertEqual(self.rate_limiter.acquire(requests.Request(url=REST_URL)), 1.5)
+        self.time.sleep.assert_called_once_with(1.5)
+
+    def test_retry_after(self):
+        """Test a 429 blocks requests for its Retry-After period."""
+        self.rate_limiter.observe(
+            make_response(REST_URL, status_code=429, headers={"Retry-After": "2.0"})
+        )
+
+        self.assertEqual(self.rate_limiter.acquire(requests.Request(url=REST_URL)), 2)
+
+    def test_graphql_throttle_status(self):
+        """Test GraphQL requests wait for enough points to be restored."""
+        self.rate_limiter.observe(
+            make_response(
+                GRAPHQL_URL,
+                body={
+                    "data": {},
+                    "extensions": {
+                        "cost": {
+                            "requestedQueryCost": 100,
+                            "actualQueryCost": 100,
+                            "throttleStatus": {
+                                "maximumAvailable": 1000.0,
+                                "currentlyAvailable": 100,
+                                "restoreRate": 50.0,
+                            },
+                        }
+                    },
+                },
+            )
+        )
+
+        # 1000 points used against a 900 point ceiling, restoring 50 points/s
+        self.assertEqual(
+            self.rate_limiter.acquire(requests.Request(url=GRAPHQL_URL)), 2
+        )
+        # REST requests draw from a separate bucket
+        self.assertEqual(self.rate_limiter.acquire(requests.Request(url=REST_URL)), 0)
@@ -0,0 +1,258 @@
+"""Tests the ShopifyQL query streams."""
+
+import json
+import re
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import requests
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.shopifyql import cache_key, get_clause
+from tap_shopify.tap import Tap_Shopify
+
+GRAPHQL_URL = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}/graphql.json"
+
+
+class TestShopifyQLSchemaCache(unittest.TestCase):
+    """Test class for the ShopifyQL column cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "shopifyql_schema_cache_dir": self.cache_dir.name,
+            "shopifyql_queries": [
+                {
+                    "name": "sales",
+                    "query": "FROM sales SHOW total_sales TIMESERIES day SINCE -30d",
+                }
+            ],
+        }
+
+        responses.reset()
+
+    def _add_probe_response(self):
+        return responses.add(
+            responses.POST,
+            GRAPHQL_URL,
+            json={
+                "data": {
+                    "shopifyqlQuery": {
+                        "parseErrors": [],
+                        "tableData": {
+                            "columns": [
+                                {"name": "day", "dataType": "DAY_TIMESTAMP"},
+                                {"name": "total_sales", "dataType": "MONEY"},
+                            ],
+                            "rows": [],
+                        },
+                    }
+                }
+            },
+            status=200,
+        )
+
+    def _schema(self, **config):
+        tap = Tap_Shopify(config={**self.mock_config, **config})
+        return tap.streams["sales"].schema
+
+    @responses.activate
+    def test_columns_cached(self):
+        """Test the query is probed once, and again only when refreshed."""
+        probe = self._add_probe_response()
+
+        for _ in range(2):
+            self.assertEqual(list(self._schema()["properties"]), ["day", "total_sales"])
+        self.assertEqual(probe.call_count, 1)
+
+        self._schema(shopifyql_schema_refresh=True)
+        self.assertEqual(probe.call_count, 2)
+
+        self._schema(shopifyql_schema_cache_ttl=-1)
+        self.assertEqual(probe.call_count, 3)
+
+    @responses.activate
+    def test_columns_typed(self):
+        """Test columns are typed from their ShopifyQL data types."""
+        self._add_probe_response()
+
+        properties = self._schema()["properties"]
+
+        self.assertEqual(properties["day"]["format"], "date")
+        self.assertIn("number", properties["total_sales"]["type"])
+
+    def test_cache_key(self):
+        """Test the date range and whitespace do not change the cache key."""
+        self.assertEqual(
+            cache_key("FROM sales SHOW total_sales SINCE -30d", API_VERSION),
+            cache_key("FROM sales\n  SHOW total_sales SINCE 2024-01-01", API_VERSION),
+        )
+        self.assertNotEqual(
+            cache_key("FROM sales SHOW total_sales", API_VERSION),
+            cache_key("FROM sales SHOW total_sales", "2025-07"),
+        )
+
+
+class TestShopifyQLWindows(unittest.TestCase):
+    """Test class for the ShopifyQL window_days setting"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "shopifyql_schema_cache_dir": self.cache_dir.name,
+            "shopifyql_queries": [
+                {
+                    "name": "sales",
+                    "query": (
+                        "FROM sales SHOW total_sales TIMESERIES day "
+                        "SINCE 2024-01-01 UNTIL 2024-01-25 ORDER BY day"
+                    ),
+                    "primary_keys": ["day"],
+                    "replication_key": "day",
+                    "window_days": 10,
+                }
+            ],
+        }
+
+        responses.reset()
+
+    @responses.activate
+    def test_windows_queried(self):
+        """Test each window is queried once and rows are emitted in order."""
+        queries = []
+
+        def query_response(request):
+            query = json.loads(
+                re.search(r"query: (\".*?\")\)", json.loads(request.body)["query"])[1]
+            )
+            days = []
+
+            # the schema probe asks for the last day, relative to today
+            if get_clause(query, "SINCE") != "-1d":
+                queries.append(query)
+                since = date.fromisoformat(get_clause(query, "SINCE"))
+                until = date.fromisoformat(get_clause(query, "UNTIL"))
+                days = [since + timedelta(n) for n in range((until - since).days + 1)]
+            table_data = {
+                "columns": [
+                    {"name": "day", "dataType": "DAY_TIMESTAMP"},
+                    {"name": "total_sales", "dataType": "MONEY"},
+                ],
+                "rows": [
+                    {"day": day.isoformat(), "total_sales": "1.50"} for day in days
+                ],
+            }
+            body = {
+                "data": {"shopifyqlQuery": {"parseErrors": [], "tableData": table_data}}
+            }
+
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=query_response)
+        tap = test_utils.set_up_tap_with_custom_catalog(self.mock_config, ["sales"])
+
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual(
+            sorted((get_clause(q, "SINCE"), get_clause(q, "UNTIL")) for q in queries),
+            [
+                ("2024-01-01", "2024-01-10"),
+                ("2024-01-11", "2024-01-20"),
+                ("2024-01-21", "2024-01-25"),
+            ],
+        )
+        self.assertEqual(
+            [record["day"] for record in records["sales"]],
+            [(date(2024, 1, 1) + timedelta(days=n)).isoformat() for n in range(25)],
+        )
+        self.assertEqual(
+            tap.state["bookmarks"]["sales"]["replication_key_value"], "2024-01-25"
+        )
+
+
+class TestShopifyQLRows(unittest.TestCase):
+    """Test class for the decoding of ShopifyQL rows"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+        self.mock_config = {
+            **test_utils.basic_mock_config,
+            "shopifyql_schema_cache_dir": self.cache_dir.name,
+            "shopifyql_queries": [
+                {
+                    "name": "sales",
+                    "query": "FROM sales SHOW total_sales, orders TIMESERIES day",
+                    "primary_keys": ["day"],
+                    "replication_key": "day",
+                }
+            ],
+        }
+
+        responses.reset()
+
+    @responses.activate
+    def test_rows_decoded(self):
+        """Test rows are decoded to their column types, resuming from state, with
+        each response body decoded once."""
+        queries = []
+
+        def query_response(request):
+            query = json.loads(
+                re.search(r"query: (\".*?\")\)", json.loads(request.body)["query"])[1]
+            )
+            queries.append(query)
+            table_data = {
+                "columns": [
+                    {"name": "day", "dataType": "DAY_TIMESTAMP"},
+                    {"name": "total_sales", "dataType": "MONEY"},
+                    {"name": "orders", "dataType": "INTEGER"},
+                ],
+                "rows": [{"day": "2024-01-20", "total_sales": "1.50", "orders": "2"}],
+            }
+            body = {
+                "data": {"shopifyqlQuery": {"parseErrors": [], "tableData": table_data}}
+            }
+
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(responses.POST, GRAPHQL_URL, callback=query_response)
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config,
+            ["sales"],
+            state={
+                "bookmarks": {
+                    "sales": {
+                        "replication_key": "day",
+                        "replication_key_value": "2024-01-20",
+                    }
+                }
+            },
+        )
+
+        probes = len(queries)  # sent when the tap discovers the stream's schema
+
+        with mock.patch.object(
+            requests.Response,
+            "json",
+            autospec=True,
+            side_effect=requests.Response.json,
+        ) as decode:
+            records = test_utils.sync_records(tap)
+
+        self.assertEqual(
+            records["sales"], [{"day": "2024-01-20", "total_sales": 1.5, "orders": 2}]
+        )
+        self.assertEqual(get_clause(queries[-1], "SINCE"), "2024-01-20")
+        self.assertEqual(decode.call_count, len(queries) - probes)
@@ -0,0 +1,190 @@
+"""Tests syncing several stores in one run."""
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from itertools import count
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import responses
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers import _catalog
+from singer_sdk.singerlib.catalog import Catalog
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+from tap_shopify.tap import Tap_Shopify
+
+
+def customers_url(store):
+    """Return the customers endpoint of `store`."""
+    return f"https://{store}.myshopify.com/admin/api/{API_VERSION}/customers.json"
+
+
+class TestStores(unittest.TestCase):
+    """Test class for the stores setting"""
+
+    def setUp(self):
+        self.mock_config = {
+            "start_date": "2000-01-01T00:00:00Z",
+            "stores": [
+                {"store": "store-a", "access_token": "token-a"},
+                {"store": "store-b", "access_token": "token-b"},
+            ],
+        }
+
+        responses.reset()
+
+    def _add_customers(self, store, updated_at, capacity):
+        responses.add(
+            responses.GET,
+            customers_url(store),
+            json={"customers": [{"id": 1, "updated_at": updated_at}]},
+            headers={"X-Shopify-Shop-Api-Call-Limit": f"1/{capacity}"},
+        )
+
+    @responses.activate
+    def test_stores_synced(self):
+        """Test each store syncs with its own token, state and `shop` column."""
+        self._add_customers("store-a", "2024-01-01T00:00:00Z", 40)
+        self._add_customers("store-b", "2024-02-01T00:00:00Z", 80)
+
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config,
+            ["customers"],
+            state={
+                "stores": {
+                    "store-a": {
+                        "bookmarks": {
+                            "customers": {
+                                "replication_key": "updated_at",
+                                "replication_key_value": "2023-12-01T00:00:00Z",
+                            }
+                        }
+                    }
+                }
+            },
+        )
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            tap.sync_all()
+
+        messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        records = [m["record"] for m in messages if m["type"] == "RECORD"]
+        schema = next(m for m in messages if m["type"] == "SCHEMA")
+
+        self.assertEqual(
+            sorted((record["shop"], record["id"]) for record in records),
+            [("store-a", 1), ("store-b", 1)],
+        )
+        self.assertEqual(schema["key_properties"], ["shop", "id"])
+        self.assertIn("shop", schema["schema"]["properties"])
+
+        requests = {
+            urlparse(call.request.url).hostname.split(".")[0]: call.request
+            for call in responses.calls
+        }
+        self.assertEqual(
+            requests["store-a"].headers["X-Shopify-Access-Token"], "token-a"
+        )
+        self.assertEqual(
+            requests["store-b"].headers["X-Shopify-Access-Token"], "token-b"
+        )
+        self.assertEqual(
+            parse_qs(urlparse(requests["store-a"].url).query)["updated_at_min"],
+            ["2023-12-01T00:00:00Z"],
+        )
+
+        bookmarks = {
+            shop: state["bookmarks"]["customers"]["replication_key_value"]
+            for shop, state in messages[-1]["value"]["stores"].items()
+        }
+        self.assertEqual(
+            bookmarks,
+            {"store-a": "2024-01-01T00:00:00Z", "store-b": "2024-02-01T00:00:00Z"},
+        )
+
+        # each store paces itself against its own bucket
+        limiters = {
+            store_tap.shop: store_tap.get_authenticator(None).rate_limiter
+            for store_tap in tap._store_taps
+        }
+        self.assertEqual(limiters["store-a"].rest.capacity, 40)
+        self.assertEqual(limiters["store-b"].rest.capacity, 80)
+
+        # each store's tap holds no other store's token
+        for store_tap in tap._store_taps:
+            self.assertNotIn("stores", store_tap.config)
+
+    @responses.activate
+    def test_activate_version_shared(self):
+        """Test full-table records of every store carry one version, so activating
+        it in one store keeps the records of the others."""
+        for store in ("store-a", "store-b"):
+            responses.add(
+                responses.GET,
+                f"https://{store}.myshopify.com/admin/api/{API_VERSION}/locations.json",
+                json={"locations": [{"id": 1}]},
+            )
+
+        # each tap is initialised at least a second after the last
+        clock = count(1_700_000_000, 5)
+
+        with mock.patch("singer_sdk.plugin_base.time") as plugin_time:
+            plugin_time.time.side_effect = lambda: next(clock)
+            tap = test_utils.set_up_tap_with_custom_catalog(
+                {**self.mock_config, "emit_activate_version_messages": True},
+                ["locations"],
+            )
+
+            with redirect_stdout(io.StringIO()) as stdout:
+                tap.sync_all()
+
+        messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        versions = {
+            message["version"]
+            for message in messages
+            if message["type"] in {"ACTIVATE_VERSION", "RECORD"}
+        }
+
+        self.assertEqual(
+            sorted(m["record"]["shop"] for m in messages if m["type"] == "RECORD"),
+            ["store-a", "store-b"],
+        )
+        self.assertEqual(versions, {tap.initialized_at // 1000})
+
+    @responses.activate
+    def test_shop_not_requested(self):
+        """Test the `shop` property is not among the fields requested."""
+        self._add_customers("store-a", "2024-01-01T00:00:00Z", 40)
+        self._add_customers("store-b", "2024-02-01T00:00:00Z", 40)
+
+        tap = Tap_Shopify(config=self.mock_config)
+        tap.run_discovery()
+        catalog = Catalog.from_dict(tap.catalog_dict)
+        _catalog.deselect_all_streams(catalog=catalog)
+        _catalog.set_catalog_stream_selected(
+            catalog=catalog, stream_name="customers", selected=True
+        )
+        _catalog.set_catalog_stream_selected(
+            catalog=catalog,
+            stream_name="customers",
+            selected=False,
+            breadcrumb=("properties", "email"),
+        )
+
+        test_utils.sync_records(
+            Tap_Shopify(config=self.mock_config, catalog=catalog.to_dict())
+        )
+
+        for call in responses.calls:
+            fields = parse_qs(urlparse(call.request.url).query)["fields"][0]
+            self.assertIn("id", fields.split(","))
+            self.assertNotIn("shop", fields.split(","))
+
+    def test_store_required(self):
+        """Test either a single store or a list of stores must be configured."""
+        with self.assertRaises(ConfigValidationError):
+            Tap_Shopify(config={"start_date": "2000-01-01T00:00:00Z"})
@@ -34,3 +34,30 @@ class TestTapShopifyWithBaseCredentials(unittest.TestCase):
         )
 
         tap.sync_all()
+
+    @responses.activate
+    def test_http_settings(self):
+        """Test streams share one compressed session with the configured timeouts."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            {**test_utils.basic_mock_config, "http_pool_size": 3, "request_timeout": 5},
+            ["customers"],
+        )
+
+        responses.add(
+            responses.GET,
+            f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+            "/customers.json",
+            json=test_utils.customer_return_data,
+            status=200,
+        )
+
+        customers, products = tap.streams["customers"], tap.streams["products"]
+        adapter = customers.requests_session.get_adapter("https://mock-store")
+
+        self.assertIs(customers.requests_session, products.requests_session)
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(customers.timeout, (10, 5))
+
+        tap.sync_all()
+
+        self.assertIn("gzip", responses.calls[0].request.headers["Accept-Encoding"])
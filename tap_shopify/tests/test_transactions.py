@@ -0,0 +1,91 @@
+"""Tests the batched GraphQL transactions mode."""
+
+import json
+import unittest
+
+import responses
+
+import tap_shopify.tests.utils as test_utils
+from tap_shopify.client import API_VERSION
+
+
+class TestBatchTransactions(unittest.TestCase):
+    """Test class for the batch_transactions setting"""
+
+    def setUp(self):
+        self.mock_config = {**test_utils.basic_mock_config, "batch_transactions": True}
+
+        responses.reset()
+
+    @responses.activate
+    def test_transactions_fetched_per_batch(self):
+        """Test transactions for a page of orders come from one GraphQL request."""
+        tap = test_utils.set_up_tap_with_custom_catalog(
+            self.mock_config, ["orders", "transactions"]
+        )
+
+        base_url = f"https://mock-store.myshopify.com/admin/api/{API_VERSION}"
+
+        responses.add(
+            responses.GET,
+            f"{base_url}/orders.json",
+            json={
+                "orders": [
+                    {
+                        "id": order_id,
+                        "updated_at": "2024-01-0{}T00:00:00Z".format(order_id),
+                        "subtotal_price": "1.00",
+                        "total_price": "1.00",
+                    }
+                    for order_id in (1, 2, 3)
+                ]
+            },
+            status=200,
+        )
+        graphql = responses.add(
+            responses.POST,
+            f"{base_url}/graphql.json",
+            json={
+                "data": {
+                    "nodes": [
+                        {
+                            "id": "gid://shopify/Order/1",
+                            "transactions": [
+                                {
+                                    "id": "gid://shopify/OrderTransaction/10",
+                                    "kind": "SALE",
+                                    "status": "SUCCESS",
+                                    "amountSet": {
+                                        "presentmentMoney": {
+                                            "amount": "1.0",
+                                            "currencyCode": "GBP",
+                                        }
+                                    },
+                                    "parentTransaction": None,
+                                }
+                            ],
+                        },
+                        {"id": "gid://shopify/Order/2", "transactions": []},
+                        None,
+                    ]
+                }
+            },
+            status=200,
+        )
+
+        records = test_utils.sync_records(tap)
+
+        self.assertEqual(graphql.call_count, 1)
+        self.assertEqual(
+            json.loads(graphql.calls[0].request.body)["variables"]["ids"],
+            [f"gid://shopify/Order/{order_id}" for order_id in (1, 2, 3)],
+        )
+        self.assertEqual(len(records["orders"]), 3)
+        self.assertEqual(len(records["transactions"]), 1)
+
+        transaction = records["transactions"][0]
+        self.assertEqual(transaction["id"], 10)
+        self.assertEqual(transaction["order_id"], 1)
+        self.assertEqual(transaction["kind"], "sale")
+        self.assertEqual(transaction["amount"], "1.0")
+        self.assertEqual(transaction["currency"], "GBP")
@@ -1,5 +1,9 @@
 """Utilities used in this module."""
 
+import io
+import json
+from collections import defaultdict
+from contextlib import redirect_stdout
 from datetime import datetime
 
 from singer_sdk.helpers import _catalog
@@ -34,7 +38,7 @@ product_return_data = {
 }
 
 
-def set_up_tap_with_custom_catalog(mock_config, stream_list):
+def set_up_tap_with_custom_catalog(mock_config, stream_list, state=None):
     """Create an instance of tap-spotify with specific config and streams."""
     tap = Tap_Shopify(config=mock_config)
     # Run discovery
@@ -50,4 +54,18 @@ def set_up_tap_with_custom_catalog(mock_config, stream_list):
             selected=True,
         )
     # Initialise tap with new catalog
-    return Tap_Shopify(config=mock_config, catalog=catalog.to_dict())
+    return Tap_Shopify(config=mock_config, catalog=catalog.to_dict(), state=state)
+
+
+def sync_records(tap):
+    """Run a sync and return the emitted records grouped by stream name."""
+    with redirect_stdout(io.StringIO()) as stdout:
+        tap.sync_all()
+
+    records = defaultdict(list)
+    for line in stdout.getvalue().splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records[message["stream"]].append(message["record"])
+
+    return records